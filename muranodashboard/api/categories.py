@@ -0,0 +1,59 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+from django.conf import settings
+
+from muranodashboard import api
+from muranodashboard.common import memory_cache
+
+
+CATEGORIES_CACHE = memory_cache.TTLCache('categories')
+
+
+def _get_ttl():
+    return getattr(settings, 'MURANO_CATEGORIES_CACHE_TTL', 60)
+
+
+def _get_stale_ttl():
+    return getattr(settings, 'MURANO_CATEGORIES_CACHE_STALE_TTL', 0)
+
+
+def category_list(request):
+    """Lists categories, sorted the way the catalog shows them.
+
+    Categories with packages come first, categories without packages come
+    second, both groups sorted alphabetically. The listing is cached per
+    region for ``MURANO_CATEGORIES_CACHE_TTL`` seconds, and is served for
+    ``MURANO_CATEGORIES_CACHE_STALE_TTL`` more seconds while being
+    refreshed in the background.
+    """
+    def _list():
+        categories = api.muranoclient(request).categories.list()
+        # NOTE(kzaitsev) We rely here on tuple comparison and ascending order
+        # of sorted(). i.e. (False, 'a') < (False, 'b') < (True, 'a') <
+        # (True, 'b') So to make order more human-friendly we sort based on
+        # package_count == 0, pushing categories without packages in front
+        # and then sorting them alphabetically
+        # TODO(kzaitsev): add sorting options to category API
+        return sorted(categories, key=lambda c: (c.package_count == 0, c.name))
+
+    return CATEGORIES_CACHE.get_or_create(
+        request.user.services_region, _list, _get_ttl(), _get_stale_ttl())
+
+
+def invalidate_cache():
+    """Drops cached categories, e.g. once a category or a package changes.
+
+    Categories are shared by all the projects, and so is the cache.
+    """
+    CATEGORIES_CACHE.invalidate()
@@ -15,12 +15,19 @@
 import itertools
 
 from django.conf import settings
+from oslo_log import log as logging
 import yaml
 
 from muranodashboard import api
+from muranodashboard.api import categories as categories_api
 from muranodashboard.common import cache
+from muranodashboard.common import catalog_index
+from muranodashboard.common import logos
+from muranodashboard.dynamic_ui import compiler
 from muranodashboard.dynamic_ui import yaql_expression
 
+LOG = logging.getLogger(__name__)
+
 
 def package_list(request, marker=None, filters=None, paginate=False,
                  page_size=20, sort_dir=None, limit=None):
@@ -95,26 +102,117 @@ def make_loader_cls():
     return Loader
 
 
+def invalidate_cache(app_id):
+    """Drops cached data of the package, e.g. once it is modified.
+
+    Failures of the cache are logged rather than raised, since the package
+    has been changed already.
+    """
+    try:
+        cache.invalidate(app_id)
+    except Exception:
+        LOG.exception('Unable to drop cached data of package {0}'.format(
+            app_id))
+    catalog_index.invalidate()
+    # counts of packages in categories change too
+    categories_api.invalidate_cache()
+
+
+def validate_cache(packages):
+    """Drops cached data of the packages updated since it was cached.
+
+    Packages listed by the API already have the time they were updated at,
+    so the check does not need any calls to the API. Failures of the cache,
+    e.g. a read-only directory, are logged, so that the pages listing the
+    packages still work.
+    """
+    for package in packages:
+        updated = getattr(package, 'updated', None)
+        if updated:
+            try:
+                cache.validate(package.id, updated)
+            except Exception:
+                LOG.exception('Unable to validate cached data of package '
+                              '{0}'.format(package.id))
+
+
+def revalidate_cache(request, app_ids):
+    """Checks cached data of the packages with a single listing call.
+
+    Cached data of the packages which are no longer available is dropped.
+    """
+    app_ids = sorted(set(app_ids))
+    if not app_ids:
+        return
+    packages = list(api.muranoclient(request).packages.filter(
+        id='in:' + ','.join(app_ids), include_disabled=True))
+    validate_cache(packages)
+    for app_id in set(app_ids) - set(package.id for package in packages):
+        invalidate_cache(app_id)
+
+
 # Here are cached some data calls to api; note that not every package attribute
-# getter should be cached - only immutable ones could be safely cached. E.g.,
-# it would be a mistake to cache Application Name because it is mutable and can
-# be changed in Manage -> Packages while cache is immutable (i.e. it
-# its contents are obtained from the api only the first time).
+# getter should be cached - only the ones which change together with the
+# package revision. Cached data is dropped once the package is modified in
+# Manage -> Packages, and whenever the catalog notices that the package was
+# updated (see validate_cache), but otherwise it is obtained from the api only
+# the first time. E.g., it would be a mistake to cache the list of
+# applications inheriting the package, since it changes as other packages
+# come and go.
 @cache.with_cache('ui', 'ui.yaml')
 def get_app_ui(request, app_id):
     return api.muranoclient(request).packages.get_ui(app_id, make_loader_cls())
 
 
+@cache.with_cache('ui_compiled', 'v{0}'.format(compiler.FORMAT))
+def get_compiled_app_ui(request, app_id):
+    return compiler.compile_ui(get_app_ui(request, app_id))
+
+
 @cache.with_cache('logo', 'logo.png')
-def get_app_logo(request, app_id):
+def _get_app_logo(request, app_id):
     return api.muranoclient(request).packages.get_logo(app_id)
 
 
 @cache.with_cache('supplier_logo', 'supplier_logo.png')
-def get_app_supplier_logo(request, app_id):
+def _get_app_supplier_logo(request, app_id):
     return api.muranoclient(request).packages.get_supplier_logo(app_id)
 
 
+def _make_scaled_logo_getters(get_logo, dst_dir):
+    getters = {}
+    for size in logos.SIZES:
+        @cache.with_cache(dst_dir, '{0}-{1}.png'.format(dst_dir, size))
+        def get_scaled_logo(request, app_id, size=size):
+            return logos.scale(get_logo(request, app_id), size)
+        getters[size] = get_scaled_logo
+    return getters
+
+
+_scaled_logo_getters = _make_scaled_logo_getters(_get_app_logo, 'logo')
+_scaled_supplier_logo_getters = _make_scaled_logo_getters(
+    _get_app_supplier_logo, 'supplier_logo')
+
+
+def get_app_logo(request, app_id, size=None):
+    """Returns the logo of the package, scaled down to the size if given.
+
+    Scaled logos are cached next to the original ones, so each of them is
+    produced once per package revision.
+    """
+    size = logos.get_size(size)
+    if size is None or not logos.can_scale():
+        return _get_app_logo(request, app_id)
+    return _scaled_logo_getters[size](request, app_id)
+
+
+def get_app_supplier_logo(request, app_id, size=None):
+    size = logos.get_size(size)
+    if size is None or not logos.can_scale():
+        return _get_app_supplier_logo(request, app_id)
+    return _scaled_supplier_logo_getters[size](request, app_id)
+
+
 def get_app_fqn(request, app_id):
     return get_package_details(request, app_id).fully_qualified_name
 
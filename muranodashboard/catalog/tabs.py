@@ -52,44 +52,50 @@ class AppRequirementsTab(tabs.Tab):
         self._get_requirements()
         return {'application': self.app}
 
-    def _get_requirements(self):
+    def _get_flavor_requirements(self):
+        metadata = services.get_app_metadata(self.request, self.app.id)
+        if metadata['static']:
+            return metadata['flavor_requirements']
+
+        # some of the requirements are YAQL expressions, forms are needed
+        # to evaluate them
         forms = services.get_app_forms(self.request, {'app_id': self.app.id})
-        self.app.requirements = []
+        flavor_requirements = []
         for step_name, step in forms:
             for key in step.base_fields:
                 # Check for instance size requirements in the UI yaml file.
                 if key == 'flavor':
                     reqs = getattr(step.base_fields[key], 'requirements', '')
                     if reqs:
-                        # Make the requirement values screen-printable.
-                        self.app.requirements.append('Instance flavor:')
-                        requirements = []
-                        for req in reqs:
-                            if req == 'min_disk':
-                                requirements.append(
-                                    'Minimum disk size: {0} GB'.format(
-                                        str(reqs[req])))
-                            elif req == 'min_vcpus':
-                                requirements.append(
-                                    'Minimum vCPUs: {0}'.format(
-                                        str(reqs[req])))
-                            elif req == 'min_memory_mb':
-                                requirements.append(
-                                    'Minimum RAM size: {0} MB'.format(
-                                        str(reqs[req])))
-                            elif req == 'max_disk':
-                                requirements.append(
-                                    'Maximum disk size: {0} GB'.format(
-                                        str(reqs[req])))
-                            elif req == 'max_vcpus':
-                                requirements.append(
-                                    'Maximum vCPUs: {0}'.format(
-                                        str(reqs[req])))
-                            elif req == 'max_memory_mb':
-                                requirements.append(
-                                    'Maximum RAM size: {0} MB'.format(
-                                        str(reqs[req])))
-                        self.app.requirements.append(requirements)
+                        flavor_requirements.append(reqs)
+        return flavor_requirements
+
+    def _get_requirements(self):
+        self.app.requirements = []
+        for reqs in self._get_flavor_requirements():
+            # Make the requirement values screen-printable.
+            self.app.requirements.append('Instance flavor:')
+            requirements = []
+            for req in reqs:
+                if req == 'min_disk':
+                    requirements.append(
+                        'Minimum disk size: {0} GB'.format(str(reqs[req])))
+                elif req == 'min_vcpus':
+                    requirements.append(
+                        'Minimum vCPUs: {0}'.format(str(reqs[req])))
+                elif req == 'min_memory_mb':
+                    requirements.append(
+                        'Minimum RAM size: {0} MB'.format(str(reqs[req])))
+                elif req == 'max_disk':
+                    requirements.append(
+                        'Maximum disk size: {0} GB'.format(str(reqs[req])))
+                elif req == 'max_vcpus':
+                    requirements.append(
+                        'Maximum vCPUs: {0}'.format(str(reqs[req])))
+                elif req == 'max_memory_mb':
+                    requirements.append(
+                        'Maximum RAM size: {0} MB'.format(str(reqs[req])))
+            self.app.requirements.append(requirements)
 
 
 class AppLicenseAgreementTab(tabs.Tab):
@@ -108,6 +114,12 @@ class AppLicenseAgreementTab(tabs.Tab):
         return {'application': self.app}
 
     def _get_license(self):
+        metadata = services.get_app_metadata(self.request, self.app.id)
+        if metadata['static']:
+            self.app.license = metadata['license']
+            return
+
+        # the license is a YAQL expression, forms are needed to evaluate it
         forms = services.get_app_forms(self.request, {'app_id': self.app.id})
         self.app.license = ''
         for step_name, step in forms:
@@ -22,6 +22,8 @@ wizard_view = views.Wizard.as_view(
 
 urlpatterns = [
     urls.url(r'^$', views.IndexView.as_view(), name='index'),
+    urls.url(r'^bootstrap$', views.BootstrapView.as_view(),
+             name='bootstrap'),
     urls.url(r'^switch_environment/(?P<environment_id>[^/]+)$',
              views.switch, name='switch_env'),
     urls.url(r'^add/(?P<app_id>[^/]+)/(?P<environment_id>[^/]+)/'
@@ -33,6 +35,7 @@ urlpatterns = [
              views.quick_deploy, name='quick_deploy'),
     urls.url(r'^details/(?P<application_id>[^/]+)$',
              views.AppDetailsView.as_view(), name='application_details'),
+    urls.url(r'^images-batch$', views.get_images, name='images_batch'),
     urls.url(r'^images/(?P<app_id>[^/]*)',
              views.get_image, name="images"),
     urls.url(r'^supplier-images/(?P<app_id>[^/]*)',
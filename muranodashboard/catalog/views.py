@@ -12,9 +12,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
 import collections
 import copy
 import functools
+import hashlib
 import json
 import re
 import uuid
@@ -34,6 +36,7 @@ except ImportError:
     from formtools.wizard import views as wizard_views
 from django import http
 from django import shortcuts
+from django.utils import cache as cache_utils
 from django.utils import decorators as django_dec
 from django.utils import html
 from django.utils import http as http_utils
@@ -45,15 +48,18 @@ from horizon import messages
 from horizon import tabs
 from horizon import views as generic_views
 from novaclient import exceptions as nova_exceptions
-from openstack_dashboard.api import nova
-from openstack_dashboard.usage import quotas
 from oslo_log import log as logging
 import six
 
 from muranoclient.common import exceptions as exc
 from muranodashboard import api
+from muranodashboard.api import categories as categories_api
 from muranodashboard.api import packages as pkg_api
 from muranodashboard.catalog import tabs as catalog_tabs
+from muranodashboard.common import catalog_index
+from muranodashboard.common import concurrency
+from muranodashboard.common import pagination
+from muranodashboard.common import resources
 from muranodashboard.common import utils
 from muranodashboard.dynamic_ui import helpers
 from muranodashboard.dynamic_ui import services
@@ -64,6 +70,17 @@ from muranodashboard.packages import consts as pkg_consts
 LOG = logging.getLogger(__name__)
 ALL_CATEGORY_NAME = 'All'
 LATEST_APPS_QUEUE_LIMIT = 3
+# Wizard cached data which is requested again on the last step
+WIZARD_CACHE_VOLATILE_KEYS = ('environment_name', 'flavors', 'quota_usages')
+# Logos requested at once by catalog and topology pages, see get_images
+LOGO_BATCH_LIMIT = 100
+LOGO_BATCH_WORKERS = 8
+# Bigger logos are not worth inlining into the batch response
+LOGO_BATCH_INLINE_MAX_SIZE = 64 * 1024
+# Package attributes returned by the catalog bootstrap endpoint
+BOOTSTRAP_PACKAGE_FIELDS = ('id', 'name', 'fully_qualified_name',
+                            'description', 'author', 'categories', 'tags',
+                            'is_public', 'enabled', 'owner_id', 'updated')
 
 
 class DictToObj(object):
@@ -89,7 +106,11 @@ def is_valid_environment(environment, valid_environments):
 
 
 def get_environments_context(request):
-    envs = get_available_environments(request)
+    return make_environments_context(request,
+                                     get_available_environments(request))
+
+
+def make_environments_context(request, envs):
     context = {'available_environments': envs}
     environment = request.session.get('environment')
     if environment and is_valid_environment(environment, envs):
@@ -99,6 +120,10 @@ def get_environments_context(request):
     return context
 
 
+def _get_catalog_fetch_workers():
+    return getattr(settings, 'MURANO_CATALOG_FETCH_WORKERS', 4)
+
+
 def get_categories_list(request):
     """Returns a list of categories, sorted.
 
@@ -108,21 +133,14 @@ def get_categories_list(request):
 
     categories = []
     with api.handled_exceptions(request):
-        client = api.muranoclient(request)
-        categories = client.categories.list()
-
-    # NOTE(kzaitsev) We rely here on tuple comparison and ascending order of
-    # sorted(). i.e. (False, 'a') < (False, 'b') < (True, 'a') < (True, 'b')
-    # So to make order more human-friendly we sort based on
-    # package_count == 0, pushing categories without packages in front and
-    # and then sorting them alphabetically
-    categories = [cat for cat in sorted(
-        categories, key=lambda c: (c.package_count == 0, c.name))]
-    # TODO(kzaitsev): add sorting options to category API
-
+        categories = list_categories(request)
     return categories
 
 
+def list_categories(request):
+    return categories_api.category_list(request)
+
+
 @auth_dec.login_required
 def switch(request, environment_id,
            redirect_field_name=auth.REDIRECT_FIELD_NAME):
@@ -189,14 +207,25 @@ def cleaned_latest_apps(request):
     Verifies, that apps in the list are either public or belong to current
     project.
     """
-    id_param = "in:" + ",".join(request.session.get('latest_apps', []))
-    query_params = {'type': 'Application', 'catalog': True, 'id': id_param}
-    user_apps = list(api.muranoclient(request).packages.filter(**query_params))
+    user_apps = list_latest_apps(request,
+                                 request.session.get('latest_apps', []))
     request.session['latest_apps'] = collections.deque([app.id
                                                         for app in user_apps])
     return user_apps
 
 
+def list_latest_apps(request, app_ids):
+    """Returns those of the apps which are public or belong to the project.
+
+    Unlike :func:`cleaned_latest_apps` the session is left intact.
+    """
+    id_param = "in:" + ",".join(app_ids)
+    query_params = {'type': 'Application', 'catalog': True, 'id': id_param}
+    user_apps = list(api.muranoclient(request).packages.filter(**query_params))
+    pkg_api.validate_cache(user_apps)
+    return user_apps
+
+
 def clear_forms_data(func):
     """Removes form data from session
 
@@ -250,32 +279,99 @@ def quick_deploy(request, app_id):
                   do_redirect=True, drop_wm_form=True)
 
 
+def _get_logo_max_age():
+    return getattr(settings, 'MURANO_LOGO_CACHE_MAX_AGE', 24 * 60 * 60)
+
+
+def _make_cacheable_response(request, content, content_type):
+    # logos of a package only change with the package, so the digest of the
+    # cached content is a strong validator
+    etag = '"{0}"'.format(hashlib.sha1(content).hexdigest())
+    response = cache_utils.get_conditional_response(request, etag=etag)
+    if response is None:
+        response = http.HttpResponse(content=content,
+                                     content_type=content_type)
+    response['ETag'] = etag
+    cache_utils.patch_cache_control(response, private=True,
+                                    max_age=_get_logo_max_age())
+    return response
+
+
+def _make_logo_response(request, content):
+    if content:
+        return _make_cacheable_response(request, content, 'image/png')
+    universal_logo = static('muranodashboard/images/icon.png')
+    response = http.HttpResponseRedirect(universal_logo)
+    cache_utils.patch_cache_control(response, private=True,
+                                    max_age=_get_logo_max_age())
+    return response
+
+
 def get_image(request, app_id):
     try:
-        content = pkg_api.get_app_logo(request, app_id)
+        content = pkg_api.get_app_logo(request, app_id,
+                                       size=request.GET.get('size'))
     except (AttributeError, exc.HTTPNotFound):
         message = _("Can not get logo for {0}.").format(app_id)
         LOG.warning(message)
         content = None
-    if content:
-        return http.HttpResponse(content=content, content_type='image/png')
-    else:
-        universal_logo = static('muranodashboard/images/icon.png')
-        return http.HttpResponseRedirect(universal_logo)
+    return _make_logo_response(request, content)
 
 
 def get_supplier_image(request, app_id):
     try:
-        content = pkg_api.get_app_supplier_logo(request, app_id)
+        content = pkg_api.get_app_supplier_logo(request, app_id,
+                                                size=request.GET.get('size'))
     except (AttributeError, exc.HTTPNotFound):
         message = _("Can not get supplier logo for {0}.").format(app_id)
         LOG.warning(message)
         content = None
-    if content:
-        return http.HttpResponse(content=content, content_type='image/png')
-    else:
-        universal_logo = static('muranodashboard/images/icon.png')
-        return http.HttpResponseRedirect(universal_logo)
+    return _make_logo_response(request, content)
+
+
+def _get_logo_data_uri(request, app_id, size):
+    try:
+        content = pkg_api.get_app_logo(request, app_id, size=size)
+    except (AttributeError, exc.HTTPNotFound):
+        content = None
+    if not content:
+        return static('muranodashboard/images/icon.png')
+    if len(content) > LOGO_BATCH_INLINE_MAX_SIZE:
+        return None
+    return 'data:image/png;base64,{0}'.format(
+        base64.b64encode(content).decode('ascii'))
+
+
+def get_images(request):
+    """Returns logos of several applications at once.
+
+    Application ids are given as a comma separated ``ids`` query parameter,
+    logos are scaled down to the ``size`` query parameter if it is given.
+    The response maps them to data URIs of the logos, or to the URL of the
+    default icon for applications without a logo. Applications whose logo
+    could not be obtained, or is too big to be inlined, are left out, so the
+    client should fall back to the ``images`` endpoint for them.
+    """
+    app_ids = sorted(set(app_id for app_id in
+                         request.GET.get('ids', '').split(',') if app_id))
+    if len(app_ids) > LOGO_BATCH_LIMIT:
+        return http.HttpResponseBadRequest(
+            'At most {0} logos could be requested at once'.format(
+                LOGO_BATCH_LIMIT))
+
+    results = concurrency.run_concurrently(
+        [functools.partial(_get_logo_data_uri, request, app_id,
+                           request.GET.get('size'))
+         for app_id in app_ids], LOGO_BATCH_WORKERS)
+    logos = {}
+    for app_id, result in zip(app_ids, results):
+        if result.failed:
+            LOG.warning('Can not get logo for {0}: {1}'.format(
+                app_id, result.exc_info[1]))
+        elif result.value:
+            logos[app_id] = result.value
+    content = json.dumps(logos, sort_keys=True).encode('utf-8')
+    return _make_cacheable_response(request, content, 'application/json')
 
 
 class LazyWizard(wizard_views.SessionWizardView):
@@ -445,19 +541,56 @@ class Wizard(generic_views.PageTitleMixin, views.ModalFormMixin, LazyWizard):
         value = self._get_wizard_param(key)
         return utils.ensure_python_obj(value)
 
+    def get_wizard_cache(self, wizard_id):
+        """Returns data cached for the lifetime of the wizard.
+
+        The cache lives in the wizard storage, so the data is not requested
+        again on every step. Data which may change meanwhile (environment
+        name, flavors and quota usages) is requested again on the last step,
+        before the application is added.
+        """
+        stored_data = self.storage.extra_data
+        cache = stored_data.get('wizard_cache')
+        if cache is None or cache.get('wizard_id') != wizard_id:
+            cache = {'wizard_id': wizard_id}
+            stored_data['wizard_cache'] = cache
+        elif self.steps.current == self.steps.last:
+            # NOTE: the last step may be rendered several times (e.g. on
+            # validation errors), data is requested again each time
+            for key in WIZARD_CACHE_VOLATILE_KEYS:
+                cache.pop(key, None)
+            resources.invalidate(self.request, resources.QUOTA_USAGES)
+        self._wizard_cache = cache
+        return cache
+
+    def _get_cached(self, key, getter, *subkeys):
+        cache = getattr(self, '_wizard_cache', None)
+        if cache is None:
+            return getter()
+        for subkey in subkeys:
+            cache = cache.setdefault(key, {})
+            key = subkey
+        if key in cache:
+            return cache[key]
+        value = cache[key] = getter()
+        return value
+
     def get_flavors(self):
+        def list_flavors():
+            def extract(flavor):
+                info = flavor._info
+                return {k: v for (k, v) in info.items() if k != 'links'}
+            return [extract(f) for f in resources.flavor_list(self.request)]
+
         try:
-            flavors = nova.flavor_list(self.request)
+            flavors = self._get_cached(
+                'flavors', list_flavors, self.request.user.services_region)
         except nova_exceptions.ClientException:
             message = _("Failed to get list of flavors.")
             exceptions.handle(self.request, message)
             LOG.exception(message)
             flavors = []
 
-        def extract(flavor):
-            info = flavor._info
-            return {k: v for (k, v) in info.items() if k != 'links'}
-        flavors = [extract(f) for f in flavors]
         self.storage.extra_data['flavors'] = flavors
         return json.dumps(flavors)
 
@@ -495,10 +628,26 @@ class Wizard(generic_views.PageTitleMixin, views.ModalFormMixin, LazyWizard):
 
         return step_usages
 
+    def get_usage_totals(self, index):
+        """Returns usages of the environment and steps up to the index.
+
+        Running totals are kept in the wizard storage, so that rendering a
+        step adds only usages of the steps not summed up yet.
+        """
+        step_usages = self.init_usages()
+        totals = self.storage.extra_data.setdefault('usage_totals', [])
+        while len(totals) <= index:
+            totals.append(self.aggregate_usages(
+                totals[-1:] + [step_usages[len(totals)]]))
+        return totals[index]
+
     def process_step(self, form):
         data = super(Wizard, self).process_step(form)
         region = form.region or self.request.user.services_region
         step_usages = self.init_usages()
+        # totals including the usages of this step are to be summed again
+        del self.storage.extra_data.setdefault('usage_totals', [])[
+            self.steps.step0 + 1:]
         if 'flavor' in form.cleaned_data:
             usages = self.get_flavor_usages(form)
             step_usages[self.steps.step0 + 1][region].update({
@@ -516,9 +665,10 @@ class Wizard(generic_views.PageTitleMixin, views.ModalFormMixin, LazyWizard):
         return data
 
     def update_usages(self, form, context):
-        data = self.init_usages()
-        usages = quotas.tenant_quota_usages(self.request).usages
         region = self.request.user.services_region
+        usages = self._get_cached(
+            'quota_usages', lambda: resources.quota_usages(self.request),
+            region)
         inf = float('inf')
 
         def get_usage(group, name, default):
@@ -537,16 +687,12 @@ class Wizard(generic_views.PageTitleMixin, views.ModalFormMixin, LazyWizard):
             'flavors': self.get_flavors(),
             'contexts': ['', 'info', 'success']
         })
-        for step in range(self.steps.step0 + 1):
-
-            def sum_usage(context_key, data_key):
-                if context_key not in context['other_usages']:
-                    context['other_usages'][context_key] = 0
-                context['other_usages'][context_key] += \
-                    data[step][region].get(data_key, 0)
-            sum_usage('totalInstancesUsed', 'instances')
-            sum_usage('totalCoresUsed', 'vcpus')
-            sum_usage('totalRAMUsed', 'ram')
+        totals = self.get_usage_totals(self.steps.step0).get(region, {})
+        context['other_usages'].update({
+            'totalInstancesUsed': totals.get('instances', 0),
+            'totalCoresUsed': totals.get('vcpus', 0),
+            'totalRAMUsed': totals.get('ram', 0),
+        })
 
         return context
 
@@ -575,16 +721,23 @@ class Wizard(generic_views.PageTitleMixin, views.ModalFormMixin, LazyWizard):
         wizard_id = self.request.POST.get('wizard_id')
         if wizard_id is None:
             wizard_id = uuid.uuid4()
+        self.get_wizard_cache(six.text_type(wizard_id))
 
         environment_id = self.kwargs.get('environment_id')
         environment_id = utils.ensure_python_obj(environment_id)
-        if environment_id is not None:
-            env_name = mc.environments.get(environment_id).name
-        else:
-            env_name = get_next_quick_environment_name(self.request)
 
-        field_descr, extended_descr = services.get_app_field_descriptions(
-            self.request, app_id, self.steps.index)
+        def get_env_name():
+            if environment_id is not None:
+                return mc.environments.get(environment_id).name
+            else:
+                return get_next_quick_environment_name(self.request)
+        env_name = self._get_cached('environment_name', get_env_name)
+
+        field_descr, extended_descr = self._get_cached(
+            'field_descriptions',
+            lambda: services.get_app_field_descriptions(
+                self.request, app_id, self.steps.index),
+            self.steps.index)
 
         context.update({'type': app.fully_qualified_name,
                         'service_name': app.name,
@@ -610,6 +763,8 @@ class IndexView(generic_views.PageTitleMixin, list_view.ListView):
     def __init__(self, **kwargs):
         super(IndexView, self).__init__(**kwargs)
         self._more = None
+        self._parts = None
+        self._applied_parts = {}
 
     @staticmethod
     def get_object_id(datum):
@@ -645,45 +800,127 @@ class IndexView(generic_views.PageTitleMixin, list_view.ListView):
         query_params['sort_dir'] = self.request.GET.get('sort_dir', 'asc')
         return query_params
 
-    def get_queryset(self):
-        query_params = self.get_query_params(internal_query=True)
-        marker = self.request.GET.get('marker')
-
-        sort_dir = query_params['sort_dir']
+    def list_packages(self, query_params, marker, page_size, **kwargs):
+        # browsing and search are answered by the catalog index unless it
+        # is disabled
+        if catalog_index.is_supported(query_params):
+            return catalog_index.package_list(
+                self.request, query_params, marker=marker,
+                page_size=page_size)
+        return pkg_api.package_list(
+            self.request, filters=query_params, paginate=True, marker=marker,
+            page_size=page_size, **kwargs)
+
+    def get_part_getters(self):
+        """Returns functions obtaining the parts of the page by their name.
+
+        None of them depends on another one. As they may be called in worker
+        threads they only return data, the session, messages and pagination
+        are updated by :meth:`get_part` in the request thread.
+        """
+        latest_app_ids = list(self.request.session.get('latest_apps', []))
+        return collections.OrderedDict([
+            ('packages', self.list_page),
+            ('categories', functools.partial(list_categories,
+                                             self.request)),
+            ('latest_apps', functools.partial(list_latest_apps,
+                                              self.request, latest_app_ids)),
+            ('environments', functools.partial(get_available_environments,
+                                               self.request)),
+        ])
+
+    def fetch_parts(self):
+        """Obtains all the parts of the page concurrently.
+
+        Returns :class:`~muranodashboard.common.concurrency.Result` objects
+        by the name of the part. At most ``MURANO_CATALOG_FETCH_WORKERS``
+        parts are obtained at once, so the page takes about as long as the
+        slowest of them instead of all of them together.
+        """
+        getters = self.get_part_getters()
+        results = concurrency.run_concurrently(list(getters.values()),
+                                               _get_catalog_fetch_workers())
+        self._parts = collections.OrderedDict(zip(getters, results))
+        return self._parts
+
+    def get_part(self, name):
+        """Returns a part of the page, re-raising the error obtaining it.
+
+        The part is taken from the ones obtained by :meth:`fetch_parts` if
+        it has been called, otherwise it is obtained right away. Either way
+        it is applied to the request once, in the current thread.
+        """
+        if name not in self._applied_parts:
+            if self._parts is not None and name in self._parts:
+                result = self._parts[name]
+            else:
+                result = concurrency.call(self.get_part_getters()[name])
+            apply_part = getattr(self, '_apply_' + name)
+            self._applied_parts[name] = apply_part(result)
+        return self._applied_parts[name]
 
+    def _apply_packages(self, result):
         packages = []
         with api.handled_exceptions(self.request):
-            query_params['catalog'] = True
-            packages, self._more = pkg_api.package_list(
-                self.request, filters=query_params, paginate=True,
-                marker=marker, page_size=self.paginate_by, sort_dir=sort_dir,
-                limit=self.paginate_by)
+            packages, self._more = result.get()
 
-        if sort_dir == 'desc':
+        if self.request.GET.get('sort_dir', 'asc') == 'desc':
             packages = list(reversed(packages))
 
         return packages
 
+    def _apply_categories(self, result):
+        categories = []
+        with api.handled_exceptions(self.request):
+            categories = result.get()
+        return categories
+
+    def _apply_latest_apps(self, result):
+        user_apps = result.get()
+        self.request.session['latest_apps'] = collections.deque(
+            [app.id for app in user_apps])
+        return user_apps
+
+    def _apply_environments(self, result):
+        return make_environments_context(self.request, result.get())
+
+    def get(self, request, *args, **kwargs):
+        self.fetch_parts()
+        return super(IndexView, self).get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        return self.get_part('packages')
+
+    def list_page(self):
+        """Returns the page of packages and whether there are more of them.
+
+        Packages are in the order they were listed in, see
+        :meth:`_apply_packages`.
+        """
+        query_params = self.get_query_params(internal_query=True)
+        marker = self.request.GET.get('marker')
+
+        sort_dir = query_params['sort_dir']
+        query_params['catalog'] = True
+        packages, more = self.list_packages(
+            query_params, marker, self.paginate_by, sort_dir=sort_dir,
+            limit=self.paginate_by)
+        pkg_api.validate_cache(packages)
+        return packages, more
+
     def get_template_names(self):
         return ['catalog/index.html']
 
+    def get_page_boundaries(self):
+        return pagination.get_boundaries(
+            self._more, self.request.GET.get('marker'),
+            backward=self.request.GET.get('sort_dir', 'asc') == 'desc')
+
     def has_next_page(self):
-        if self.request.GET.get('sort_dir', 'asc') == 'asc':
-            return self._more
-        else:
-            query_params = self.get_query_params(internal_query=True)
-            query_params['sort_dir'] = 'asc'
-            query_params['catalog'] = True
-            packages, more = pkg_api.package_list(
-                self.request, filters=query_params, paginate=True,
-                marker=self.get_marker(), page_size=1)
-            return len(packages) > 0
+        return self.get_page_boundaries()[1]
 
     def has_prev_page(self):
-        if self.request.GET.get('sort_dir', 'asc') == 'desc':
-            return self._more
-        else:
-            return self.request.GET.get('marker') is not None
+        return self.get_page_boundaries()[0]
 
     def paginate_queryset(self, queryset, page_size):
         # override this method explicitly to skip unnecessary calculations
@@ -723,9 +960,9 @@ class IndexView(generic_views.PageTitleMixin, list_view.ListView):
 
         context.update({
             'ALL_CATEGORY_NAME': ALL_CATEGORY_NAME,
-            'categories': get_categories_list(self.request),
+            'categories': self.get_part('categories'),
             'current_category': self.get_current_category(),
-            'latest_list': cleaned_latest_apps(self.request)
+            'latest_list': self.get_part('latest_apps')
         })
 
         search = self.request.GET.get('search')
@@ -733,7 +970,7 @@ class IndexView(generic_views.PageTitleMixin, list_view.ListView):
             context['search'] = search
 
         context['tenant_id'] = self.request.session['token'].tenant['id']
-        context.update(get_environments_context(self.request))
+        context.update(self.get_part('environments'))
         context['display_repo_url'] = pkg_consts.DISPLAY_MURANO_REPO_URL
         context['pkg_def_url'] = reverse('horizon:app-catalog:packages:index')
         context['no_apps'] = True
@@ -744,6 +981,73 @@ class IndexView(generic_views.PageTitleMixin, list_view.ListView):
         return context
 
 
+def _package_to_dict(package):
+    data = dict((field, getattr(package, field, None))
+                for field in BOOTSTRAP_PACKAGE_FIELDS)
+    data['logo_url'] = reverse('horizon:app-catalog:catalog:images',
+                               args=(package.id,))
+    data['details_url'] = reverse(
+        'horizon:app-catalog:catalog:application_details',
+        args=(package.id,))
+    return data
+
+
+class BootstrapView(IndexView):
+    """Returns everything the catalog page shows as a single JSON document.
+
+    Accepts the query parameters of the catalog page. Parts of the page are
+    obtained concurrently, and the time each of them took (in seconds) is
+    returned in ``timings``. Parts which could not be obtained are null and
+    listed in ``errors``. Logos are not included, ``logos_url`` returns them
+    for a batch of applications at once.
+    """
+
+    def get(self, request, *args, **kwargs):
+        parts = self.fetch_parts()
+        data = {'timings': dict((name, result.elapsed)
+                                for name, result in parts.items()),
+                'errors': [name for name, result in parts.items()
+                           if result.failed]}
+        for name in data['errors']:
+            LOG.warning('Can not get {0} of the catalog: {1}'.format(
+                name, parts[name].exc_info[1]))
+        values = dict((name, None if result.failed else self.get_part(name))
+                      for name, result in parts.items())
+
+        packages = values['packages']
+        if packages is not None:
+            has_prev_page, has_next_page = self.get_page_boundaries()
+            packages = [_package_to_dict(package) for package in packages]
+        else:
+            has_prev_page = has_next_page = False
+        categories = values['categories']
+        if categories is not None:
+            categories = [{'id': category.id, 'name': category.name,
+                           'package_count': category.package_count}
+                          for category in categories]
+        latest_apps = values['latest_apps']
+        if latest_apps is not None:
+            latest_apps = [_package_to_dict(app) for app in latest_apps]
+        environments = values['environments'] or {}
+        environment = environments.get('environment')
+
+        data.update({
+            'packages': packages,
+            'has_prev_page': has_prev_page,
+            'has_next_page': has_next_page,
+            'current_category': self.get_current_category(),
+            'categories': categories,
+            'latest_apps': latest_apps,
+            'environments': [
+                {'id': env.id, 'name': env.name, 'status': env.status}
+                for env in environments.get('available_environments', [])],
+            'environment': environment.id if environment else None,
+            'logos_url': reverse('horizon:app-catalog:catalog:images_batch'),
+        })
+        return http.HttpResponse(json.dumps(data, sort_keys=True),
+                                 content_type='application/json')
+
+
 class AppDetailsView(tabs.TabView):
     tab_group_class = catalog_tabs.ApplicationTabs
     template_name = 'catalog/app_details.html'
@@ -755,6 +1059,7 @@ class AppDetailsView(tabs.TabView):
         LOG.debug(('AppDetailsView get_data: {0}'.format(kwargs)))
         app_id = kwargs.get('application_id')
         self.app = api.muranoclient(self.request).packages.get(app_id)
+        pkg_api.validate_cache([self.app])
         return self.app
 
     def get_context_data(self, **kwargs):
@@ -18,6 +18,7 @@ from horizon import forms as horizon_forms
 from horizon import messages
 
 from muranodashboard import api
+from muranodashboard.api import categories as categories_api
 
 
 class AddCategoryForm(horizon_forms.SelfHandlingForm):
@@ -30,6 +31,7 @@ class AddCategoryForm(horizon_forms.SelfHandlingForm):
         if data:
             with api.handled_exceptions(self.request):
                 category = api.muranoclient(self.request).categories.add(data)
+                categories_api.invalidate_cache()
                 messages.success(request, _('Category {0} created.')
                                  .format(data['name']))
                 return category
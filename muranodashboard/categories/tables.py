@@ -23,6 +23,7 @@ from openstack_dashboard import policy
 from oslo_log import log as logging
 
 from muranodashboard import api
+from muranodashboard.api import categories as categories_api
 from muranodashboard.common import utils as md_utils
 
 LOG = logging.getLogger(__name__)
@@ -68,6 +69,7 @@ class DeleteCategory(policy.PolicyTargetMixin, tables.DeleteAction):
     def delete(self, request, obj_id):
         try:
             api.muranoclient(request).categories.delete(obj_id)
+            categories_api.invalidate_cache()
         except exc.HTTPException:
             msg = _('Unable to delete category')
             LOG.exception(msg)
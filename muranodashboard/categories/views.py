@@ -12,8 +12,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import itertools
-
 from django.urls import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 from horizon.forms import views
@@ -23,6 +21,7 @@ from horizon.utils import functions as utils
 from muranodashboard import api
 from muranodashboard.categories import forms
 from muranodashboard.categories import tables
+from muranodashboard.common import pagination
 
 
 class CategoriesView(horizon_tables.DataTableView):
@@ -50,7 +49,6 @@ class CategoriesView(horizon_tables.DataTableView):
 
         page_size = utils.get_page_size(self.request)
 
-        request_size = page_size + 1
         kwargs = {'filters': {}}
         if marker:
             kwargs['marker'] = marker
@@ -61,24 +59,10 @@ class CategoriesView(horizon_tables.DataTableView):
         self._more = False
         with api.handled_exceptions(self.request):
             categories_iter = api.muranoclient(self.request).categories.list(
-                limit=request_size, **kwargs)
-
-            categories = list(itertools.islice(categories_iter, request_size))
-            # first and middle page condition
-            if len(categories) > page_size:
-                categories.pop(-1)
-                self._more = True
-                # middle page condition
-                if marker is not None:
-                    self._prev = True
-            # first page condition when reached via prev back
-            elif sort_dir == 'asc' and marker is not None:
-                self._more = True
-            # last page condition
-            elif marker is not None:
-                self._prev = True
-            if prev_marker is not None:
-                categories.reverse()
+                limit=page_size + 1, **kwargs)
+            categories, self._prev, self._more = pagination.paginate(
+                categories_iter, page_size, marker,
+                backward=prev_marker is not None)
         return categories
 
 
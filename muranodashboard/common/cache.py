@@ -12,11 +12,26 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
 import functools
+import io
 import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zlib
 
+from django.conf import settings
+from django.core import cache as django_cache
+from django.utils import module_loading
+from oslo_concurrency import lockutils
 from oslo_log import log as logging
+import six
 
+from muranodashboard.common import memory_cache
 from muranodashboard.common import utils
 from muranodashboard.environments import consts
 
@@ -24,60 +39,541 @@ from muranodashboard.environments import consts
 LOG = logging.getLogger(__name__)
 OBJS_PATH = os.path.join(consts.CACHE_DIR, 'apps')
 
-if not os.path.exists(OBJS_PATH):
-    os.makedirs(OBJS_PATH)
+if utils.ensure_dir(OBJS_PATH):
     LOG.info('Creating apps cache directory located at {dir}'.
              format(dir=OBJS_PATH))
 
 LOG.info('Using apps cache directory located at {dir}'.
          format(dir=OBJS_PATH))
 
+DEFAULT_BACKEND = 'muranodashboard.common.cache.FileSystemBackend'
 
-def _get_entry_path(app_id):
-    head, tail = app_id[:2], app_id[2:]
-    head = os.path.join(OBJS_PATH, head)
-    if not os.path.exists(head):
-        os.mkdir(head)
-    tail = os.path.join(head, tail)
-    if not os.path.exists(tail):
-        os.mkdir(tail)
-    return tail
+# Share of max_size the filesystem backend shrinks the cache to on eviction,
+# so that eviction does not happen on every following write
+EVICTION_WATERMARK = 0.9
+
+# Entries are pickled with the highest protocol after the header, which
+# tells them from protocol 0 entries written by previous releases
+FORMAT_HEADER = b'muranodashboard-cache:2\n'
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+PICKLED_SUFFIX = '-pickled'
+# Bytes, such as logos, are kept as is
+RAW_SUFFIX = '-raw'
+
+# Revision of the package the cached values of an application belong to
+STAMP_PARTS = ('stamp',)
+
+# Temporary files are written next to the entries they are going to replace
+TMP_SUFFIX = '.tmp'
+
+# Temporary files older than that are left by crashed writers and are
+# removed on eviction
+STALE_TMP_AGE = 3600
+
+# Number of lock files shared by entries of the filesystem backend
+LOCK_STRIPES = 64
+
+# Default limit of the total size of values kept in memory by each process
+DEFAULT_MEMORY_MAX_SIZE = 32 * 1024 * 1024
+
+_tiers = None
+_tiers_lock = threading.Lock()
+# Cached functions calling each other take the lock of the outermost entry
+# only, so that threads and processes never wait for one lock holding another
+_held = threading.local()
+
+
+def _get_entry_dir(app_id, location=OBJS_PATH):
+    return os.path.join(location, app_id[:2], app_id[2:])
+
+
+def _read(f):
+    header = f.read(len(FORMAT_HEADER))
+    if header == FORMAT_HEADER:
+        return utils.CustomUnpickler(f).load(), False
+    # entries written before the header was introduced are protocol 0
+    # pickles, which never start with the header
+    f.seek(0)
+    return utils.CustomUnpickler(f).load(), True
 
 
 def _load_from_file(file_name):
-    if os.path.isfile(file_name) and os.path.getsize(file_name) > 0:
+    """Loads an entry, returns None if there is no such entry.
+
+    Files with ``RAW_SUFFIX`` keep bytes as is, other files are pickled.
+    Entries of the legacy format are rewritten in the current one.
+    """
+    try:
         with open(file_name, 'rb') as f:
-            p = utils.CustomUnpickler(f)
-            return p.load()
-    return None
+            if file_name.endswith(RAW_SUFFIX):
+                return f.read()
+            content, legacy = _read(f)
+    except (IOError, OSError):
+        return None
+    except Exception:
+        # could only be left by a writer which did not replace files
+        # atomically, the entry is going to be overwritten
+        LOG.warning('Unable to load cached value from {0}'.format(file_name))
+        return None
+
+    if legacy:
+        LOG.debug('Migrating cached value at {0}'.format(file_name))
+        try:
+            _save_entry(file_name[:-len(PICKLED_SUFFIX)], content)
+        except (IOError, OSError):
+            LOG.warning('Unable to migrate cached value at {0}'.format(
+                file_name))
+    return content
+
 
+def _save_to_file(file_name, content, fsync=False):
+    """Writes content to a temporary file, then renames it into place.
 
-def _save_to_file(file_name, content):
+    Readers never see a partially written file, and of concurrent writers
+    of the same entry the last one wins. If fsync is True, both the file and
+    its directory are flushed to the disk before returning.
+    """
     dir_path = os.path.dirname(file_name)
-    if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
-    with open(file_name, 'wb') as f:
-        p = utils.CustomPickler(f)
-        p.dump(content)
+    utils.ensure_dir(dir_path)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix='.{0}.'.format(os.path.basename(file_name)),
+        suffix=TMP_SUFFIX, dir=dir_path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if file_name.endswith(RAW_SUFFIX):
+                f.write(content)
+            else:
+                f.write(FORMAT_HEADER)
+                p = utils.CustomPickler(f, PICKLE_PROTOCOL)
+                p.dump(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        _replace(tmp_name, file_name)
+    except Exception:
+        exc_info = sys.exc_info()
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+        six.reraise(*exc_info)
+    if fsync and hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _save_entry(base_name, content, fsync=False):
+    """Saves content in the format suiting it, returns the file name."""
+    if isinstance(content, six.binary_type):
+        file_name, other_name = (base_name + RAW_SUFFIX,
+                                 base_name + PICKLED_SUFFIX)
+    else:
+        file_name, other_name = (base_name + PICKLED_SUFFIX,
+                                 base_name + RAW_SUFFIX)
+    _save_to_file(file_name, content, fsync=fsync)
+    # NOTE: the file of another format would shadow the new value
+    try:
+        os.remove(other_name)
+    except OSError:
+        pass
+    return file_name
+
+
+def _replace(src, dst):
+    # NOTE: os.rename does not overwrite existing files on Windows, while
+    # os.replace is not available under python2
+    replace = getattr(os, 'replace', os.rename)
+    replace(src, dst)
+
+
+@contextlib.contextmanager
+def _no_lock():
+    yield
+
+
+def _dumps(content):
+    data = io.BytesIO()
+    utils.CustomPickler(data, PICKLE_PROTOCOL).dump(content)
+    return data.getvalue()
+
+
+def _loads(data):
+    return utils.CustomUnpickler(io.BytesIO(data)).load()
+
+
+class FileSystemBackend(object):
+    """Keeps pickled entries in files under ``location``.
+
+    Entries of an application are kept in ``<location>/<2 chars>/<rest>/``
+    directory, where the application id is split in two parts. If
+    ``max_size`` (in bytes) is set, the least recently used entries are
+    evicted once the total size of the cache exceeds it.
+
+    Entries are replaced atomically, and if ``fsync`` is set they are also
+    flushed to the disk, so the directory could be shared by several
+    processes or dashboard nodes (e.g. over NFS). File locks in
+    ``lock_path`` let only one of the processes obtain a missing entry,
+    unless ``single_flight`` is unset.
+    """
+
+    def __init__(self, location=None, max_size=0, fsync=False,
+                 single_flight=True, lock_path=None):
+        self.location = location or OBJS_PATH
+        self.max_size = max_size
+        self.fsync = fsync
+        self.single_flight = single_flight
+        self.lock_path = lock_path or self.location.rstrip(os.sep) + '-locks'
+        self._size = None
+        self._lock = threading.Lock()
+
+    def _get_base_name(self, app_id, parts):
+        path = os.path.join(_get_entry_dir(app_id, self.location), *parts)
+        # Remove file extensions since the suffix of the file tells the
+        # format of its content
+        return os.path.splitext(path)[0]
+
+    def get(self, app_id, parts):
+        return self.get_entry(app_id, parts)[0]
+
+    def get_entry(self, app_id, parts):
+        """Returns the entry and the size of its file.
+
+        The size is None if it is unknown, and the entry is None if there
+        is no such entry.
+        """
+        base_name = self._get_base_name(app_id, parts)
+        for suffix in (PICKLED_SUFFIX, RAW_SUFFIX):
+            path = base_name + suffix
+            content = _load_from_file(path)
+            if content is not None:
+                break
+        else:
+            return None, None
+
+        try:
+            size = os.path.getsize(path)
+            if self.max_size:
+                # modification time is the last access time of an entry,
+                # since file systems are often mounted with noatime
+                os.utime(path, None)
+        except OSError:
+            size = None
+        return content, size
+
+    def set(self, app_id, parts, content):
+        """Stores the entry, returns the size of its file.
+
+        The size is None if it is unknown, e.g. when the file has been
+        evicted by another process already.
+        """
+        path = _save_entry(self._get_base_name(app_id, parts), content,
+                           fsync=self.fsync)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = None
+        if self.max_size:
+            with self._lock:
+                if self._size is None or size is None:
+                    self._size = sum(entry_size for _m, entry_size, _p
+                                     in self._scan())
+                else:
+                    self._size += size
+                if self._size > self.max_size:
+                    self._evict()
+        return size
+
+    def lock(self, app_id, parts):
+        """Returns a lock of the entry shared by processes of the node.
+
+        Entries share a fixed number of lock files, so that lock files do
+        not pile up as packages come and go.
+        """
+        if not self.single_flight:
+            return _no_lock()
+        key = '{0}/{1}'.format(app_id, '/'.join(parts)).encode('utf-8')
+        stripe = (zlib.crc32(key) & 0xffffffff) % LOCK_STRIPES
+        return lockutils.lock('murano-app-cache-{0}'.format(stripe),
+                              external=True, lock_path=self.lock_path,
+                              do_log=False)
+
+    def _scan(self):
+        entries = []
+        stale_tmp_mtime = time.time() - STALE_TMP_AGE
+        for dir_path, _dirs, file_names in os.walk(self.location):
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # removed by another process
+                if (file_name.endswith(TMP_SUFFIX) and
+                        stat.st_mtime > stale_tmp_mtime):
+                    continue  # being written at the moment
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        # NOTE: other processes write to the same directory, so the size is
+        # recalculated instead of trusting the estimation of this process
+        entries = sorted(self._scan())
+        size = sum(entry[1] for entry in entries)
+        limit = self.max_size * EVICTION_WATERMARK
+        evicted = 0
+        for _mtime, entry_size, path in entries:
+            if size <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+            evicted += 1
+        self._remove_empty_dirs()
+        self._size = size
+        LOG.debug('Evicted {0} entries from apps cache at {1}'.format(
+            evicted, self.location))
+
+    def _remove_empty_dirs(self):
+        for dir_path, _dirs, _files in os.walk(self.location, topdown=False):
+            if dir_path == self.location:
+                continue
+            try:
+                os.rmdir(dir_path)
+            except OSError:
+                pass  # not empty
+
+    def delete(self, app_id):
+        """Removes all entries of the application."""
+        shutil.rmtree(_get_entry_dir(app_id, self.location),
+                      ignore_errors=True)
+        with self._lock:
+            self._size = None
+
+    def gc(self, app_ids):
+        """Removes entries of applications missing from app_ids.
+
+        Returns the number of applications removed from the cache.
+        """
+        app_ids = set(app_ids)
+        removed = 0
+        for head in os.listdir(self.location):
+            head_path = os.path.join(self.location, head)
+            if not os.path.isdir(head_path):
+                continue
+            for tail in os.listdir(head_path):
+                if head + tail not in app_ids:
+                    shutil.rmtree(os.path.join(head_path, tail),
+                                  ignore_errors=True)
+                    removed += 1
+        self._remove_empty_dirs()
+        with self._lock:
+            self._size = None
+        return removed
+
+
+class DjangoCacheBackend(object):
+    """Keeps entries in a cache configured by the ``CACHES`` setting.
+
+    Entries are pickled the same way the filesystem backend does it, since
+    parsed YAQL expressions could not be pickled by the cache framework.
+    Entries of an application are dropped by bumping its generation, while
+    the eviction of stale entries is left to the cache itself.
+    """
+
+    def __init__(self, alias='default', timeout=None,
+                 key_prefix='murano-apps'):
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    @property
+    def _cache(self):
+        # NOTE: cache connections are thread-local in django
+        return django_cache.caches[self.alias]
+
+    def _make_key(self, app_id, parts):
+        generation = self._cache.get(self._make_generation_key(app_id), 0)
+        return '{0}:{1}:{2}:{3}'.format(self.key_prefix, app_id, generation,
+                                        '/'.join(parts))
+
+    def _make_generation_key(self, app_id):
+        return '{0}:{1}:generation'.format(self.key_prefix, app_id)
+
+    def get(self, app_id, parts):
+        return self.get_entry(app_id, parts)[0]
+
+    def get_entry(self, app_id, parts):
+        data = self._cache.get(self._make_key(app_id, parts))
+        if data is None:
+            return None, None
+        return _loads(data), len(data)
+
+    def set(self, app_id, parts, content):
+        data = _dumps(content)
+        self._cache.set(self._make_key(app_id, parts), data, self.timeout)
+        return len(data)
+
+    def delete(self, app_id):
+        key = self._make_generation_key(app_id)
+        try:
+            self._cache.incr(key)
+        except ValueError:
+            self._cache.set(key, 1, None)
+
+    def gc(self, app_ids):
+        return 0
+
+
+class _Tiers(object):
+    def __init__(self, config):
+        options = config or {}
+        backend_cls = module_loading.import_string(
+            options.get('BACKEND', DEFAULT_BACKEND))
+        self.config = config
+        self.backend = backend_cls(**options.get('OPTIONS', {}))
+        self.memory = memory_cache.LRUCache(
+            'apps', options.get('MEMORY_MAX_SIZE', DEFAULT_MEMORY_MAX_SIZE))
+        self.lock = threading.Lock()
+        self.backend_hits = 0
+        self.backend_misses = 0
+
+    def count_backend_access(self, hit):
+        with self.lock:
+            if hit:
+                self.backend_hits += 1
+            else:
+                self.backend_misses += 1
+
+
+def _get_tiers():
+    global _tiers
+    config = getattr(settings, 'MURANO_APP_CACHE', None)
+    with _tiers_lock:
+        if _tiers is None or _tiers.config is not config:
+            _tiers = _Tiers(config)
+        return _tiers
+
+
+def get_backend():
+    """Returns the backend configured by ``MURANO_APP_CACHE`` setting."""
+    return _get_tiers().backend
+
+
+def stats():
+    """Returns hit and miss counters of the memory and the backend tiers."""
+    tiers = _get_tiers()
+    with tiers.lock:
+        backend_stats = {'name': type(tiers.backend).__name__,
+                         'hits': tiers.backend_hits,
+                         'misses': tiers.backend_misses}
+    return {'memory': tiers.memory.stats(), 'backend': backend_stats}
+
+
+def invalidate(app_id):
+    """Drops all cached values of the application."""
+    tiers = _get_tiers()
+    tiers.backend.delete(app_id)
+    tiers.memory.invalidate(predicate=lambda key: key[0] == app_id)
+
+
+def validate(app_id, stamp):
+    """Drops cached values of the application obtained for another stamp.
+
+    The stamp identifies a revision of the package, e.g. the time it was
+    updated at. Values cached before the application got its first stamp are
+    dropped as well, since it is unknown which revision they belong to.
+    """
+    tiers = _get_tiers()
+    key = (app_id, STAMP_PARTS)
+    if tiers.memory.get(key) == stamp:
+        return
+    # values kept in memory of this process could be obtained for another
+    # stamp even if other processes have refreshed the backend already
+    tiers.memory.invalidate(predicate=lambda k: k[0] == app_id)
+    if tiers.backend.get(app_id, STAMP_PARTS) != stamp:
+        LOG.debug('Dropping cached values of app {0}, which was updated '
+                  'at {1}'.format(app_id, stamp))
+        tiers.backend.delete(app_id)
+        tiers.backend.set(app_id, STAMP_PARTS, stamp)
+    if tiers.memory.max_size:
+        tiers.memory.set(key, stamp, _estimate_size(stamp))
+
+
+def _estimate_size(content):
+    if isinstance(content, (six.binary_type, six.text_type)):
+        return len(content)
+    return len(_dumps(content))
+
+
+def _get_entry(backend, app_id, parts):
+    """Returns the entry of the backend and its serialized size.
+
+    Backends without ``get_entry`` method do not tell the size, so it is
+    left None.
+    """
+    get_entry = getattr(backend, 'get_entry', None)
+    if get_entry is None:
+        return backend.get(app_id, parts), None
+    return get_entry(app_id, parts)
 
 
 def with_cache(*dst_parts):
+    """Caches results of func(request, app_id) per application.
+
+    Deserialized values are kept in an in-process LRU tier in front of the
+    configured backend. The tier returns the very same object to every
+    caller without copying it, so values returned are shared between
+    requests and threads and must not be modified. Values are sized for the
+    tier by their serialized size reported by the backend.
+    """
     def _decorator(func):
         @functools.wraps(func)
         def __inner(request, app_id):
-            path = os.path.join(_get_entry_path(app_id), *dst_parts)
-            # Remove file extensions since file content is pickled and
-            # could not be open as usual files
-            path = os.path.splitext(path)[0] + '-pickled'
-            content = _load_from_file(path)
+            tiers = _get_tiers()
+            key = (app_id, dst_parts)
+            content = tiers.memory.get(key)
+            if content is not None:
+                LOG.debug('Using value of {0} for app {1} cached in '
+                          'memory.'.format('/'.join(dst_parts), app_id))
+                return content
+
+            content, size = _get_entry(tiers.backend, app_id, dst_parts)
+            tiers.count_backend_access(content is not None)
             if content is None:
-                content = func(request, app_id)
-                if content:
-                    LOG.debug('Caching value at {0}.'.format(path))
-                    _save_to_file(path, content)
+                outermost = not getattr(_held, 'lock', False)
+                lock = None
+                if outermost:
+                    lock = getattr(tiers.backend, 'lock', None)
+                with lock(app_id, dst_parts) if lock else _no_lock():
+                    _held.lock = True
+                    try:
+                        # the value could have been obtained by another
+                        # process while this one was waiting for the lock
+                        content, size = _get_entry(tiers.backend, app_id,
+                                                   dst_parts)
+                        if content is None:
+                            content = func(request, app_id)
+                            if content:
+                                LOG.debug('Caching value of {0} for app '
+                                          '{1}.'.format('/'.join(dst_parts),
+                                                        app_id))
+                                size = tiers.backend.set(app_id, dst_parts,
+                                                         content)
+                    finally:
+                        if outermost:
+                            _held.lock = False
             else:
-                LOG.debug('Using cached value from {0}.'.format(path))
+                LOG.debug('Using cached value of {0} for app {1}.'.format(
+                    '/'.join(dst_parts), app_id))
 
+            if content and tiers.memory.max_size:
+                if size is None:
+                    size = _estimate_size(content)
+                tiers.memory.set(key, content, size)
             return content
 
         return __inner
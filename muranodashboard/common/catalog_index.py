@@ -0,0 +1,214 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import re
+import threading
+import time
+
+from django.conf import settings
+from oslo_log import log as logging
+import six
+
+from muranodashboard import api
+
+
+LOG = logging.getLogger(__name__)
+
+# Filters applied to every package of the index, these are the packages the
+# catalog shows
+INDEX_FILTERS = {'type': 'Application', 'catalog': True}
+
+# Fields matched by the search in the order of their priority, the way
+# murano-api does it
+SEARCH_FIELDS = ('name', 'fully_qualified_name', 'description', 'categories',
+                 'tags', 'class_definitions', 'author')
+
+# Package attributes sorted by for the supported values of "order_by"
+ORDER_FIELDS = {'name': 'name', 'fqn': 'fully_qualified_name',
+                'created': 'created'}
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _get_ttl():
+    return getattr(settings, 'MURANO_CATALOG_INDEX_TTL', 30)
+
+
+def _get_full_refresh_interval():
+    return getattr(settings, 'MURANO_CATALOG_INDEX_FULL_REFRESH', 300)
+
+
+def _get_page_size():
+    return getattr(settings, 'PACKAGES_LIMIT', 100)
+
+
+def _list_packages(request, **filters):
+    filters.update(INDEX_FILTERS)
+    return api.muranoclient(request).packages.filter(limit=_get_page_size(),
+                                                     **filters)
+
+
+class _Index(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.packages = {}
+        self.created = None
+        self.synced_at = None
+        self.full_synced_at = None
+
+    def is_fresh(self, now):
+        return self.synced_at is not None and now - self.synced_at < _get_ttl()
+
+    def sync(self, request, now):
+        full = (self.full_synced_at is None or
+                now - self.full_synced_at >= _get_full_refresh_interval())
+        if full:
+            packages = list(_list_packages(request))
+            indexed = {}
+        else:
+            # murano-api can not list packages updated since some time, but
+            # new ones come first when ordered by creation time
+            packages = []
+            for package in _list_packages(request, order_by='created',
+                                          sort_dir='desc'):
+                if self.created and (package.created or '') < self.created:
+                    break
+                packages.append(package)
+            indexed = dict(self.packages)
+
+        for package in packages:
+            indexed[package.id] = package
+        LOG.debug('{kind} refresh of catalog index: {count} packages listed, '
+                  '{indexed} indexed'.format(
+                      kind='Full' if full else 'Incremental',
+                      count=len(packages), indexed=len(indexed)))
+        self.packages = indexed
+        self.created = max([package.created or '' for package in
+                            six.itervalues(indexed)] or [None])
+        self.synced_at = now
+        if full:
+            self.full_synced_at = now
+
+
+def _get_words(search):
+    # the same way murano-api splits the search string
+    return [word.lower() for word in re.split(';|,', search)]
+
+
+def _get_search_weight(package, words):
+    """Returns priority of the field matching the search, None if none does.
+
+    Unlike murano-api, which matches all the string columns of packages
+    with lower priority, only ``SEARCH_FIELDS`` are matched.
+    """
+    for weight, field in enumerate(SEARCH_FIELDS):
+        value = getattr(package, field, None) or ''
+        values = [value] if isinstance(value, six.string_types) else value
+        for value in values:
+            value = (value or '').lower()
+            if any(word in value for word in words):
+                return weight
+    return None
+
+
+def _query(packages, filters, marker, sort_dir):
+    category = filters.get('category')
+    if category:
+        packages = [package for package in packages
+                    if category in (getattr(package, 'categories', None) or
+                                    [])]
+
+    weights = {}
+    if filters.get('search'):
+        words = _get_words(filters['search'])
+        for package in packages:
+            weight = _get_search_weight(package, words)
+            if weight is not None:
+                weights[package.id] = weight
+        packages = [package for package in packages if package.id in weights]
+
+    # the marker is positioned among the packages even if it does not match
+    # the filters any more, so that the next page starts where it should
+    if marker is not None and marker not in packages:
+        packages.append(marker)
+
+    field = ORDER_FIELDS[filters.get('order_by', 'name')]
+
+    def get_sort_key(package):
+        # search matches are ordered by their priority first; the whole key
+        # is reversed for 'desc', so that the previous page is the reverse
+        # of the next one
+        return (weights.get(package.id, len(SEARCH_FIELDS)),
+                getattr(package, field, None) or '', package.id)
+
+    ordered = sorted(packages, key=get_sort_key, reverse=sort_dir == 'desc')
+    if marker is not None:
+        ordered = ordered[ordered.index(marker) + 1:]
+    return ordered
+
+
+def is_supported(filters):
+    """Checks whether a catalog listing could be answered by the index."""
+    supported = set(['search', 'category', 'order_by', 'sort_dir'])
+    supported.update(INDEX_FILTERS)
+    return (_get_ttl() > 0 and
+            all(filters.get(key) == value
+                for key, value in six.iteritems(INDEX_FILTERS)) and
+            set(filters).issubset(supported) and
+            filters.get('order_by', 'name') in ORDER_FIELDS)
+
+
+def package_list(request, filters, marker=None, page_size=20, sort_dir=None):
+    """Lists catalog packages the way ``api.packages.package_list`` does.
+
+    Packages of the current project and region are listed from murano-api
+    at most once in ``MURANO_CATALOG_INDEX_TTL`` seconds and then searched,
+    filtered, sorted and paginated locally. A refresh lists only the
+    packages created since the previous one, modified and deleted packages
+    are noticed by a full refresh made once in
+    ``MURANO_CATALOG_INDEX_FULL_REFRESH`` seconds, or once a package is
+    changed in the dashboard (see :func:`invalidate`). Returns a page of
+    packages and whether there are more of them.
+    """
+    now = time.time()
+    key = (request.user.tenant_id, request.user.services_region)
+    with _INDEXES_LOCK:
+        index = _INDEXES.setdefault(key, _Index())
+    with index.lock:
+        if not index.is_fresh(now):
+            index.sync(request, now)
+        packages = list(six.itervalues(index.packages))
+        marker = index.packages.get(marker) if marker else None
+
+    packages = _query(packages, filters, marker,
+                      sort_dir or filters.get('sort_dir', 'asc'))
+    return packages[:page_size], len(packages) > page_size
+
+
+def invalidate():
+    """Makes indexes of all projects fully refresh on the next access.
+
+    Packages could be public, so changing one affects every project.
+    """
+    with _INDEXES_LOCK:
+        indexes = list(six.itervalues(_INDEXES))
+    for index in indexes:
+        with index.lock:
+            index.synced_at = None
+            index.full_synced_at = None
+
+
+def clear():
+    """Drops indexes of all projects."""
+    with _INDEXES_LOCK:
+        _INDEXES.clear()
@@ -0,0 +1,88 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from multiprocessing import pool
+import sys
+import time
+
+from django.utils import translation
+import six
+
+
+class Result(object):
+    """Outcome of a single function called by :func:`run_concurrently`."""
+
+    def __init__(self, value=None, exc_info=None, elapsed=0.0):
+        self.value = value
+        self.exc_info = exc_info
+        self.elapsed = elapsed
+
+    @property
+    def failed(self):
+        return self.exc_info is not None
+
+    def get(self):
+        """Returns the value or re-raises the exception of the call."""
+        if self.exc_info is not None:
+            six.reraise(*self.exc_info)
+        return self.value
+
+
+def call(func, language=None):
+    """Calls func, capturing its outcome into a :class:`Result`."""
+    if language is None:
+        language = translation.get_language()
+    started = time.time()
+    try:
+        # NOTE: active language is thread-local in django, so it should be
+        # propagated to the worker explicitly
+        with translation.override(language):
+            value = func()
+    except Exception:
+        return Result(exc_info=sys.exc_info(),
+                      elapsed=time.time() - started)
+    return Result(value=value, elapsed=time.time() - started)
+
+
+def run_concurrently(functions, max_workers):
+    """Calls functions in a bounded pool of threads.
+
+    Returns a list of :class:`Result` objects in the order of the given
+    functions. Exceptions are not raised but kept in results, so the caller
+    is free to handle them in the same order a sequential loop would do.
+    If ``max_workers`` is less than 2 the functions are called one by one in
+    the current thread.
+    """
+    return list(iter_concurrently(functions, max_workers))
+
+
+def iter_concurrently(functions, max_workers):
+    """Same as :func:`run_concurrently`, but yields results one by one.
+
+    Results are yielded in the order of the given functions as soon as they
+    are available, so that the caller could report progress meanwhile.
+    """
+    functions = list(functions)
+    language = translation.get_language()
+    if max_workers < 2 or len(functions) < 2:
+        for func in functions:
+            yield call(func, language)
+        return
+
+    workers = pool.ThreadPool(min(max_workers, len(functions)))
+    try:
+        for result in workers.imap(lambda func: call(func, language),
+                                   functions):
+            yield result
+    finally:
+        workers.close()
+        workers.join()
@@ -0,0 +1,211 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import threading
+import time
+
+from django.conf import settings
+from openstack_dashboard.api import glance
+from oslo_log import log as logging
+import six
+
+from muranodashboard.common import memory_cache
+
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of images glance returns per page; the glance default of 20
+# makes listing of large clouds needlessly chatty
+PAGE_SIZE = 1000
+
+# Maximum number of indexes kept, the least recently used ones are dropped
+MAX_INDEXES = 256
+
+# Every index counts as 1 towards the size of the cache
+_INDEXES = memory_cache.LRUCache('image_indexes', max_size=MAX_INDEXES)
+_INDEXES_LOCK = threading.Lock()
+# Incremented by invalidate(), indexes synced before that are not fresh
+_generation = 0
+
+
+def _get_ttl():
+    return getattr(settings, 'MURANO_IMAGE_INDEX_TTL', 30)
+
+
+def _get_full_refresh_interval():
+    return getattr(settings, 'MURANO_IMAGE_INDEX_FULL_REFRESH', 300)
+
+
+class MuranoImage(object):
+    """Glance image marked with murano metadata.
+
+    Attributes of the glance image are available as attributes of the
+    object. ``murano_property`` holds the parsed ``murano_image_info``
+    property, or None if it is not a valid JSON.
+    """
+
+    def __init__(self, image, murano_property):
+        self._image = image
+        self.murano_property = murano_property
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._image, name)
+
+    @property
+    def title(self):
+        return (self.murano_property or {}).get('title', 'No Title')
+
+    @property
+    def type(self):
+        return (self.murano_property or {}).get('type', 'No Type')
+
+
+def _parse(image):
+    # Additional properties, whose value is always a string data type, are
+    # only included in the response if they have a value.
+    murano_info = getattr(image, 'murano_image_info', None)
+    if not murano_info or getattr(image, 'image_type', None) == 'snapshot':
+        return None
+    try:
+        murano_property = json.loads(murano_info)
+    except ValueError:
+        LOG.warning('Invalid murano metadata for image: {0}'.format(
+            image.id))
+        murano_property = None
+    return MuranoImage(image, murano_property)
+
+
+class _Index(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.images = {}
+        self.images_list = []
+        self.updated_at = None
+        self.synced_at = None
+        self.full_synced_at = None
+        self.generation = None
+
+    def is_fresh(self, now):
+        return (self.synced_at is not None and
+                self.generation == _generation and
+                now - self.synced_at < _get_ttl())
+
+    def sync(self, request, now):
+        generation = _generation
+        full = (self.full_synced_at is None or
+                now - self.full_synced_at >= _get_full_refresh_interval())
+        images = None
+        if not full and self.updated_at:
+            try:
+                images = _list_images(
+                    request, {'updated_at': 'gte:' + self.updated_at})
+            except Exception:
+                LOG.warning('Unable to list images updated since {0}, '
+                            'falling back to listing all images'.format(
+                                self.updated_at))
+                full = True
+        if images is None:
+            full = True
+            images = _list_images(request, {})
+
+        indexed = {} if full else dict(self.images)
+        updated_at = None if full else self.updated_at
+        for image in images:
+            image_updated_at = getattr(image, 'updated_at', None)
+            if image_updated_at and (updated_at is None or
+                                     image_updated_at > updated_at):
+                updated_at = image_updated_at
+            murano_image = _parse(image)
+            if murano_image is None:
+                indexed.pop(image.id, None)
+            else:
+                indexed[image.id] = murano_image
+
+        LOG.debug('{kind} refresh of murano image index: {count} images '
+                  'listed, {indexed} indexed'.format(
+                      kind='Full' if full else 'Incremental',
+                      count=len(images), indexed=len(indexed)))
+        self.images = indexed
+        # same order glance lists images in by default
+        self.images_list = sorted(
+            six.itervalues(indexed),
+            key=lambda image: (getattr(image, 'created_at', None) or '',
+                               image.id),
+            reverse=True)
+        self.updated_at = updated_at
+        self.synced_at = now
+        self.generation = generation
+        if full:
+            self.full_synced_at = now
+
+
+def _list_images(request, filters):
+    client = glance.glanceclient(request, '2')
+    return list(client.images.list(filters=filters, page_size=PAGE_SIZE))
+
+
+def _make_key(request):
+    # glance lists private images of all the projects to admins, so they
+    # do not share indexes with the other members of the project
+    return (request.user.tenant_id, request.user.services_region,
+            bool(request.user.is_superuser))
+
+
+def get_images(request):
+    """Returns murano images of the current project and region.
+
+    Images are ordered the way glance lists them by default (newest first).
+    The index is refreshed incrementally, listing only images updated since
+    the last refresh, at most once in ``MURANO_IMAGE_INDEX_TTL`` seconds.
+    Deleted images are noticed by a full refresh made once in
+    ``MURANO_IMAGE_INDEX_FULL_REFRESH`` seconds. The region is taken from
+    the request, therefore the call should be made inside the
+    ``helpers.current_region`` context if needed. Indexes of at most
+    ``MAX_INDEXES`` projects and regions are kept.
+    """
+    now = time.time()
+    if _get_ttl() <= 0:
+        index = _Index()
+        index.sync(request, now)
+        return list(index.images_list)
+
+    key = _make_key(request)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _Index()
+            _INDEXES.set(key, index, 1)
+    with index.lock:
+        if not index.is_fresh(now):
+            index.sync(request, now)
+        return list(index.images_list)
+
+
+def invalidate():
+    """Makes indexes of all projects refresh on the next access.
+
+    Marking an image affects every project the image is visible to, so all
+    the indexes are expired. The refresh stays incremental.
+    """
+    global _generation
+
+    with _INDEXES_LOCK:
+        _generation += 1
+
+
+def clear():
+    """Drops indexes of all projects."""
+    with _INDEXES_LOCK:
+        _INDEXES.invalidate()
@@ -0,0 +1,72 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+
+from oslo_log import log as logging
+
+# Pillow is optional, logos are served at their original size without it
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+LOG = logging.getLogger(__name__)
+
+# Sizes (in pixels) of the square logos are scaled to fit into: topology
+# nodes and catalog tiles, for regular and high density displays
+SIZES = (60, 70, 120, 140)
+
+
+def get_size(size):
+    """Returns the smallest size of scaled logos fitting the given one.
+
+    None stands for the original logo, which is used when the size is not
+    given or is bigger than any of the scaled ones.
+    """
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        return None
+    for scaled_size in SIZES:
+        if scaled_size >= size:
+            return scaled_size
+    return None
+
+
+def can_scale():
+    return Image is not None
+
+
+def scale(content, size):
+    """Scales a logo down to fit into a square of the given size.
+
+    Returns PNG data of the scaled logo, or the original content if it is
+    small enough already or could not be decoded.
+    """
+    if not content or Image is None:
+        return content
+    try:
+        image = Image.open(io.BytesIO(content))
+        if max(image.size) <= size:
+            return content
+        if image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            image = image.convert('RGBA')
+        image.thumbnail((size, size), Image.LANCZOS)
+        scaled = io.BytesIO()
+        image.save(scaled, format='PNG', optimize=True)
+    except Exception as e:
+        LOG.warning('Can not scale logo, using the original one: '
+                    '{0}'.format(e))
+        return content
+    scaled = scaled.getvalue()
+    return scaled if len(scaled) < len(content) else content
@@ -0,0 +1,237 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import threading
+import time
+
+from oslo_log import log as logging
+
+
+LOG = logging.getLogger(__name__)
+
+
+class _Entry(object):
+    __slots__ = ('value', 'expires_at', 'stale_until', 'cost')
+
+    def __init__(self, value, expires_at, cost, stale_until=None):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = max(expires_at, stale_until or expires_at)
+        self.cost = cost
+
+
+class TTLCache(object):
+    """Thread-safe in-process cache whose entries expire after a TTL.
+
+    Unlike the apps cache in :mod:`muranodashboard.common.cache` it is meant
+    for mutable data, which is fine to be slightly out of date. Every entry
+    remembers how long it took to obtain its value, so the cache is able to
+    report the time saved by serving hits.
+
+    Expired entries could also be served for a while longer, being
+    refreshed in the background (see :meth:`get_or_create`).
+    """
+
+    def __init__(self, name, max_entries=1024):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.time_saved = 0.0
+        # keys being refreshed in the background, and the number of
+        # invalidations made, so that a refresh started before one of them
+        # does not store the outdated value
+        self._refreshing = set()
+        self._generation = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.time():
+                return default
+            return entry.value
+
+    def set(self, key, value, ttl, cost=0.0, stale_ttl=0):
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._set(key, value, ttl, cost, stale_ttl)
+
+    def _set(self, key, value, ttl, cost, stale_ttl):
+        now = time.time()
+        self._entries.pop(key, None)
+        self._entries[key] = _Entry(value, now + ttl, cost,
+                                    now + ttl + stale_ttl)
+        self._evict()
+
+    def get_or_create(self, key, creator, ttl, stale_ttl=0):
+        """Returns cached value for the key, calls creator on a miss.
+
+        Non-positive ttl disables caching, so the creator is called every
+        time. Exceptions raised by the creator are never cached.
+
+        An entry expired less than ``stale_ttl`` seconds ago is returned
+        as is, while the creator is called in a background thread to
+        refresh it. Only one refresh of a key runs at a time, and the stale
+        value is kept if the refresh fails.
+        """
+        if ttl <= 0:
+            return creator()
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self.hits += 1
+                self.time_saved += entry.cost
+                LOG.debug('Cache {name}: hit for {key}, saved {cost:.3f}s '
+                          '({total:.3f}s in total).'.format(
+                              name=self.name, key=key, cost=entry.cost,
+                              total=self.time_saved))
+                return entry.value
+            if entry is not None and entry.stale_until > now:
+                self.stale_hits += 1
+                self.time_saved += entry.cost
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    thread = threading.Thread(
+                        target=self._refresh,
+                        args=(key, creator, ttl, stale_ttl, self._generation))
+                    thread.daemon = True
+                    thread.start()
+                return entry.value
+            self.misses += 1
+
+        started = time.time()
+        value = creator()
+        self.set(key, value, ttl, cost=time.time() - started,
+                 stale_ttl=stale_ttl)
+        return value
+
+    def _refresh(self, key, creator, ttl, stale_ttl, generation):
+        started = time.time()
+        try:
+            value = creator()
+        except Exception:
+            LOG.exception('Cache {name}: unable to refresh {key}, keeping '
+                          'the stale value.'.format(name=self.name, key=key))
+            with self._lock:
+                self._refreshing.discard(key)
+            return
+        with self._lock:
+            self._refreshing.discard(key)
+            if generation == self._generation:
+                self._set(key, value, ttl, time.time() - started, stale_ttl)
+
+    def invalidate(self, key=None, predicate=None):
+        """Drops one key, keys matching the predicate or everything."""
+        with self._lock:
+            self._generation += 1
+            if key is not None:
+                self._entries.pop(key, None)
+            elif predicate is not None:
+                for k in [k for k in self._entries if predicate(k)]:
+                    del self._entries[k]
+            else:
+                self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'name': self.name,
+                    'entries': len(self._entries),
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'stale_hits': self.stale_hits,
+                    'time_saved': self.time_saved}
+
+    def _evict(self):
+        if len(self._entries) <= self.max_entries:
+            return
+        now = time.time()
+        for k in [k for k, e in self._entries.items()
+                  if e.stale_until <= now]:
+            del self._entries[k]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class LRUCache(object):
+    """Thread-safe in-process cache bounded by the total size of values.
+
+    Sizes of values are given by the caller. Once the total size exceeds
+    ``max_size``, the least recently used entries are evicted. Values bigger
+    than ``max_size`` are not cached at all, and ``max_size`` of 0 disables
+    the cache. Values are shared between callers, so they should be treated
+    as read-only.
+    """
+
+    def __init__(self, name, max_size=0):
+        self.name = name
+        self.max_size = max_size
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return default
+            # re-insertion marks the entry as the most recently used one
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, size):
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self.size -= old_entry[1]
+            if size > self.max_size:
+                return
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_size:
+                _key, (_value, evicted_size) = self._entries.popitem(
+                    last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, key=None, predicate=None):
+        """Drops one key, keys matching the predicate or everything."""
+        with self._lock:
+            if key is not None:
+                keys = [key] if key in self._entries else []
+            elif predicate is not None:
+                keys = [k for k in self._entries if predicate(k)]
+            else:
+                keys = list(self._entries)
+            for k in keys:
+                self.size -= self._entries.pop(k)[1]
+
+    def stats(self):
+        with self._lock:
+            return {'name': self.name,
+                    'entries': len(self._entries),
+                    'size': self.size,
+                    'max_size': self.max_size,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions}
@@ -24,6 +24,7 @@ from openstack_dashboard.api import keystone
 from openstack_dashboard.api import neutron
 from oslo_log import log as logging
 
+from muranodashboard.common import resources
 from muranodashboard.environments import api as env_api
 
 LOG = logging.getLogger(__name__)
@@ -68,8 +69,7 @@ def get_available_networks(request, filter=None, murano_networks=None):
     network_choices = []
     tenant_id = request.user.tenant_id
     try:
-        networks = neutron.network_list_for_tenant(request,
-                                                   tenant_id=tenant_id)
+        networks = resources.network_list_for_tenant(request, tenant_id)
     except exceptions.ServiceCatalogException:
         LOG.warning("Neutron not found. Assuming Nova Network usage")
         return []
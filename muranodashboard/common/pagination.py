@@ -0,0 +1,49 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Marker based pagination shared by the catalog and the tables.
+
+A page is listed starting after the marker in the direction the user goes,
+with one extra item telling whether there is anything further. There is
+something on the other side whenever the page was reached with a marker
+(the marker itself is there), so neither side needs another request.
+"""
+
+import itertools
+
+
+def get_boundaries(extra, marker, backward=False):
+    """Returns whether there are previous and next pages.
+
+    ``extra`` tells whether the listing found an item beyond the page in
+    the direction of pagination, ``backward`` is True when the page is
+    listed from the marker towards the beginning.
+    """
+    if backward:
+        return extra, marker is not None
+    return marker is not None, extra
+
+
+def paginate(items, page_size, marker=None, backward=False):
+    """Cuts a page out of the items following the marker.
+
+    Items are iterated no further than one item beyond the page. Returns
+    the page in the forward order, and whether there are previous and next
+    pages.
+    """
+    items = list(itertools.islice(items, page_size + 1))
+    extra = len(items) > page_size
+    page = items[:page_size]
+    if backward:
+        page.reverse()
+    has_prev, has_next = get_boundaries(extra, marker, backward)
+    return page, has_prev, has_next
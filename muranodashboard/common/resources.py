@@ -0,0 +1,200 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+
+from django.conf import settings
+try:
+    from openstack_dashboard.api import _nova as nova
+except ImportError:
+    from openstack_dashboard.api import nova
+from openstack_dashboard.api import cinder
+from openstack_dashboard.api import keystone
+from openstack_dashboard.api import neutron
+from openstack_dashboard import exceptions as dashboard_exceptions
+from openstack_dashboard.usage import quotas
+from oslo_log import log as logging
+
+from muranodashboard.common import concurrency
+from muranodashboard.common import memory_cache
+
+
+LOG = logging.getLogger(__name__)
+
+FLAVORS = 'flavors'
+KEYPAIRS = 'keypairs'
+AVAILABILITY_ZONES = 'availability_zones'
+SECURITY_GROUPS = 'security_groups'
+NETWORKS = 'networks'
+VOLUMES = 'volumes'
+VOLUME_SNAPSHOTS = 'volume_snapshots'
+QUOTA_USAGES = 'quota_usages'
+
+RESOURCES_CACHE = memory_cache.TTLCache('resources')
+# Names of projects are the same in all the projects and regions
+PROJECT_NAMES_CACHE = memory_cache.TTLCache('project_names')
+# Projects looked up at once by project_names
+PROJECT_LOOKUP_WORKERS = 8
+
+_UNKNOWN = object()
+
+
+def _get_ttl():
+    return getattr(settings, 'MURANO_RESOURCES_CACHE_TTL', 30)
+
+
+def _get_quota_usages_ttl():
+    return getattr(settings, 'MURANO_QUOTA_USAGES_CACHE_TTL', 10)
+
+
+def _get_project_names_ttl():
+    return getattr(settings, 'MURANO_PROJECT_NAMES_CACHE_TTL', 300)
+
+
+def _make_key(request, kind, *args):
+    return (request.user.tenant_id, request.user.services_region,
+            kind) + args
+
+
+def _cached(request, kind, getter, *args):
+    """Lists OpenStack resources of the kind, using the shared cache.
+
+    Resources are cached per project and region (resources owned by users,
+    like keypairs, pass the user id in ``args``), so all the dynamic UI
+    fields and the wizard itself share the same listing during a step
+    render. The region is taken from the request, therefore the call should
+    be made inside the ``helpers.current_region`` context if needed.
+    """
+    key = _make_key(request, kind, *args)
+    return RESOURCES_CACHE.get_or_create(
+        key, lambda: list(getter()), _get_ttl())
+
+
+def invalidate(request, kind=None, region=None):
+    """Drops cached resources of the current project.
+
+    If the kind or region are omitted, resources of all kinds or of all
+    regions are dropped respectively.
+    """
+    tenant_id = request.user.tenant_id
+
+    def _match(key):
+        return (key[0] == tenant_id and
+                (region is None or key[1] == region) and
+                (kind is None or key[2] == kind))
+
+    LOG.debug('Invalidating cached {kind} of the project {tenant}'.format(
+        kind=kind or 'resources', tenant=tenant_id))
+    RESOURCES_CACHE.invalidate(predicate=_match)
+
+
+def flavor_list(request):
+    return _cached(request, FLAVORS,
+                   lambda: nova.novaclient(request).flavors.list())
+
+
+def keypair_list(request):
+    # keypairs belong to the user rather than to the project
+    return _cached(request, KEYPAIRS,
+                   lambda: nova.novaclient(request).keypairs.list(),
+                   request.user.id)
+
+
+def availability_zone_list(request):
+    return _cached(
+        request, AVAILABILITY_ZONES,
+        lambda: nova.novaclient(request).availability_zones.list(
+            detailed=False))
+
+
+def security_group_list(request):
+    return _cached(request, SECURITY_GROUPS,
+                   lambda: neutron.security_group_list(request))
+
+
+def network_list_for_tenant(request, tenant_id):
+    return _cached(
+        request, NETWORKS,
+        lambda: neutron.network_list_for_tenant(request, tenant_id=tenant_id))
+
+
+def volume_list(request, status=cinder.VOLUME_STATE_AVAILABLE):
+    return _cached(
+        request, VOLUMES,
+        lambda: cinder.volume_list(request, search_opts={'status': status}),
+        status)
+
+
+def volume_snapshot_list(request, status=cinder.VOLUME_STATE_AVAILABLE):
+    return _cached(
+        request, VOLUME_SNAPSHOTS,
+        lambda: cinder.volume_snapshot_list(request,
+                                            search_opts={'status': status}),
+        status)
+
+
+def quota_usages(request):
+    """Returns a snapshot of quota usages of the project in the region.
+
+    ``quotas.tenant_quota_usages`` queries nova, neutron and cinder, so its
+    result is shared for ``MURANO_QUOTA_USAGES_CACHE_TTL`` seconds. The
+    snapshot is a dict mapping resource names to dicts with ``quota``,
+    ``used`` and ``available`` keys and must not be modified.
+    """
+    def get_usages():
+        return dict(quotas.tenant_quota_usages(request).usages)
+
+    return RESOURCES_CACHE.get_or_create(
+        _make_key(request, QUOTA_USAGES), get_usages,
+        _get_quota_usages_ttl())
+
+
+def _get_project_name(request, project_id):
+    try:
+        return keystone.tenant_get(request, project_id, admin=True).name
+    except dashboard_exceptions.NOT_FOUND:
+        # projects of packages could be deleted, it is remembered as well
+        return None
+
+
+def project_names(request, project_ids):
+    """Maps ids of the projects to their names, None for missing ones.
+
+    Only the given projects are looked up instead of listing all of them,
+    several at once, and their names are cached for
+    ``MURANO_PROJECT_NAMES_CACHE_TTL`` seconds. Projects which could not be
+    looked up are logged and left out, so that the caller could show the
+    rest of the names.
+    """
+    project_ids = sorted(set(project_id for project_id in project_ids
+                             if project_id))
+    names = {}
+    missing = []
+    for project_id in project_ids:
+        name = PROJECT_NAMES_CACHE.get(project_id, _UNKNOWN)
+        if name is _UNKNOWN:
+            missing.append(project_id)
+        else:
+            names[project_id] = name
+
+    results = concurrency.run_concurrently(
+        [functools.partial(_get_project_name, request, project_id)
+         for project_id in missing], PROJECT_LOOKUP_WORKERS)
+    for project_id, result in zip(missing, results):
+        if result.failed:
+            LOG.warning('Unable to get project {0}: {1}'.format(
+                project_id, result.exc_info[1]))
+            continue
+        names[project_id] = result.value
+        PROJECT_NAMES_CACHE.set(project_id, result.value,
+                                _get_project_names_ttl())
+    return names
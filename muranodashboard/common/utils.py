@@ -17,6 +17,8 @@ try:
 except ImportError:
     import pickle
 import bs4
+import errno
+import os
 import string
 
 import iso8601
@@ -57,6 +59,20 @@ def adjust_datestr(request, datestr):
     return dt.strftime('%Y-%m-%d %H:%M:%S')
 
 
+def ensure_dir(path):
+    """Creates the directory, unless another process has done it already.
+
+    Returns True if the directory was created by this call.
+    """
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        if e.errno != errno.EEXIST or not os.path.isdir(path):
+            raise
+        return False
+    return True
+
+
 class Bunch(object):
     """Bunch dict/object-like container.
 
@@ -0,0 +1,165 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compiler of Dynamic UI definitions.
+
+A UI definition loaded from ``ui.yaml`` is interpreted on every request the
+application wizard makes. The compiler does the request-independent part of
+that work once: it checks the format version, decamelizes the keys, turns
+``hidden`` and ``regexpValidator`` shortcuts into widgets and validators and
+normalizes field types. The result is picklable, so it is kept in the app
+cache next to the UI definition itself.
+"""
+
+from django import forms
+import six
+
+from muranodashboard.dynamic_ui import helpers
+from muranodashboard.dynamic_ui import version
+from muranodashboard.dynamic_ui import yaql_expression
+
+# Bump whenever the layout of compiled objects changes, so that artifacts
+# compiled by a previous release are not picked from the app cache
+FORMAT = 1
+
+
+class Expression(object):
+    """YAQL expression found at ``key`` of a field definition."""
+
+    def __init__(self, key, expression):
+        self.key = key
+        self.expression = expression
+
+
+class CompiledField(object):
+    def __init__(self, name, type, kwargs):
+        self.name = name
+        self.type = type
+        self.kwargs = kwargs
+
+    def bind(self, make_property):
+        """Returns a fresh copy of field keyword arguments.
+
+        Each YAQL expression is replaced with ``make_property(key, expr)``,
+        the compiled field itself is never modified.
+        """
+        return _bind(self.kwargs, make_property)
+
+
+class CompiledForm(object):
+    def __init__(self, name, fields, validators, region):
+        self.name = name
+        self.fields = fields
+        self.validators = validators
+        self.region = region
+
+
+class CompiledUI(object):
+    def __init__(self, version, forms, sections):
+        self.version = version
+        self.forms = forms
+        self.sections = sections
+
+    def get_sections(self):
+        """Returns a copy of sections other than forms, keyed by name."""
+        return _bind(self.sections)
+
+
+def _bind(value, make_property=None):
+    if isinstance(value, Expression):
+        if make_property is None:
+            return value.expression
+        return make_property(value.key, value.expression)
+    elif isinstance(value, dict):
+        return dict((k, _bind(v, make_property))
+                    for (k, v) in six.iteritems(value))
+    elif isinstance(value, list):
+        return [_bind(v, make_property) for v in value]
+    return value
+
+
+def _parse_spec(spec, keys):
+    key = keys and keys[-1] or None
+
+    if isinstance(spec, yaql_expression.YaqlExpression):
+        return key, Expression(key, spec)
+    elif isinstance(spec, dict):
+        items = []
+        for k, v in six.iteritems(spec):
+            k = helpers.decamelize(k)
+            new_key, v = _parse_spec(v, keys + [k])
+            if new_key:
+                k = new_key
+            items.append((k, v))
+        return key, dict(items)
+    elif isinstance(spec, list):
+        return key, [_parse_spec(_spec, keys)[1] for _spec in spec]
+    elif isinstance(spec,
+                    six.string_types) and helpers.is_localizable(keys):
+        return key, spec
+    else:
+        if key == 'hidden':
+            if spec:
+                return 'widget', forms.HiddenInput
+            else:
+                return 'widget', None
+        elif key == 'regexp_validator':
+            return 'validators', [helpers.prepare_regexp(spec)]
+        else:
+            return key, spec
+
+
+def compile_field(field_spec, form_name=None):
+    field_spec = dict(field_spec)
+    for attr in ('type', 'name'):
+        if attr not in field_spec:
+            raise ValueError('Field {0} of form {1} has no {2}'.format(
+                field_spec.get('name', ''), form_name, attr))
+    _type, name = field_spec.pop('type'), field_spec.pop('name')
+    if isinstance(_type, list):  # make list keys hashable for TYPES dict
+        _type = tuple(_type)
+    _ignorable, kwargs = _parse_spec(field_spec, [])
+    return CompiledField(name, _type, kwargs)
+
+
+def compile_form(form):
+    if not isinstance(form, dict) or len(form) != 1:
+        raise ValueError('Form should be a mapping with a single key, '
+                         'the form name')
+    for form_name, form_data in six.iteritems(form):
+        # NOTE(kzaitsev) should be str (not unicode) under python2
+        # however it also works as str under python3
+        form_name = helpers.to_str(form_name)
+        field_specs = form_data.get('fields')
+        if not isinstance(field_specs, list):
+            raise ValueError('Form {0} should have a list of fields'.format(
+                form_name))
+        return CompiledForm(
+            form_name,
+            tuple(compile_field(spec, form_name) for spec in field_specs),
+            form_data.get('validators', []), form_data.get('region'))
+
+
+def compile_ui(ui_desc):
+    """Compiles a UI definition loaded from ``ui.yaml``.
+
+    The given definition is not modified. Raises ValueError if the
+    definition is malformed or its format version is not supported.
+    """
+    ui_desc = dict(ui_desc)
+    ui_version = ui_desc.pop('Version', version.LATEST_FORMAT_VERSION)
+    version.check_version(ui_version)
+    sections = dict(
+        (helpers.decamelize(k), v) for (k, v) in six.iteritems(ui_desc))
+    ui_forms = tuple(compile_form(form)
+                     for form in sections.pop('forms', None) or [])
+    return CompiledUI(ui_version, ui_forms, sections)
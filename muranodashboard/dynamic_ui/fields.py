@@ -14,9 +14,12 @@
 
 import ast
 import copy
+import functools
 import json
 import re
+import threading
 
+from django.conf import settings
 from django.core import validators as django_validator
 from django import forms
 from django.forms import widgets
@@ -28,26 +31,33 @@ from django.utils.translation import ugettext_lazy as _
 from horizon import exceptions
 from horizon import forms as hz_forms
 from horizon import messages
-try:
-    from openstack_dashboard.api import _nova as nova
-except ImportError:
-    from openstack_dashboard.api import nova
-from openstack_dashboard.api import cinder
-from openstack_dashboard.api import glance
-from openstack_dashboard.api import neutron
 from oslo_log import log as logging
 from oslo_log import versionutils
 import six
 from yaql import legacy
 
 from muranodashboard.api import packages as pkg_api
+from muranodashboard.common import concurrency
+from muranodashboard.common import image_index
 from muranodashboard.common import net
+from muranodashboard.common import resources
 from muranodashboard.dynamic_ui import helpers
 from muranodashboard.environments import api as env_api
 
 
 LOG = logging.getLogger(__name__)
 
+# Packages looked up at once by AppReferenceResolver, if fields are updated
+# concurrently (MURANO_CONCURRENT_FIELD_UPDATES)
+APP_LOOKUP_WORKERS = 4
+
+
+def _get_app_lookup_workers():
+    # deployments which update fields one by one get no threads either
+    if getattr(settings, 'MURANO_CONCURRENT_FIELD_UPDATES', 0):
+        return APP_LOOKUP_WORKERS
+    return 1
+
 
 def with_request(func):
     """Injects request into func
@@ -113,32 +123,19 @@ def wrap_regex_validator(validator, message):
 def get_murano_images(request, region=None):
     images = []
     try:
-        # https://bugs.launchpad.net/murano/+bug/1339261 - glance
-        # client version change alters the API. Other tuple values
-        # are _more and _prev (in recent glance client)
         with helpers.current_region(request, region):
-            images = glance.image_list_detailed(request)[0]
+            images = image_index.get_images(request)
     except Exception:
         LOG.error("Error to request image list from glance ")
         exceptions.handle(request, _("Unable to retrieve public images."))
     murano_images = []
-    # filter out the snapshot image type
-    images = filter(
-        lambda x: x.properties.get("image_type", '') != 'snapshot', images)
     for image in images:
-        # Additional properties, whose value is always a string data type, are
-        # only included in the response if they have a value.
-        murano_property = getattr(image, 'murano_image_info', None)
-        if murano_property:
-            try:
-                murano_metadata = json.loads(murano_property)
-            except ValueError:
-                LOG.warning("JSON in image metadata is not valid. "
-                            "Check it in glance.")
-                messages.error(request, _("Invalid murano image metadata"))
-            else:
-                image.murano_property = murano_metadata
-                murano_images.append(image)
+        if image.murano_property is None:
+            LOG.warning("JSON in image metadata is not valid. "
+                        "Check it in glance.")
+            messages.error(request, _("Invalid murano image metadata"))
+        else:
+            murano_images.append(image)
     return murano_images
 
 
@@ -380,7 +377,7 @@ class FlavorChoiceField(ChoiceField):
         choices = []
         with helpers.current_region(request,
                                     getattr(form, 'region', None)):
-            flavors = nova.novaclient(request).flavors.list()
+            flavors = resources.flavor_list(request)
 
         # If no requirements are present, return all the flavors.
         if not hasattr(self, 'requirements'):
@@ -433,12 +430,30 @@ class KeyPairChoiceField(DynamicChoiceField):
     """This widget allows to select keypair for VMs"""
     @with_request
     def update(self, request, form=None, **kwargs):
-        self.choices = [('', _('No keypair'))]
-        with helpers.current_region(request,
-                                    getattr(form, 'region', None)):
-            keypairs = nova.novaclient(request).keypairs.list()
+        self._request = request
+        self._region = getattr(form, 'region', None)
+        self._set_choices()
+
+    def _set_choices(self):
+        choices = [('', _('No keypair'))]
+        with helpers.current_region(self._request, self._region):
+            keypairs = resources.keypair_list(self._request)
         for keypair in sorted(keypairs, key=lambda e: e.name):
-            self.choices.append((keypair.name, keypair.name))
+            choices.append((keypair.name, keypair.name))
+        self.choices = choices
+
+    def valid_value(self, value):
+        if super(KeyPairChoiceField, self).valid_value(value):
+            return True
+        # NOTE: keypair could have been imported with the '+' button after
+        # the cached list was obtained, so give it another try with a fresh
+        # list of keypairs
+        if not value or getattr(self, '_request', None) is None:
+            return False
+        resources.invalidate(self._request, resources.KEYPAIRS,
+                             self._region)
+        self._set_choices()
+        return super(KeyPairChoiceField, self).valid_value(value)
 
 
 class SecurityGroupChoiceField(DynamicChoiceField):
@@ -449,7 +464,7 @@ class SecurityGroupChoiceField(DynamicChoiceField):
         # TODO(pbourke): remove sorted when supported natively in Horizon
         # (https://bugs.launchpad.net/horizon/+bug/1692972)
         for secgroup in sorted(
-                neutron.security_group_list(request),
+                resources.security_group_list(request),
                 key=lambda e: e.name_or_id):
             if not secgroup.name_or_id.startswith('murano--'):
                 self.choices.append((secgroup.name_or_id, secgroup.name_or_id))
@@ -556,8 +571,8 @@ class AZoneChoiceField(ChoiceField):
         try:
             with helpers.current_region(request,
                                         getattr(form, 'region', None)):
-                availability_zones = nova.novaclient(
-                    request).availability_zones.list(detailed=False)
+                availability_zones = resources.availability_zone_list(
+                    request)
         except Exception:
             availability_zones = []
             exceptions.handle(request,
@@ -585,23 +600,21 @@ class VolumeChoiceField(ChoiceField):
     @with_request
     def update(self, request, **kwargs):
         """This widget allows selection of Volumes and Volume Snapshots"""
-        available = {'status': cinder.VOLUME_STATE_AVAILABLE}
         choices = []
 
         if self.include_volumes:
             try:
                 choices.extend((volume.id, volume.name)
-                               for volume in cinder.volume_list(request,
-                               search_opts=available))
+                               for volume in resources.volume_list(request))
             except Exception:
                 exceptions.handle(request,
                                   _("Unable to retrieve volume list."))
 
         if self.include_snapshots:
             try:
-                choices.extend((snap.id, snap.name)
-                               for snap in cinder.volume_snapshot_list(request,
-                               search_opts=available))
+                choices.extend(
+                    (snap.id, snap.name)
+                    for snap in resources.volume_snapshot_list(request))
             except Exception:
                 exceptions.handle(request,
                                   _("Unable to retrieve snapshot list."))
@@ -687,12 +700,103 @@ class MuranoTypeWidget(hz_forms.fields.DynamicSelectWidget):
         js = ('muranodashboard/js/add-select.js',)
 
 
+class AppReferenceResolver(object):
+    """Resolves applications referenced by fields of a single form render.
+
+    Packages matching every distinct FQN referenced by the form are looked up
+    once, all at the time the first field asks for them, and services of an
+    environment are listed once for all the fields. The resolver is safe to
+    be shared by fields updated concurrently: the lock is held only to check
+    and store the results, and a field asking for a lookup made by another
+    one waits for it to finish.
+    """
+
+    def __init__(self, fqns=()):
+        self._lock = threading.Lock()
+        self._pending = list(fqns)
+        # results of lookups by (kind, key), and events of lookups in progress
+        self._results = {}
+        self._in_progress = {}
+
+    def _lookup(self, request, fqn):
+        app_found = pkg_api.app_by_fqn(request, fqn)
+        return ([app_found] if app_found else []) + list(
+            pkg_api.apps_that_inherit(request, fqn))
+
+    def _get_results(self, kind, keys, getter, max_workers):
+        """Returns results of getter(key) for the keys of the kind.
+
+        Results missing so far are obtained by at most ``max_workers``
+        threads at once, results being obtained by another thread are waited
+        for.
+        """
+        keys = [(kind, key) for key in keys]
+        missing = []
+        waiting = []
+        with self._lock:
+            for key in keys:
+                if key in self._results or key in missing:
+                    continue
+                if key in self._in_progress:
+                    waiting.append(self._in_progress[key])
+                else:
+                    self._in_progress[key] = threading.Event()
+                    missing.append(key)
+
+        if missing:
+            LOG.debug('Looking up {0} for {1}'.format(
+                kind, ', '.join(six.text_type(key[1]) for key in missing)))
+            results = concurrency.run_concurrently(
+                [functools.partial(getter, key[1]) for key in missing],
+                max_workers)
+            with self._lock:
+                for key, result in zip(missing, results):
+                    self._results[key] = result
+                    self._in_progress.pop(key).set()
+        for event in waiting:
+            event.wait()
+        return dict((key[1], self._results[key]) for key in keys)
+
+    def find_apps(self, request, fqns):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        results = self._get_results(
+            'apps', pending + list(fqns),
+            functools.partial(self._lookup, request),
+            _get_app_lookup_workers())
+
+        matching_classes = []
+        fqns_seen = set()
+        # NOTE(kzaitsev): it's possible to have a private
+        # and public apps with the same fqn, however the engine would
+        # currently favor private package. Therefore we should squash
+        # these until we devise a better way to work with this
+        # situation and versioning
+        for fqn in fqns:
+            for app in results[fqn].get():
+                if app.fully_qualified_name in fqns_seen:
+                    continue
+                fqns_seen.add(app.fully_qualified_name)
+                matching_classes.append(app)
+        return matching_classes
+
+    def find_services(self, request, environment_id, fqns):
+        if environment_id is None:
+            return []
+        services = self._get_results(
+            'services', [environment_id],
+            functools.partial(env_api.services_list, request),
+            1)[environment_id].get()
+        return env_api.filter_services_by_fqns(request, services, fqns)
+
+
 def make_select_cls(fqns):
     if not isinstance(fqns, (tuple, list)):
         fqns = (fqns,)
 
     class DynamicSelect(hz_forms.DynamicChoiceField, CustomPropertiesField):
         widget = MuranoTypeWidget
+        app_fqns = tuple(fqns)
 
         def __init__(self, empty_value_message=None, *args, **kwargs):
             super(DynamicSelect, self).__init__(*args, **kwargs)
@@ -702,27 +806,10 @@ def make_select_cls(fqns):
                 self.empty_value_message = _('Select Application')
 
         @with_request
-        def update(self, request, environment_id, **kwargs):
-            matching_classes = []
-            fqns_seen = set()
-            # NOTE(kzaitsev): it's possible to have a private
-            # and public apps with the same fqn, however the engine would
-            # currently favor private package. Therefore we should squash
-            # these until we devise a better way to work with this
-            # situation and versioning
-
-            for class_fqn in fqns:
-                app_found = pkg_api.app_by_fqn(request, class_fqn)
-                if app_found:
-                    fqns_seen.add(app_found.fully_qualified_name)
-                    matching_classes.append(app_found)
-
-                apps_found = pkg_api.apps_that_inherit(request, class_fqn)
-                for app in apps_found:
-                    if app.fully_qualified_name in fqns_seen:
-                        continue
-                    fqns_seen.add(app.fully_qualified_name)
-                    matching_classes.append(app)
+        def update(self, request, environment_id, form=None, **kwargs):
+            resolver = (getattr(form, 'app_references', None) or
+                        AppReferenceResolver())
+            matching_classes = resolver.find_apps(request, fqns)
 
             if not matching_classes:
                 msg = _(
@@ -746,7 +833,7 @@ def make_select_cls(fqns):
 
             self.widget.add_item_link = _make_link
 
-            apps = env_api.service_list_by_fqns(
+            apps = resolver.find_services(
                 request, environment_id,
                 [app.fully_qualified_name for app in matching_classes])
             choices = [('', self.empty_value_message)]
@@ -13,16 +13,20 @@
 #    under the License.
 
 from collections import defaultdict
+from collections import OrderedDict
+import itertools
 
+from django.conf import settings
 from django import forms
 from django.utils.translation import ugettext_lazy as _
 from oslo_log import log as logging
 import six
 from yaql import legacy
 
+from muranodashboard.common import concurrency
+from muranodashboard.dynamic_ui import compiler
 import muranodashboard.dynamic_ui.fields as fields
 import muranodashboard.dynamic_ui.helpers as helpers
-from muranodashboard.dynamic_ui import yaql_expression
 from muranodashboard.dynamic_ui import yaql_functions
 
 
@@ -82,50 +86,15 @@ def _collect_fields(field_specs, form_name, service):
             widget = widget(attrs=kwargs.pop('widget_attrs'))
         return cls, widget
 
-    def parse_spec(spec, keys=None):
-        if keys is None:
-            keys = []
-        if not isinstance(keys, list):
-            keys = [keys]
-        key = keys and keys[-1] or None
-
-        if isinstance(spec, yaql_expression.YaqlExpression):
-            return key, fields.RawProperty(key, spec)
-        elif isinstance(spec, dict):
-            items = []
-            for k, v in six.iteritems(spec):
-                k = helpers.decamelize(k)
-                new_key, v = parse_spec(v, keys + [k])
-                if new_key:
-                    k = new_key
-                items.append((k, v))
-            return key, dict(items)
-        elif isinstance(spec, list):
-            return key, [parse_spec(_spec, keys)[1] for _spec in spec]
-        elif isinstance(spec,
-                        six.string_types) and helpers.is_localizable(keys):
-            return key, spec
-        else:
-            if key == 'hidden':
-                if spec:
-                    return 'widget', forms.HiddenInput
-                else:
-                    return 'widget', None
-            elif key == 'regexp_validator':
-                return 'validators', [helpers.prepare_regexp(spec)]
-            else:
-                return key, spec
-
     def make_field(field_spec):
-        _type, name = field_spec.pop('type'), field_spec.pop('name')
-        if isinstance(_type, list):  # make list keys hashable for TYPES dict
-            _type = tuple(_type)
-        _ignorable, kwargs = parse_spec(field_spec)
-        kwargs.update(TYPES_KWARGS.get(_type, {}))
-        cls, kwargs['widget'] = process_widget(TYPES[_type], kwargs)
+        if not isinstance(field_spec, compiler.CompiledField):
+            field_spec = compiler.compile_field(field_spec, form_name)
+        kwargs = field_spec.bind(fields.RawProperty)
+        kwargs.update(TYPES_KWARGS.get(field_spec.type, {}))
+        cls, kwargs['widget'] = process_widget(TYPES[field_spec.type], kwargs)
         cls = cls.finalize_properties(kwargs, form_name, service)
 
-        return name, cls(**kwargs)
+        return field_spec.name, cls(**kwargs)
 
     return [make_field(_spec) for _spec in field_specs]
 
@@ -141,6 +110,10 @@ class DynamicFormMetaclass(forms.forms.DeclarativeFieldsMetaclass):
             meta, name, bases, dct)
 
 
+def _get_max_update_workers():
+    return getattr(settings, 'MURANO_CONCURRENT_FIELD_UPDATES', 0)
+
+
 class UpdatableFieldsForm(forms.Form):
     """Dynamic updatable form
 
@@ -169,12 +142,58 @@ class UpdatableFieldsForm(forms.Form):
 
         self.fields = updated_fields
 
+        updatable = [(name, field) for name, field
+                     in six.iteritems(self.fields) if hasattr(field, 'update')]
+        # applications referenced by all the fields are looked up at once
+        self.app_references = fields.AppReferenceResolver(
+            itertools.chain.from_iterable(
+                getattr(type(field), 'app_fqns', ())
+                for name, field in updatable))
+        max_workers = _get_max_update_workers()
+        isolate = max_workers > 1 and len(updatable) > 1
+        updaters = [self._make_field_updater(field, request, isolate)
+                    for name, field in updatable]
+        if isolate:
+            results = concurrency.run_concurrently(updaters, max_workers)
+        else:
+            results = []
+            for updater in updaters:
+                results.append(concurrency.call(updater))
+                if results[-1].failed:
+                    break
+
+        self.field_update_timings = OrderedDict()
+        for (name, field), result in zip(updatable, results):
+            self.field_update_timings[name] = result.elapsed
+        LOG.debug('Fields of form {form} updated in {timings}'.format(
+            form=self.__class__.__name__,
+            timings=', '.join('{0}: {1:.3f}s'.format(name, elapsed)
+                              for name, elapsed
+                              in six.iteritems(self.field_update_timings))))
+        # re-raise the first error in the fields order, as a sequential
+        # update would do
+        for result in results:
+            result.get()
+
         for name, field in six.iteritems(self.fields):
-            if hasattr(field, 'update'):
-                field.update(self.initial, form=self, request=request)
             if not field.required:
                 field.widget.attrs['placeholder'] = _('Optional')
 
+    def _make_field_updater(self, field, request, isolate):
+        initial = self.initial
+        if isolate:
+            # every field gets a request of its own, so that switching
+            # region in one of the fields would not affect the others
+            if initial.get('request'):
+                initial = dict(initial, request=helpers.isolated_request(
+                    initial['request']))
+            elif request is not None:
+                request = helpers.isolated_request(request)
+
+        def update():
+            field.update(initial, form=self, request=request)
+        return update
+
 
 class ServiceConfigurationForm(UpdatableFieldsForm):
     def __init__(self, *args, **kwargs):
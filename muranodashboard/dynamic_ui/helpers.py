@@ -13,8 +13,10 @@
 #    under the License.
 
 import contextlib
+import copy
 import re
 import string
+import threading
 import types
 import uuid
 
@@ -162,12 +164,76 @@ def to_str(text):
     return text
 
 
+_REGION_STATE_LOCK = threading.Lock()
+
+
+class _RegionState(object):
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.region = None
+        self.orig_region = None
+        # thread ident -> number of entered contexts
+        self.holders = {}
+
+
+def _get_region_state(request):
+    # NOTE: the state is looked up in the instance dict only, since objects
+    # standing in for requests (e.g. mocks) make up missing attributes
+    with _REGION_STATE_LOCK:
+        return vars(request).setdefault('_murano_region_state',
+                                        _RegionState())
+
+
 @contextlib.contextmanager
 def current_region(request, region):
-    orig_region = request.user.services_region
-    if region is not None:
-        request.user.services_region = region
+    """Temporarily switches services region of the request user.
+
+    Several threads may share the same request: threads asking for the same
+    region share the switch, while a thread asking for another region waits
+    until the others leave the context. Nested calls made by a thread
+    already inside the context switch the region unconditionally.
+    """
+    if region is None:
+        yield
+        return
+
+    state = _get_region_state(request)
+    ident = threading.current_thread().ident
+    with state.condition:
+        nested = ident in state.holders
+        if nested:
+            orig_region = request.user.services_region
+            request.user.services_region = region
+        else:
+            while state.holders and state.region != region:
+                state.condition.wait()
+            if not state.holders:
+                state.orig_region = request.user.services_region
+                state.region = region
+                request.user.services_region = region
+            state.holders[ident] = state.holders.get(ident, 0) + 1
     try:
         yield
     finally:
-        request.user.services_region = orig_region
+        with state.condition:
+            if nested:
+                request.user.services_region = orig_region
+            else:
+                state.holders[ident] -= 1
+                if not state.holders[ident]:
+                    del state.holders[ident]
+                if not state.holders:
+                    request.user.services_region = state.orig_region
+                    state.condition.notify_all()
+
+
+def isolated_request(request):
+    """Returns a shallow copy of the request with its own copy of the user.
+
+    Region of the copy could be switched without affecting the original
+    request, so the copy is suitable to be passed to another thread.
+    """
+    clone = copy.copy(request)
+    clone.user = copy.copy(request.user)
+    clone.__dict__.pop('_murano_region_state', None)
+    return clone
@@ -12,10 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import os
 import re
 import semantic_version
 
+from django.conf import settings
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 from oslo_log import log as logging
@@ -25,21 +25,26 @@ from yaql import legacy
 from muranodashboard import api
 from muranodashboard.api import packages as pkg_api
 from muranodashboard.catalog import forms as catalog_forms
+from muranodashboard.common import cache
+from muranodashboard.common import memory_cache
+from muranodashboard.common import utils
+from muranodashboard.dynamic_ui import compiler
 from muranodashboard.dynamic_ui import helpers
-from muranodashboard.dynamic_ui import version
+from muranodashboard.dynamic_ui import yaql_expression
 from muranodashboard.dynamic_ui import yaql_functions
 from muranodashboard.environments import consts
 
 LOG = logging.getLogger(__name__)
 
 
-if not os.path.exists(consts.CACHE_DIR):
-    os.mkdir(consts.CACHE_DIR)
+if utils.ensure_dir(consts.CACHE_DIR):
     LOG.info('Creating cache directory located at {dir}'.format(
         dir=consts.CACHE_DIR))
 LOG.info('Using cache directory located at {dir}'.format(
     dir=consts.CACHE_DIR))
 
+PARAMETERS_SOURCE_CACHE = memory_cache.TTLCache('parameters_source')
+
 
 class Service(object):
     """Murano Service representation object
@@ -87,12 +92,10 @@ class Service(object):
             setattr(self, key, value)
 
         for form in forms:
-            (name, field_specs, validators,
-             region) = self.extract_form_data(form)
-            # NOTE(kzaitsev) should be str (not unicode) under python2
-            # however it also works as str under python3
-            name = helpers.to_str(name)
-            self._add_form(name, field_specs, validators, region)
+            if not isinstance(form, compiler.CompiledForm):
+                form = compiler.compile_form(form)
+            self._add_form(form.name, form.fields, form.validators,
+                           form.region)
 
         # Add ManageWorkflowForm
         workflow_form = catalog_forms.WorkflowManagementForm()
@@ -120,12 +123,6 @@ class Service(object):
 
         self.forms.append(Form)
 
-    @staticmethod
-    def extract_form_data(data):
-        for form_name, form_data in six.iteritems(data):
-            return (form_name, form_data['fields'],
-                    form_data.get('validators', []), form_data.get('region'))
-
     def extract_attributes(self):
         context = self.context.create_child_context()
         context['$'] = self.cleaned_data
@@ -162,18 +159,22 @@ def get_apps_data(request):
     return request.session.setdefault('apps_data', {})
 
 
+def _parameters_source_cache_ttl():
+    return getattr(settings, 'MURANO_PARAMETERS_SOURCE_CACHE_TTL', 60)
+
+
 def import_app(request, app_id):
     app_data = get_apps_data(request).setdefault(app_id, {})
 
-    ui_desc = pkg_api.get_app_ui(request, app_id)
+    compiled_ui = pkg_api.get_compiled_app_ui(request, app_id)
     fqn = pkg_api.get_app_fqn(request, app_id)
     LOG.debug('Using data {0} for app {1}'.format(app_data, fqn))
-    app_version = ui_desc.pop('Version', version.LATEST_FORMAT_VERSION)
-    version.check_version(app_version)
-    service = dict(
-        (helpers.decamelize(k), v) for (k, v) in six.iteritems(ui_desc))
-    parameters = service.pop('parameters', {})
+    service = compiled_ui.get_sections()
+    parameters = service.pop('parameters', None) or {}
     parameters_source = service.pop('parameters_source', None)
+    # UI definition could opt out of caching of the parameters source result,
+    # e.g. if the static action returns data which changes too often
+    use_cache = service.pop('parameters_source_cache', True)
     if parameters_source is not None:
         parts = parameters_source.rsplit('.', 1)
         if 2 >= len(parts) > 0:
@@ -194,13 +195,22 @@ def import_app(request, app_id):
                 'parameters': {}
             }
 
-            result = api.muranoclient(request).static_actions.call(
-                request_body).get_result()
+            def _call_static_action():
+                return api.muranoclient(request).static_actions.call(
+                    request_body).get_result()
+
+            if use_cache:
+                key = (app_id, pkg_version, class_name, method_name,
+                       request.user.tenant_id)
+                result = PARAMETERS_SOURCE_CACHE.get_or_create(
+                    key, _call_static_action, _parameters_source_cache_ttl())
+            else:
+                result = _call_static_action()
             if result and isinstance(result, dict):
                 parameters.update(result)
 
-    return Service(app_data, app_version, fqn, parameters=parameters,
-                   **service)
+    return Service(app_data, compiled_ui.version, fqn,
+                   forms=compiled_ui.forms, parameters=parameters, **service)
 
 
 def condition_getter(request, kwargs):
@@ -263,6 +273,52 @@ def get_app_forms(request, kwargs):
     return list(zip(step_names, app.forms))
 
 
+def _is_static(value):
+    if isinstance(value, yaql_expression.YaqlExpression):
+        return False
+    elif isinstance(value, dict):
+        return all(_is_static(v) for v in six.itervalues(value))
+    elif isinstance(value, (list, tuple)):
+        return all(_is_static(v) for v in value)
+    return True
+
+
+@cache.with_cache('ui_metadata')
+def get_app_metadata(request, app_id):
+    """Reads facts shown at the application details page from its UI.
+
+    Requirements of the fields named ``flavor`` and the description of the
+    field named ``license`` are read straight from the UI definition, without
+    importing the application and building its forms. If any of them is a
+    YAQL expression, ``static`` is False and the caller should fall back to
+    the forms built by :func:`get_app_forms`.
+    """
+    ui_desc = pkg_api.get_app_ui(request, app_id)
+    metadata = {'flavor_requirements': [], 'license': '', 'static': True}
+    ui_forms = dict((helpers.decamelize(k), v)
+                    for (k, v) in six.iteritems(ui_desc)).get('forms') or []
+    for form in ui_forms:
+        for form_name, form_data in six.iteritems(form):
+            for field in form_data.get('fields', []):
+                field = dict((helpers.decamelize(k), v)
+                             for (k, v) in six.iteritems(field))
+                if field.get('name') == 'flavor':
+                    value = field.get('requirements')
+                elif field.get('name') == 'license':
+                    value = field.get('description')
+                else:
+                    continue
+                if not _is_static(value):
+                    metadata['static'] = False
+                elif field['name'] == 'license':
+                    metadata['license'] = value
+                elif isinstance(value, dict) and value:
+                    metadata['flavor_requirements'].append(
+                        dict((helpers.decamelize(k), v)
+                             for (k, v) in six.iteritems(value)))
+    return metadata
+
+
 def service_type_from_id(service_id):
     match = re.match('(.*)-[0-9]+', service_id)
     if match:
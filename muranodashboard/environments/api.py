@@ -358,6 +358,11 @@ def service_list_by_fqns(request, environment_id, fqns):
         return []
     services = services_list(request, environment_id)
     LOG.debug('Service::Instances::List')
+    return filter_services_by_fqns(request, services, fqns)
+
+
+def filter_services_by_fqns(request, services, fqns):
+    """Filters services (as returned by services_list) by their types."""
     try:
         services = [service for service in services
                     if service['?']['type'].split('/')[0] in fqns]
@@ -24,21 +24,28 @@ from horizon import messages
 from openstack_dashboard.api import glance
 from oslo_log import log as logging
 
+from muranodashboard.common import image_index
+
 LOG = logging.getLogger(__name__)
 
 
+def _filter_by_owner(images, request=None):
+    filter_project = getattr(settings, 'MURANO_IMAGE_FILTER_PROJECT_ID', None)
+    if not filter_project:
+        return images
+    project_ids = [filter_project]
+    if request:
+        project_ids.append(request.user.tenant_id)
+    return [image for image in images
+            if getattr(image, 'owner', None) in project_ids]
+
+
 def filter_murano_images(images, request=None):
     # filter images by project owner
-    filter_project = getattr(settings, 'MURANO_IMAGE_FILTER_PROJECT_ID', None)
-    if filter_project:
-        project_ids = [filter_project]
-        if request:
-            project_ids.append(request.user.tenant_id)
-        images = filter(
-            lambda x: getattr(x, 'owner', None) in project_ids, list(images))
+    images = _filter_by_owner(list(images), request)
     # filter out the snapshot image type
-    images = filter(
-        lambda x: getattr(x, 'image_type', None) != 'snapshot', list(images))
+    images = [image for image in images
+              if getattr(image, 'image_type', None) != 'snapshot']
     marked_images = []
     for image in images:
         # Additional properties, whose value is always a string data type, are
@@ -60,6 +67,16 @@ def filter_murano_images(images, request=None):
     return marked_images
 
 
+def get_marked_images(request):
+    """Returns murano images of the project from the image index."""
+    images = _filter_by_owner(image_index.get_images(request), request)
+    for image in images:
+        if image.murano_property is None:
+            msg = _('Invalid metadata for image: {0}').format(image.id)
+            exceptions.handle(request, msg)
+    return images
+
+
 class MarkImageForm(horizon_forms.SelfHandlingForm):
     _metadata = {
         'windows.2012': ' Windows Server 2012',
@@ -125,6 +142,7 @@ class MarkImageForm(horizon_forms.SelfHandlingForm):
         })
         try:
             img = glance.image_update_properties(request, image_id, **kwargs)
+            image_index.invalidate()
             messages.success(request, _('Image successfully marked'))
             return img
         except Exception:
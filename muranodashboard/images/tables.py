@@ -20,6 +20,7 @@ from horizon import tables
 from openstack_dashboard.api import glance
 from openstack_dashboard import policy
 
+from muranodashboard.common import image_index
 from muranodashboard.common import utils as md_utils
 
 
@@ -55,6 +56,7 @@ class RemoveImageMetadata(policy.PolicyTargetMixin, tables.DeleteAction):
         try:
             remove_props = ['murano_image_info']
             glance.image_update_properties(request, obj_id, remove_props)
+            image_index.invalidate()
         except Exception:
             exceptions.handle(request, _('Unable to remove metadata'),
                               redirect=reverse(
@@ -12,8 +12,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import itertools
-
 from django.urls import reverse
 from django.urls import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
@@ -22,8 +20,8 @@ from horizon import exceptions
 from horizon.forms import views
 from horizon import tables as horizon_tables
 from horizon.utils import functions as utils
-from openstack_dashboard.api import glance
 
+from muranodashboard.common import pagination
 from muranodashboard.images import forms
 from muranodashboard.images import tables
 
@@ -53,45 +51,29 @@ class MarkedImagesView(horizon_tables.DataTableView):
 
         page_size = utils.get_page_size(self.request)
 
-        request_size = page_size + 1
-        kwargs = {'filters': {}}
-        if marker:
-            kwargs['marker'] = marker
-        kwargs['sort_dir'] = sort_dir
-        images = []
+        marked_images = []
         self._prev = False
         self._more = False
 
-        glance_v2_client = glance.glanceclient(self.request, "2")
-
         try:
-            images_iter = glance_v2_client.images.list(
-                **kwargs)
+            marked_images = forms.get_marked_images(self.request)
         except Exception:
             msg = _('Unable to retrieve list of images')
             uri = reverse('horizon:app-catalog:catalog:index')
 
             exceptions.handle(self.request, msg, redirect=uri)
 
-        marked_images_iter = forms.filter_murano_images(
-            images_iter,
-            request=self.request)
-        images = list(itertools.islice(marked_images_iter, request_size))
-        # first and middle page condition
-        if len(images) > page_size:
-            images.pop(-1)
-            self._more = True
-            # middle page condition
-            if marker is not None:
-                self._prev = True
-        # first page condition when reached via prev back
-        elif sort_dir == 'asc' and marker is not None:
-            self._more = True
-        # last page condition
-        elif marker is not None:
-            self._prev = True
-        if prev_marker is not None:
-            images.reverse()
+        # marked images are ordered newest first, as glance lists them
+        if sort_dir == 'asc':
+            marked_images.reverse()
+        if marker:
+            ids = [image.id for image in marked_images]
+            start = ids.index(marker) + 1 if marker in ids else len(ids)
+            marked_images = marked_images[start:]
+
+        images, self._prev, self._more = pagination.paginate(
+            marked_images, page_size, marker,
+            backward=prev_marker is not None)
         return images
 
 
@@ -31,10 +31,12 @@ ADD_JS_FILES = [
     'app/murano/murano.service.js',
     'app/murano/murano.module.js',
     'muranodashboard/js/add-select.js',
+    'muranodashboard/js/app-logos.js',
     'muranodashboard/js/draggable-components.js',
     'muranodashboard/js/environments-in-place.js',
     'muranodashboard/js/external-ad.js',
     'muranodashboard/js/horizon.muranotopology.js',
+    'muranodashboard/js/import-progress.js',
     'muranodashboard/js/murano.tables.js',
     'muranodashboard/js/load-modals.js',
     'muranodashboard/js/mixed-mode.js',
@@ -22,6 +22,112 @@ DISPLAY_MURANO_REPO_URL = 'http://apps.openstack.org/#tab=murano-apps'
 # Specify a maximum number of limit packages.
 # PACKAGES_LIMIT = 100
 
+# Number of seconds the results of UI definition ``ParametersSource`` static
+# actions are cached for. Set to 0 to disable caching.
+# MURANO_PARAMETERS_SOURCE_CACHE_TTL = 60
+
+# Number of seconds lists of flavors, keypairs, availability zones, security
+# groups, networks and volumes used by dynamic UI fields are cached for (per
+# project and region). Set to 0 to disable caching.
+# MURANO_RESOURCES_CACHE_TTL = 30
+
+# Number of seconds a snapshot of quota usages shown by the application
+# creation wizard is shared for (per project and region). Set to 0 to request
+# quota usages on every wizard step.
+# MURANO_QUOTA_USAGES_CACHE_TTL = 10
+
+# Number of seconds names of projects owning packages are cached for. The
+# packages table of administrators looks up only the projects of the packages
+# it shows.
+# MURANO_PROJECT_NAMES_CACHE_TTL = 300
+
+# Maximum number of threads used to update fields of a dynamic UI form
+# concurrently. Every field gets its own copy of the request, so fields
+# working with different regions do not affect each other. Applications
+# referenced by the fields are then looked up concurrently as well. Set to 0
+# to update fields and look applications up one by one.
+# MURANO_CONCURRENT_FIELD_UPDATES = 0
+
+# Number of seconds the index of murano images (per project and region) is
+# served for before it is refreshed. A refresh lists only the images updated
+# since the previous one. Set to 0 to list all images on every request.
+# MURANO_IMAGE_INDEX_TTL = 30
+
+# Number of seconds between full refreshes of the murano image index, which
+# are needed to notice deleted images.
+# MURANO_IMAGE_INDEX_FULL_REFRESH = 300
+
+# Number of seconds the index of catalog applications (per project and
+# region) is served for before it is refreshed. Search, category filter,
+# sorting and pagination of the catalog are answered from the index. A
+# refresh lists only the packages uploaded since the previous one. Set to 0
+# to send every catalog request to murano-api.
+# MURANO_CATALOG_INDEX_TTL = 30
+
+# Number of seconds between full refreshes of the catalog index, which are
+# needed to notice packages modified or deleted outside of this dashboard.
+# MURANO_CATALOG_INDEX_FULL_REFRESH = 300
+
+# Number of seconds the list of application categories (per region) is
+# cached for. Adding or deleting a category, as well as changing a package in
+# this dashboard drops the cached list. Set to 0 to disable caching.
+# MURANO_CATEGORIES_CACHE_TTL = 60
+
+# Number of seconds the expired list of categories is still served for, while
+# it is refreshed in the background. Set to 0 to wait for the refresh.
+# MURANO_CATEGORIES_CACHE_STALE_TTL = 0
+
+# Maximum number of threads obtaining the parts of the catalog page (the page
+# of applications, categories, recently used applications and environments)
+# concurrently. The same parts are returned at once by the "bootstrap" JSON
+# endpoint of the catalog. Set to 0 to obtain them one by one.
+# MURANO_CATALOG_FETCH_WORKERS = 4
+
+# Maximum number of packages downloaded or uploaded at once while importing a
+# bundle. Set to 0 to import packages one by one.
+# MURANO_PACKAGE_IMPORT_WORKERS = 4
+
+# Import bundles in the background and show their progress on a page polling
+# the import job. Jobs are kept in the cache configured in CACHES under the
+# MURANO_IMPORT_JOB_CACHE alias, so that any dashboard process could answer
+# the polls. It should be shared by all the processes, e.g. memcached;
+# bundles are imported synchronously if it is local to the process, like
+# LocMemCache. At most MURANO_IMPORT_JOB_WORKERS jobs run at once in a
+# process, jobs are forgotten MURANO_IMPORT_JOB_TTL seconds after their last
+# change. Single packages are always imported within the request, since the
+# following steps of their wizard need the uploaded package.
+# MURANO_ASYNC_PACKAGE_IMPORT = False
+# MURANO_IMPORT_JOB_CACHE = 'default'
+# MURANO_IMPORT_JOB_WORKERS = 2
+# MURANO_IMPORT_JOB_TTL = 3600
+
+# Storage of UI definitions, logos and details of packages. By default they
+# are pickled to files under METADATA_CACHE_DIR without any size limit. Set
+# "max_size" (in bytes) to evict the least recently used entries once the
+# cache grows bigger. To share the cache between dashboard nodes, use
+# 'muranodashboard.common.cache.DjangoCacheBackend' with "alias" of a cache
+# configured in CACHES. Cached data of deleted packages is removed by the
+# "clean_app_cache" management command. Every process also keeps up to
+# "MEMORY_MAX_SIZE" bytes of recently used values in memory, set it to 0 to
+# read every value from the backend. Entries of the filesystem backend are
+# replaced atomically, set "fsync" to also flush them to the disk, which is
+# worth it when the directory is shared over NFS. Only one process of a node
+# obtains a missing entry at a time, unless "single_flight" is False; lock
+# files are kept in "lock_path", which defaults to the cache directory with
+# "-locks" suffix. The "warm_app_cache" management command fills the cache
+# for all the catalog applications, e.g. right after a deployment.
+# MURANO_APP_CACHE = {
+#     'BACKEND': 'muranodashboard.common.cache.FileSystemBackend',
+#     'OPTIONS': {
+#         'max_size': 512 * 1024 * 1024,
+#     },
+#     'MEMORY_MAX_SIZE': 32 * 1024 * 1024,
+# }
+
+# Number of seconds browsers keep application logos before checking whether
+# they have changed. Unchanged logos are not sent again.
+# MURANO_LOGO_CACHE_MAX_AGE = 24 * 60 * 60
+
 # Make sure horizon has config the DATABASES, If horizon config use horizon's
 # DATABASES, if not, set it by murano.
 try:
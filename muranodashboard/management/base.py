@@ -0,0 +1,70 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+from django.core.management import base
+from keystoneauth1 import identity
+from keystoneauth1 import session
+
+from muranodashboard.common import utils
+
+
+class ApiCommand(base.BaseCommand):
+    """Base of commands talking to OpenStack APIs outside of a web request.
+
+    Credentials are taken from the command line, falling back to the usual
+    ``OS_*`` environment variables. API helpers of the dashboard expect a
+    request of a logged in user, so :meth:`get_request` builds an object
+    which has just enough of it.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--os-auth-url',
+                            default=os.environ.get('OS_AUTH_URL'))
+        parser.add_argument('--os-username',
+                            default=os.environ.get('OS_USERNAME'))
+        parser.add_argument('--os-password',
+                            default=os.environ.get('OS_PASSWORD'))
+        parser.add_argument('--os-project-name',
+                            default=os.environ.get('OS_PROJECT_NAME'))
+        parser.add_argument('--os-user-domain-name',
+                            default=os.environ.get('OS_USER_DOMAIN_NAME',
+                                                   'Default'))
+        parser.add_argument('--os-project-domain-name',
+                            default=os.environ.get('OS_PROJECT_DOMAIN_NAME',
+                                                   'Default'))
+        parser.add_argument('--os-region-name',
+                            default=os.environ.get('OS_REGION_NAME'))
+
+    def get_request(self, options):
+        for option in ('os_auth_url', 'os_username', 'os_password',
+                       'os_project_name'):
+            if not options.get(option):
+                raise base.CommandError(
+                    '--{0} is required'.format(option.replace('_', '-')))
+
+        auth = identity.Password(
+            auth_url=options['os_auth_url'],
+            username=options['os_username'],
+            password=options['os_password'],
+            project_name=options['os_project_name'],
+            user_domain_name=options['os_user_domain_name'],
+            project_domain_name=options['os_project_domain_name'])
+        auth_ref = auth.get_auth_ref(session.Session(auth=auth))
+
+        user = utils.Bunch(
+            token=utils.Bunch(id=auth_ref.auth_token),
+            tenant_id=auth_ref.project_id,
+            services_region=options['os_region_name'],
+            service_catalog=auth_ref.service_catalog.catalog)
+        return utils.Bunch(user=user, session={})
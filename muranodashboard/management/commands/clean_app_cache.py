@@ -0,0 +1,29 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from muranodashboard import api
+from muranodashboard.common import cache
+from muranodashboard.management import base
+
+
+class Command(base.ApiCommand):
+    help = ('Removes cached UI definitions, logos and details of packages '
+            'which are no longer present in the catalog.')
+
+    def handle(self, *args, **options):
+        request = self.get_request(options)
+        packages = api.muranoclient(request).packages.filter(
+            include_disabled=True)
+        app_ids = [package.id for package in packages]
+        removed = cache.get_backend().gc(app_ids)
+        self.stdout.write('Removed cached data of {0} packages'.format(
+            removed))
@@ -0,0 +1,55 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.core.management import base as django_base
+
+from muranodashboard import api
+from muranodashboard.api import packages as pkg_api
+from muranodashboard.management import base
+
+
+class Command(base.ApiCommand):
+    help = ('Compiles UI definitions of catalog applications and stores '
+            'them in the application cache, so that the first wizard '
+            'request of each application does not have to do it.')
+
+    def add_arguments(self, parser):
+        super(Command, self).add_arguments(parser)
+        parser.add_argument('app_ids', nargs='*', metavar='APP_ID',
+                            help='Applications to compile, all the '
+                                 'applications of the catalog by default')
+
+    def handle(self, *args, **options):
+        request = self.get_request(options)
+        app_ids = options['app_ids']
+        if app_ids:
+            pkg_api.revalidate_cache(request, app_ids)
+        else:
+            packages = list(api.muranoclient(request).packages.filter(
+                type='Application', include_disabled=True))
+            pkg_api.validate_cache(packages)
+            app_ids = [package.id for package in packages]
+
+        failed = 0
+        for app_id in app_ids:
+            try:
+                pkg_api.get_compiled_app_ui(request, app_id)
+            except Exception as e:
+                failed += 1
+                self.stderr.write('{0}: {1}'.format(app_id, e))
+            else:
+                self.stdout.write('{0}: compiled'.format(app_id))
+
+        if failed:
+            raise django_base.CommandError(
+                'Failed to compile {0} of {1} UI definitions'.format(
+                    failed, len(app_ids)))
@@ -0,0 +1,100 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+
+from django.core.management import base as django_base
+from muranoclient.common import exceptions as exc
+
+from muranodashboard.api import packages as pkg_api
+from muranodashboard.common import concurrency
+from muranodashboard.management import base
+
+# Logos are optional, so the API is free to have none of them
+OPTIONAL_ASSETS = ('logo', 'supplier_logo')
+
+
+class Command(base.ApiCommand):
+    help = ('Fetches UI definitions, logos and details of catalog '
+            'applications into the application cache, so that the first '
+            'users after a deployment or a cache cleanup do not have to wait '
+            'for them.')
+
+    def add_arguments(self, parser):
+        super(Command, self).add_arguments(parser)
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help='Number of applications fetched at a time')
+        parser.add_argument('--compile', action='store_true',
+                            help='Compile UI definitions as well')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only list the applications to fetch')
+
+    def get_assets(self, compile_ui):
+        assets = [('ui', pkg_api.get_app_ui),
+                  ('logo', pkg_api.get_app_logo),
+                  ('supplier_logo', pkg_api.get_app_supplier_logo),
+                  ('details', pkg_api.get_package_details)]
+        if compile_ui:
+            assets.append(('ui_compiled', pkg_api.get_compiled_app_ui))
+        return assets
+
+    def warm_up(self, request, app_id, assets):
+        missing = []
+        for name, getter in assets:
+            try:
+                getter(request, app_id)
+            except exc.HTTPNotFound:
+                if name not in OPTIONAL_ASSETS:
+                    raise
+                missing.append(name)
+        return missing
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise django_base.CommandError('--concurrency should be positive')
+        request = self.get_request(options)
+        packages, _more = pkg_api.package_list(
+            request, filters={'type': 'Application', 'catalog': True})
+
+        assets = self.get_assets(options['compile'])
+        if options['dry_run']:
+            for package in packages:
+                self.stdout.write('{0} ({1}): would fetch {2}'.format(
+                    package.name, package.id,
+                    ', '.join(name for name, _getter in assets)))
+            return
+
+        # entries of updated packages are not worth warming up
+        pkg_api.validate_cache(packages)
+
+        results = concurrency.iter_concurrently(
+            [functools.partial(self.warm_up, request, package.id, assets)
+             for package in packages],
+            options['concurrency'])
+        failed = 0
+        for i, (package, result) in enumerate(zip(packages, results), 1):
+            progress = '[{0}/{1}] {2} ({3})'.format(
+                i, len(packages), package.name, package.id)
+            if result.failed:
+                failed += 1
+                self.stderr.write('{0}: {1}'.format(progress,
+                                                    result.exc_info[1]))
+            elif result.value:
+                self.stdout.write('{0}: cached, no {1}'.format(
+                    progress, ', '.join(result.value)))
+            else:
+                self.stdout.write('{0}: cached'.format(progress))
+
+        if failed:
+            raise django_base.CommandError(
+                'Failed to warm up the cache for {0} of {1} '
+                'applications'.format(failed, len(packages)))
@@ -27,6 +27,7 @@ from oslo_log import log as logging
 
 from muranoclient.common import exceptions as exc
 from muranodashboard import api
+from muranodashboard.api import packages as pkg_api
 from muranodashboard.packages import consts
 
 
@@ -234,6 +235,7 @@ class ModifyPackageForm(PackageParamsMixin, horizon_forms.SelfHandlingForm):
         try:
             data['tags'] = [t.strip() for t in data['tags'].split(',')]
             result = api.muranoclient(request).packages.update(app_id, data)
+            pkg_api.invalidate_cache(app_id)
             messages.success(request, _('Package modified.'))
             return result
         except exc.HTTPForbidden:
@@ -0,0 +1,141 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""Resolution of packages imported together.
+
+Packages of a bundle often require the same packages, so requirements of
+all of them are resolved at once: every package is downloaded only once,
+several packages at a time, and packages are uploaded level by level, every
+level requiring only packages of the previous ones.
+"""
+
+import collections
+import functools
+
+from django.conf import settings
+from muranoclient.common import utils as muranoclient_utils
+from oslo_log import log as logging
+import six
+
+from muranodashboard.common import concurrency
+
+
+LOG = logging.getLogger(__name__)
+
+
+def get_max_workers():
+    return getattr(settings, 'MURANO_PACKAGE_IMPORT_WORKERS', 4)
+
+
+def _download(name, base_url, version=None, url=None):
+    package = muranoclient_utils.Package.from_location(
+        name, version=version, url=url, base_url=base_url, path=None)
+    # reading the manifest right away detects broken packages
+    LOG.debug('Downloaded package {0}'.format(package.manifest['FullName']))
+    return package
+
+
+def download(specs, base_url, max_workers):
+    """Downloads packages of the bundle specifications concurrently.
+
+    Returns :class:`~muranodashboard.common.concurrency.Result` objects in
+    the order of the specifications.
+    """
+    return concurrency.run_concurrently(
+        [functools.partial(_download, spec['Name'], base_url,
+                           version=spec.get('Version'), url=spec.get('Url'))
+         for spec in specs], max_workers)
+
+
+def resolve(packages, base_url, max_workers):
+    """Downloads all the packages required by the given ones.
+
+    Requirements are downloaded level by level, several at once, and every
+    one of them only once however many packages require it. Requirements
+    which could not be downloaded are logged and skipped, the way
+    ``Package.requirements`` does it.
+
+    Returns an ordered dict of the given and the required packages by their
+    full names, and a dict of full names of packages each of them requires.
+    """
+    resolved = collections.OrderedDict()
+    requires = {}
+    # full names of the downloaded requirements by the name they are
+    # required as, None for the ones which could not be downloaded
+    full_names = {}
+    pending = list(packages)
+    while pending:
+        added = []
+        for package in pending:
+            name = package.manifest['FullName']
+            if name not in resolved:
+                resolved[name] = package
+                added.append(name)
+
+        required = collections.OrderedDict()
+        for name in added:
+            dependencies = resolved[name].manifest.get('Require') or {}
+            requires[name] = list(dependencies)
+            for dep_name, version in six.iteritems(dependencies):
+                if (dep_name not in resolved and dep_name not in full_names
+                        and dep_name not in required):
+                    required[dep_name] = version
+
+        results = concurrency.run_concurrently(
+            [functools.partial(_download, dep_name, base_url,
+                               version=version)
+             for dep_name, version in six.iteritems(required)], max_workers)
+        pending = []
+        for dep_name, result in zip(required, results):
+            if result.failed:
+                LOG.error('Error {0} occurred while downloading required '
+                          'package {1}'.format(result.exc_info[1], dep_name))
+                full_names[dep_name] = None
+                continue
+            full_names[dep_name] = result.value.manifest['FullName']
+            pending.append(result.value)
+
+    graph = {}
+    for name, dependencies in six.iteritems(requires):
+        dependencies = [full_names.get(dep_name, dep_name)
+                        for dep_name in dependencies]
+        graph[name] = [dep_name for dep_name in dependencies
+                       if dep_name in resolved and dep_name != name]
+    return resolved, graph
+
+
+def get_levels(names, graph):
+    """Splits packages into levels to be uploaded one after another.
+
+    Packages of a level require only packages of the previous levels, so
+    they could be uploaded concurrently. Packages of a level keep the order
+    of ``names``. Murano allows cyclic requirements, a cycle is broken at
+    the package requiring the fewest packages left, which makes a level of
+    its own.
+    """
+    names = list(names)
+    remaining = collections.OrderedDict(
+        (name, set(graph.get(name, ())).intersection(names))
+        for name in names)
+    levels = []
+    while remaining:
+        level = [name for name, deps in six.iteritems(remaining) if not deps]
+        if not level:
+            level = [min(remaining,
+                         key=lambda name: len(remaining[name]))]
+        levels.append(level)
+        for name in level:
+            del remaining[name]
+        for deps in six.itervalues(remaining):
+            deps.difference_update(level)
+    return levels
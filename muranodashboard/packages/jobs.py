@@ -0,0 +1,296 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Registry of package imports running in the background.
+
+An import job runs in a pool of threads of the dashboard process, so that
+the request starting it returns right away. The job keeps the state of
+every package and image it handles, as well as messages for the user, which
+are moved to the messages of the request polling the job. Jobs are kept in
+the cache configured by ``MURANO_IMPORT_JOB_CACHE``, so that the polling
+requests could be served by any process sharing that cache. Imports are not
+run in the background if the cache is local to the process.
+"""
+
+import collections
+import functools
+from multiprocessing import pool
+import re
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core import cache as django_cache
+from django.utils import translation
+from oslo_log import log as logging
+import six
+
+from muranodashboard.common import concurrency
+from muranodashboard.dynamic_ui import helpers
+
+
+LOG = logging.getLogger(__name__)
+
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+
+# States of packages handled by a job
+DOWNLOADING = 'downloading'
+PENDING = 'pending'
+UPLOADING = 'uploading'
+UPLOADED = 'uploaded'
+REGISTERED = 'registered'
+
+# States of images which are not going to change any more
+FINAL_IMAGE_STATES = ('active', 'killed', 'deleted')
+
+# Caches which are not shared by the processes of the dashboard
+PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache',
+                        'django.core.cache.backends.dummy.DummyCache')
+
+_JOB_ID_RE = re.compile('^[0-9a-f]{32}$')
+_LOCK = threading.Lock()
+_POOL = None
+
+
+def _get_cache_alias():
+    return getattr(settings, 'MURANO_IMPORT_JOB_CACHE', 'default')
+
+
+def _get_cache():
+    # NOTE: cache connections are thread-local in django
+    return django_cache.caches[_get_cache_alias()]
+
+
+def is_enabled():
+    if not getattr(settings, 'MURANO_ASYNC_PACKAGE_IMPORT', False):
+        return False
+    alias = _get_cache_alias()
+    backend = getattr(settings, 'CACHES', {}).get(alias, {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        LOG.warning('Cache "{0}" is local to the process, so packages are '
+                    'imported synchronously. Configure a shared cache to '
+                    'import them in the background.'.format(alias))
+        return False
+    return True
+
+
+def _get_workers():
+    return getattr(settings, 'MURANO_IMPORT_JOB_WORKERS', 2)
+
+
+def _get_ttl():
+    return getattr(settings, 'MURANO_IMPORT_JOB_TTL', 3600)
+
+
+def _get_owner(request):
+    return request.user.id, request.user.tenant_id
+
+
+def _make_key(job_id):
+    return 'murano-import-job:{0}'.format(job_id)
+
+
+def _make_poll_key(job_id):
+    return 'murano-import-job:{0}:poll'.format(job_id)
+
+
+class Job(object):
+    """Progress of a single import, kept by the worker running it.
+
+    Every change is saved to the cache, the jobs are forgotten
+    ``MURANO_IMPORT_JOB_TTL`` seconds after their last change. Polling
+    requests read them as :class:`PolledJob`.
+    """
+
+    def __init__(self, owner):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.state = RUNNING
+        self.started_at = time.time()
+        self.finished_at = None
+        self._packages = collections.OrderedDict()
+        self._images = collections.OrderedDict()
+        self._messages = []
+        self._app_ids = []
+        self._lock = threading.RLock()
+
+    def set_package(self, name, state, details=None):
+        with self._lock:
+            self._packages[name] = {'name': name, 'state': state,
+                                    'details': details}
+            self.save()
+
+    def add_images(self, name, images):
+        """Remembers images being created for the package."""
+        with self._lock:
+            for image in images:
+                self._images[image['id']] = {
+                    'id': image['id'], 'name': image['name'],
+                    'package': name,
+                    'state': image.get('status') or 'queued'}
+            self.save()
+
+    def add_message(self, level, text):
+        with self._lock:
+            self._messages.append((level, six.text_type(text)))
+            self.save()
+
+    def add_app(self, app_id):
+        """Remembers an uploaded package for the latest apps of the user."""
+        with self._lock:
+            self._app_ids.append(app_id)
+            self.save()
+
+    def finish(self, succeeded):
+        with self._lock:
+            self.state = FINISHED if succeeded else FAILED
+            self.finished_at = time.time()
+            self.save()
+
+    def save(self):
+        # NOTE: the state is saved under the lock, so that an older state
+        # never overwrites a newer one
+        with self._lock:
+            _get_cache().set(_make_key(self.id), self.to_record(),
+                             _get_ttl())
+
+    def to_record(self):
+        with self._lock:
+            return {'id': self.id,
+                    'owner': self.owner,
+                    'state': self.state,
+                    'started_at': self.started_at,
+                    'finished_at': self.finished_at,
+                    'packages': list(self._packages.values()),
+                    'images': list(self._images.values()),
+                    'messages': list(self._messages),
+                    'app_ids': list(self._app_ids)}
+
+
+class PolledJob(object):
+    """State of a job as seen by a request polling it.
+
+    States of images looked up by the polling requests, as well as the
+    number of messages and applications already handed to them, are saved
+    apart from the job, which is only saved by its worker.
+    """
+
+    def __init__(self, record, poll_record=None):
+        self.id = record['id']
+        self._record = record
+        self._poll_record = poll_record or {'images': {}, 'messages': 0,
+                                            'apps': 0}
+
+    @property
+    def state(self):
+        return self._record['state']
+
+    def _get_images(self):
+        images = []
+        for image in self._record['images']:
+            image = dict(image)
+            image['state'] = self._poll_record['images'].get(
+                image['id'], image['state'])
+            images.append(image)
+        return images
+
+    def get_pending_images(self):
+        """Returns ids of images whose state could still change."""
+        return [image['id'] for image in self._get_images()
+                if image['state'] not in FINAL_IMAGE_STATES]
+
+    def set_image_state(self, image_id, state):
+        self._poll_record['images'][image_id] = state
+
+    def pop_messages(self):
+        messages = self._record['messages'][self._poll_record['messages']:]
+        self._poll_record['messages'] = len(self._record['messages'])
+        return messages
+
+    def pop_apps(self):
+        app_ids = self._record['app_ids'][self._poll_record['apps']:]
+        self._poll_record['apps'] = len(self._record['app_ids'])
+        return app_ids
+
+    def save(self):
+        """Saves what has been popped and looked up since the job was got."""
+        _get_cache().set(_make_poll_key(self.id), self._poll_record,
+                         _get_ttl())
+
+    def to_dict(self):
+        return {'id': self.id,
+                'state': self.state,
+                'elapsed': (self._record['finished_at'] or time.time()) -
+                self._record['started_at'],
+                'packages': self._record['packages'],
+                'images': self._get_images()}
+
+
+def detach_request(request):
+    """Returns a copy of the request a job could use once it is answered.
+
+    The copy has its own copy of the user, with the token API clients need,
+    and a copy of the session as a plain dict, so the job neither changes
+    the original request nor expects its changes of the session to be
+    saved.
+    """
+    clone = helpers.isolated_request(request)
+    clone.session = dict(request.session.items())
+    return clone
+
+
+def _run(job, func, language):
+    result = concurrency.call(functools.partial(func, job), language)
+    if result.failed:
+        LOG.error('Import job {0} failed: {1}'.format(
+            job.id, result.exc_info[1]), exc_info=result.exc_info)
+        job.add_message('error', result.exc_info[1])
+    job.finish(not result.failed)
+
+
+def start(request, func):
+    """Calls ``func(job)`` in the background, returns the job.
+
+    ``func`` outlives the request, so it should work with a copy of the
+    request made by :func:`detach_request` rather than the request itself.
+
+    At most ``MURANO_IMPORT_JOB_WORKERS`` jobs run at once in a process,
+    the rest wait for their turn.
+    """
+    global _POOL
+
+    job = Job(_get_owner(request))
+    job.save()
+    with _LOCK:
+        if _POOL is None:
+            _POOL = pool.ThreadPool(max(_get_workers(), 1))
+        workers = _POOL
+    workers.apply_async(_run, (job, func, translation.get_language()))
+    LOG.info('Started import job {0}'.format(job.id))
+    return job
+
+
+def get(request, job_id):
+    """Returns the job started by the user in the project, None if none.
+
+    The job is returned as :class:`PolledJob`, whichever process runs it.
+    """
+    if not _JOB_ID_RE.match(job_id):
+        return None
+    cache = _get_cache()
+    record = cache.get(_make_key(job_id))
+    if record is None or tuple(record['owner']) != _get_owner(request):
+        return None
+    return PolledJob(record, cache.get(_make_poll_key(job_id)))
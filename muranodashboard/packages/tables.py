@@ -25,6 +25,7 @@ from oslo_log import log as logging
 
 from muranoclient.common import exceptions as exc
 from muranodashboard import api
+from muranodashboard.api import packages as pkg_api
 from muranodashboard.common import utils as md_utils
 
 LOG = logging.getLogger(__name__)
@@ -182,6 +183,7 @@ class DeletePackage(policy.PolicyTargetMixin, tables.DeleteAction):
     def delete(self, request, obj_id):
         try:
             api.muranoclient(request).packages.delete(obj_id)
+            pkg_api.invalidate_cache(obj_id)
         except exc.HTTPNotFound:
             msg = _("Package with id {0} is not found").format(obj_id)
             LOG.exception(msg)
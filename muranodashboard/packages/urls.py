@@ -23,6 +23,10 @@ urlpatterns = [
              views.FORMS), name='upload'),
     urls.url(r'^import_bundle$', views.ImportBundleWizard.as_view(
              views.BUNDLE_FORMS), name='import_bundle'),
+    urls.url(r'^import_progress/(?P<job_id>[^/]+)$',
+             views.ImportProgressView.as_view(), name='import_progress'),
+    urls.url(r'^import_progress/(?P<job_id>[^/]+)/status$',
+             views.get_import_job, name='import_job'),
     urls.url(r'^modify/(?P<app_id>[^/]+)?$',
              views.ModifyPackageView.as_view(), name='modify'),
     urls.url(r'^(?P<app_id>[^/]+)?$',
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import json
 import sys
 
@@ -35,7 +36,6 @@ from horizon import views as horizon_views
 from muranoclient.common import exceptions as exc
 from muranoclient.common import utils as muranoclient_utils
 from openstack_dashboard.api import glance
-from openstack_dashboard.api import keystone
 from oslo_log import log as logging
 import six
 import six.moves.urllib.parse as urlparse
@@ -43,10 +43,15 @@ import six.moves.urllib.parse as urlparse
 from muranodashboard import api
 from muranodashboard.api import packages as pkg_api
 from muranodashboard.catalog import views as catalog_views
+from muranodashboard.common import concurrency
+from muranodashboard.common import pagination
+from muranodashboard.common import resources
 from muranodashboard.common import utils as muranodashboard_utils
 from muranodashboard.environments import consts
 from muranodashboard.packages import consts as packages_consts
 from muranodashboard.packages import forms
+from muranodashboard.packages import importing
+from muranodashboard.packages import jobs
 from muranodashboard.packages import tables
 
 LOG = logging.getLogger(__name__)
@@ -70,23 +75,55 @@ def is_app(wizard):
     return False
 
 
-def _ensure_images(name, package, request, step_data=None):
+def _create_images(request, package):
+    """Creates images required by the package, returns the new ones."""
     glance_client = glance.glanceclient(
         request, version='2')
 
     base_url = packages_consts.MURANO_REPO_URL
     image_specs = package.images()
 
+    return muranoclient_utils.ensure_images(
+        glance_client=glance_client,
+        image_specs=image_specs,
+        base_url=base_url)
+
+
+def _import_package(request, name, package):
+    """Creates images of the package and uploads it.
+
+    Outcomes of both are returned as ``concurrency.Result`` objects, so that
+    the function could be called in a worker thread and reported in the
+    request one.
+    """
+    images = concurrency.call(
+        functools.partial(_create_images, request, package))
+    uploaded = concurrency.call(
+        lambda: api.muranoclient(request).packages.create(
+            {}, {name: package.file()}))
+    return images, uploaded
+
+
+def _ensure_images(name, package, request, step_data=None, images=None,
+                   report=None):
+    """Creates images required by the package, reporting them.
+
+    ``images`` is the result of :func:`_create_images` called earlier, if
+    any. Messages go to ``report``, the messages of the request by default.
+    """
+    report = report or _RequestReport(request)
+    if images is None:
+        images = concurrency.call(
+            functools.partial(_create_images, request, package))
+
     try:
-        imgs = muranoclient_utils.ensure_images(
-            glance_client=glance_client,
-            image_specs=image_specs,
-            base_url=base_url)
+        imgs = images.get()
+        report.add_images(name, imgs)
         for img in imgs:
             msg = _("Trying to add {0} image to glance. "
                     "Image will be ready for deployment after "
                     "successful upload").format(img['name'],)
-            messages.warning(request, msg)
+            report.add_message('warning', msg)
             log_msg = _("Trying to add {0}, {1} image to "
                         "glance. Image will be ready for "
                         "deployment after successful upload")\
@@ -97,10 +134,112 @@ def _ensure_images(name, package, request, step_data=None):
     except Exception as e:
         msg = _("Error {0} occurred while installing "
                 "images for {1}").format(e, name)
-        messages.error(request, msg)
+        report.add_message('error', msg)
         LOG.exception(msg)
 
 
+@catalog_views.update_latest_apps
+def _update_latest_apps(request, app_id):
+    LOG.info('Adding {0} application to the'
+             ' latest apps list'.format(app_id))
+
+
+class _RequestReport(object):
+    """Reports progress of an import made within the request.
+
+    Messages go to the messages of the request right away. Import jobs
+    (see :mod:`muranodashboard.packages.jobs`) have the same methods.
+    """
+
+    def __init__(self, request):
+        self.request = request
+
+    def set_package(self, name, state, details=None):
+        pass
+
+    def add_images(self, name, images):
+        pass
+
+    def add_message(self, level, text):
+        getattr(messages, level)(self.request, text)
+
+    def add_app(self, app_id):
+        _update_latest_apps(request=self.request, app_id=app_id)
+
+
+def _import_bundle(request, bundle, base_url, report):
+    """Imports packages of the bundle with all their requirements.
+
+    Requirements of all the packages are resolved together, so that every
+    package is downloaded and uploaded only once. Progress and outcomes are
+    given to ``report``.
+    """
+    max_workers = importing.get_max_workers()
+    package_specs = list(bundle.package_specs())
+    packages = []
+    for package_spec in package_specs:
+        report.set_package(package_spec['Name'], jobs.DOWNLOADING)
+    for package_spec, result in zip(
+            package_specs,
+            importing.download(package_specs, base_url, max_workers)):
+        try:
+            packages.append(result.get())
+        except Exception as e:
+            msg = _("Error {0} occurred while parsing package {1}")\
+                .format(e, package_spec.get('Name'))
+            report.set_package(package_spec['Name'], jobs.FAILED, msg)
+            report.add_message('error', msg)
+            LOG.exception(msg)
+            continue
+
+    reqs, graph = importing.resolve(packages, base_url, max_workers)
+    for dep_name in reqs:
+        report.set_package(dep_name, jobs.PENDING)
+    for level in importing.get_levels(reqs, graph):
+        for dep_name in level:
+            report.set_package(dep_name, jobs.UPLOADING)
+        results = concurrency.run_concurrently(
+            [functools.partial(_import_package, request,
+                               dep_name, reqs[dep_name])
+             for dep_name in level], max_workers)
+        for dep_name, result in zip(level, results):
+            images, uploaded = result.get()
+            _ensure_images(dep_name, reqs[dep_name], request,
+                           images=images, report=report)
+
+            try:
+                package = uploaded.get()
+                pkg_api.invalidate_cache(package.id)
+                msg = _('Package {0} uploaded').format(dep_name)
+                report.set_package(dep_name, jobs.UPLOADED)
+                report.add_message('success', msg)
+                report.add_app(package.id)
+            except exc.HTTPConflict:
+                msg = _("Package {0} already registered.").format(
+                    dep_name)
+                report.set_package(dep_name, jobs.REGISTERED, msg)
+                report.add_message('warning', msg)
+                LOG.exception(msg)
+            except exc.HTTPException as e:
+                reason = muranodashboard_utils.parse_api_error(
+                    getattr(e, 'details', ''))
+                if not reason:
+                    report.set_package(dep_name, jobs.FAILED)
+                    raise
+                msg = _("Package {0} upload failed. {1}").format(
+                    dep_name, reason)
+                report.set_package(dep_name, jobs.FAILED, msg)
+                report.add_message('warning', msg)
+                LOG.exception(msg)
+            except Exception as e:
+                msg = _("Importing package {0} failed. "
+                        "Reason: {1}").format(dep_name, e)
+                report.set_package(dep_name, jobs.FAILED, msg)
+                report.add_message('warning', msg)
+                LOG.exception(msg)
+                continue
+
+
 class PackageDefinitionsView(horizon_tables.DataTableView):
     table_class = tables.PackageDefinitionsTable
     template_name = 'packages/index.html'
@@ -133,38 +272,16 @@ class PackageDefinitionsView(horizon_tables.DataTableView):
                 self.request, marker=marker, filters=opts, paginate=True,
                 page_size=page_size)
 
-            if sort_dir == 'asc':
-                self._more = extra
-            else:
+            backward = sort_dir == 'desc'
+            if backward:
                 packages = list(reversed(packages))
-                self._prev = extra
-
-            if packages:
-                if sort_dir == 'asc':
-                    backward_marker = packages[0].id
-                    opts['sort_dir'] = 'desc'
-                else:
-                    backward_marker = packages[-1].id
-                    opts['sort_dir'] = 'asc'
-
-                __, extra = pkg_api.package_list(
-                    self.request, filters=opts, paginate=True,
-                    marker=backward_marker, page_size=0)
-
-                if sort_dir == 'asc':
-                    self._prev = extra
-                else:
-                    self._more = extra
+            self._prev, self._more = pagination.get_boundaries(
+                extra, marker, backward)
 
         # Add information about project tenant for admin user
         if self.request.user.is_superuser:
-            tenants = []
-            try:
-                tenants, _more = keystone.tenant_list(self.request)
-            except Exception:
-                exceptions.handle(self.request,
-                                  _("Unable to retrieve project list."))
-            tenent_name_by_id = {tenant.id: tenant.name for tenant in tenants}
+            tenent_name_by_id = resources.project_names(
+                self.request, [p.owner_id for p in packages])
             for i, p in enumerate(packages):
                 packages[i].tenant_name = tenent_name_by_id.get(p.owner_id)
         else:
@@ -214,15 +331,9 @@ class ImportBundleWizard(horizon_views.PageTitleMixin, views.ModalFormMixin,
         return initial_dict
 
     def process_step(self, form):
-        @catalog_views.update_latest_apps
-        def _update_latest_apps(request, app_id):
-            LOG.info('Adding {0} application to the'
-                     ' latest apps list'.format(app_id))
-
         step_data = self.get_form_step_data(form)
         if self.steps.current == 'upload':
             import_type = form.cleaned_data['import_type']
-            data = {}
             f = None
             base_url = packages_consts.MURANO_REPO_URL
 
@@ -250,61 +361,29 @@ class ImportBundleWizard(horizon_views.PageTitleMixin, views.ModalFormMixin,
                 raise exceptions.Http302(
                     reverse('horizon:app-catalog:packages:index'))
 
-            for package_spec in bundle.package_specs():
-                try:
-                    package = muranoclient_utils.Package.from_location(
-                        package_spec['Name'],
-                        version=package_spec.get('Version'),
-                        url=package_spec.get('Url'),
-                        base_url=base_url,
-                        path=None,
-                    )
-                except Exception as e:
-                    msg = _("Error {0} occurred while parsing package {1}")\
-                        .format(e, package_spec.get('Name'))
-                    messages.error(self.request, msg)
-                    LOG.exception(msg)
-                    continue
-
-                reqs = package.requirements(base_url=base_url)
-                for dep_name, dep_package in six.iteritems(reqs):
-                    _ensure_images(dep_name, dep_package,
-                                   self.request)
-
-                    try:
-                        files = {dep_name: dep_package.file()}
-                        package = api.muranoclient(
-                            self.request).packages.create(data, files)
-                        messages.success(
-                            self.request,
-                            _('Package {0} uploaded').format(dep_name)
-                        )
-                        _update_latest_apps(
-                            request=self.request, app_id=package.id)
-                    except exc.HTTPConflict:
-                        msg = _("Package {0} already registered.").format(
-                            dep_name)
-                        messages.warning(self.request, msg)
-                        LOG.exception(msg)
-                    except exc.HTTPException as e:
-                        reason = muranodashboard_utils.parse_api_error(
-                            getattr(e, 'details', ''))
-                        if not reason:
-                            raise
-                        msg = _("Package {0} upload failed. {1}").format(
-                            dep_name, reason)
-                        messages.warning(self.request, msg)
-                        LOG.exception(msg)
-                    except Exception as e:
-                        msg = _("Importing package {0} failed. "
-                                "Reason: {1}").format(dep_name, e)
-                        messages.warning(self.request, msg)
-                        LOG.exception(msg)
-                        continue
+            if jobs.is_enabled():
+                # the job goes on after the response, when the request
+                # is not to be used any more
+                job = jobs.start(self.request, functools.partial(
+                    _import_bundle, jobs.detach_request(self.request),
+                    bundle, base_url))
+                self.storage.extra_data['import_job_id'] = job.id
+            else:
+                _import_bundle(self.request, bundle, base_url,
+                               _RequestReport(self.request))
 
         return step_data
 
     def done(self, form_list, **kwargs):
+        job_id = self.storage.extra_data.get('import_job_id')
+        if job_id:
+            redirect = reverse('horizon:app-catalog:packages:import_progress',
+                               args=(job_id,))
+            msg = _('Bundle import started.')
+            LOG.info(msg)
+            messages.info(self.request, msg)
+            return http.HttpResponseRedirect(six.text_type(redirect))
+
         redirect = reverse('horizon:app-catalog:packages:index')
         msg = _('Bundle successfully imported.')
         LOG.info(msg)
@@ -314,6 +393,16 @@ class ImportBundleWizard(horizon_views.PageTitleMixin, views.ModalFormMixin,
 
 class ImportPackageWizard(horizon_views.PageTitleMixin, views.ModalFormMixin,
                           wizard_views.SessionWizardView):
+    """Imports a single package with its requirements.
+
+    Unlike bundles, packages are always imported within the request, even
+    if ``MURANO_ASYNC_PACKAGE_IMPORT`` is enabled. The 'modify' and
+    'add_category' steps are built from the package the 'upload' step
+    uploaded, and :meth:`done` publishes the requirements and images that
+    step uploaded, so the wizard could not go on before the import is over
+    and gains nothing from running it in a job.
+    """
+
     file_storage = storage.FileSystemStorage(location=consts.CACHE_DIR)
     template_name = 'packages/upload.html'
     condition_dict = {'add_category': is_app}
@@ -355,6 +444,7 @@ class ImportPackageWizard(horizon_views.PageTitleMixin, views.ModalFormMixin,
         for dep_pkg in dep_pkgs:
             try:
                 murano_client.packages.update(dep_pkg.id, dep_data)
+                pkg_api.invalidate_cache(dep_pkg.id)
                 LOG.debug('Success update for package {0}.'.format(dep_pkg.id))
             except Exception as e:
                 msg = _("Couldn't update package {0} parameters. Error: {1}")\
@@ -392,6 +482,7 @@ class ImportPackageWizard(horizon_views.PageTitleMixin, views.ModalFormMixin,
         try:
             data['tags'] = [t.strip() for t in data['tags'].split(',')]
             murano_client.packages.update(app_id, data)
+            pkg_api.invalidate_cache(app_id)
         except exc.HTTPForbidden:
             msg = _("You are not allowed to change"
                     " this properties of the package")
@@ -484,6 +575,7 @@ class ImportPackageWizard(horizon_views.PageTitleMixin, views.ModalFormMixin,
                     files = {dep_name: dep_package.file()}
                     package = api.muranoclient(self.request).packages.create(
                         data, files)
+                    pkg_api.invalidate_cache(package.id)
                     messages.success(
                         self.request,
                         _('Package {0} uploaded').format(dep_name)
@@ -511,6 +603,7 @@ class ImportPackageWizard(horizon_views.PageTitleMixin, views.ModalFormMixin,
                 files = {name: original_package.file()}
                 package = api.muranoclient(self.request).packages.create(
                     data, files)
+                pkg_api.invalidate_cache(package.id)
                 messages.success(self.request,
                                  _('Package {0} uploaded').format(name))
                 _update_latest_apps(request=self.request, app_id=package.id)
@@ -598,6 +691,46 @@ class DetailView(horizon_views.HorizonTemplateView):
         return app
 
 
+class ImportProgressView(horizon_views.HorizonTemplateView):
+    template_name = 'packages/import_progress.html'
+    page_title = _("Import Progress")
+
+    def get_context_data(self, **kwargs):
+        context = super(ImportProgressView, self).get_context_data(**kwargs)
+        job = jobs.get(self.request, self.kwargs['job_id'])
+        if job is None:
+            raise http.Http404(_('Import job not found.'))
+        context['job'] = job.to_dict()
+        return context
+
+
+def get_import_job(request, job_id):
+    """Returns the state of the import job as JSON.
+
+    States of images still being created are looked up in glance, messages
+    and uploaded applications the job collected since the previous poll are
+    moved to the request. The job could be run by any dashboard process.
+    """
+    job = jobs.get(request, job_id)
+    if job is None:
+        raise http.Http404(_('Import job not found.'))
+
+    for image_id in job.get_pending_images():
+        try:
+            job.set_image_state(image_id,
+                                glance.image_get(request, image_id).status)
+        except Exception as e:
+            LOG.warning('Can not get state of image {0}: {1}'.format(
+                image_id, e))
+    for level, text in job.pop_messages():
+        getattr(messages, level)(request, text)
+    for app_id in job.pop_apps():
+        _update_latest_apps(request=request, app_id=app_id)
+    job.save()
+    return http.HttpResponse(json.dumps(job.to_dict(), sort_keys=True),
+                             content_type='application/json')
+
+
 def download_packge(request, app_name, app_id):
     try:
         body = api.muranoclient(request).packages.download(app_id)
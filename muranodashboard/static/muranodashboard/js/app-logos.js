@@ -0,0 +1,73 @@
+/*
+    Licensed under the Apache License, Version 2.0 (the "License"); you may
+    not use this file except in compliance with the License. You may obtain
+    a copy of the License at
+
+         http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+    License for the specific language governing permissions and limitations
+    under the License.
+*/
+$(function() {
+  "use strict";
+
+  // Maximum number of logos the server returns at once
+  var batchSize = 100;
+  // Data URIs (or URLs of the default icon) of logos by application id
+  var logos = {};
+
+  function load(url, appIds, callback) {
+    var missing = $.grep(appIds, function(appId, index) {
+      return !logos.hasOwnProperty(appId) && $.inArray(appId, appIds) === index;
+    });
+    var pending = Math.ceil(missing.length / batchSize);
+    if (pending === 0) {
+      callback(logos);
+      return;
+    }
+    for (var i = 0; i < missing.length; i += batchSize) {
+      $.getJSON(url, {ids: missing.slice(i, i + batchSize).join(',')})
+        .done(function(data) {
+          $.extend(logos, data);
+        })
+        .always(function() {
+          pending -= 1;
+          if (pending === 0) {
+            callback(logos);
+          }
+        });
+    }
+  }
+
+  // Images with "data-app-logo" attribute get logos of all the applications
+  // at once, replacing the placeholder in "src". The ones missing in the
+  // response are loaded from "data-src".
+  function apply(container) {
+    var $images = $(container).find('img[data-app-logo]');
+    if ($images.length === 0) {
+      return;
+    }
+    var appIds = $images.map(function() {
+      return $(this).attr('data-app-logo');
+    }).get();
+    load($images.first().attr('data-logos-url'), appIds, function() {
+      $images.each(function() {
+        var $image = $(this);
+        $image.attr('src', logos[$image.attr('data-app-logo')] ||
+                           $image.attr('data-src'));
+        $image.removeAttr('data-app-logo');
+      });
+    });
+  }
+
+  horizon.muranoAppLogos = {
+    load: load,
+    apply: apply
+  };
+
+  horizon.modals.addModalInitFunction(apply);
+  apply(document);
+});
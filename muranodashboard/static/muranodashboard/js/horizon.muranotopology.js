@@ -90,6 +90,7 @@ $(function() {
           return d.image_size;
         })
         .attr("clip-path", "url(#clipCircle)");
+      loadLogos(nodeEnter.select("image"));
       node.exit().remove();
 
       link.enter().insert("path", "g.node")
@@ -110,6 +111,34 @@ $(function() {
       force.start();
     }
 
+    // Replaces links to logos of applications with logos obtained at once
+    function loadLogos(images) {
+      var $container = $(muranoContainer);
+      var imagesUrl = $container.data('images_url');
+      if (!horizon.muranoAppLogos || !imagesUrl) {
+        return;
+      }
+      var getAppId = function(d) {
+        var appId = '';
+        if (d.image && d.image.indexOf(imagesUrl) === 0) {
+          appId = d.image.substr(imagesUrl.length);
+        }
+        return appId;
+      };
+      var appIds = [];
+      images.each(function(d) {
+        var appId = getAppId(d);
+        if (appId) {
+          appIds.push(appId);
+        }
+      });
+      horizon.muranoAppLogos.load($container.data('logos_url'), appIds, function(logos) {
+        images.attr("xlink:href", function(d) {
+          return logos[getAppId(d)] || d.image;
+        });
+      });
+    }
+
     function drawLink(d) {
       return "M" + d.source.x + "," + d.source.y + "L" + d.target.x + "," + d.target.y;
     }
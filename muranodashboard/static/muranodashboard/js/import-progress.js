@@ -0,0 +1,64 @@
+/*
+    Licensed under the Apache License, Version 2.0 (the "License"); you may
+    not use this file except in compliance with the License. You may obtain
+    a copy of the License at
+
+         http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+    License for the specific language governing permissions and limitations
+    under the License.
+*/
+$(function() {
+  "use strict";
+
+  // Milliseconds between polls of a running import job
+  var pollInterval = 2000;
+
+  function renderRows($body, items, fields) {
+    $body.empty();
+    $.each(items, function(index, item) {
+      var $row = $('<tr>');
+      $.each(fields, function(index, field) {
+        $row.append($('<td>').text(item[field] || ''));
+      });
+      $body.append($row);
+    });
+  }
+
+  // Containers with "data-status-url" attribute are refreshed with the state
+  // of the job until it is not running any more. Messages the job collected
+  // come with the responses and are shown by horizon.
+  function poll($container) {
+    $.getJSON($container.attr('data-status-url'))
+      .done(function(job) {
+        renderRows($container.find('.murano-import-packages'), job.packages,
+                   ['name', 'state', 'details']);
+        renderRows($container.find('.murano-import-images'), job.images,
+                   ['name', 'package', 'state']);
+        $container.attr('data-state', job.state);
+        $container.find('.murano-import-state').text(
+          interpolate(gettext('Import is %s.'), [job.state]));
+        if (job.state === 'running' || job.images.some(function(image) {
+          return $.inArray(image.state, ['active', 'killed', 'deleted']) < 0;
+        })) {
+          setTimeout(function() { poll($container); }, pollInterval);
+        }
+      })
+      .fail(function(xhr) {
+        // polling stops, the job is gone (404) or the dashboard is failing
+        var msg = xhr.status === 404 ?
+          gettext('The import job is not found, it may have expired.') :
+          gettext('Unable to get the state of the import.');
+        $container.attr('data-state', 'unknown');
+        $container.find('.murano-import-state').text(msg);
+        horizon.alert('error', msg);
+      });
+  }
+
+  $('.murano-import-progress[data-status-url]').each(function() {
+    poll($(this));
+  });
+});
@@ -71,3 +71,12 @@ LOGGING = {
         },
     }
 }
+
+# Disable process-level caches, so that tests could not affect each other
+MURANO_RESOURCES_CACHE_TTL = 0
+MURANO_QUOTA_USAGES_CACHE_TTL = 0
+MURANO_PROJECT_NAMES_CACHE_TTL = 0
+MURANO_IMAGE_INDEX_TTL = 0
+MURANO_CATALOG_INDEX_TTL = 0
+MURANO_CATEGORIES_CACHE_TTL = 0
+MURANO_APP_CACHE = {'MEMORY_MAX_SIZE': 0}
@@ -13,7 +13,11 @@
 # under the License.
 
 import collections
+import contextlib
+import functools
+import json
 import mock
+import threading
 import unittest
 
 from django.conf import settings
@@ -53,11 +57,15 @@ class TestCatalogViews(unittest.TestCase):
         self.assertIsNotNone(views.get_environments_context(self.mock_request))
         mock_env_api.environments_list.assert_called_with(self.mock_request)
 
+    @mock.patch.object(views, 'categories_api')
     @mock.patch.object(views, 'api')
-    def test_get_categories_list(self, mock_api):
-        self.assertEqual([], views.get_categories_list(self.mock_request))
+    def test_get_categories_list(self, mock_api, mock_categories_api):
+        mock_categories_api.category_list.return_value = ['foo']
+        self.assertEqual(['foo'],
+                         views.get_categories_list(self.mock_request))
         mock_api.handled_exceptions.assert_called_once_with(self.mock_request)
-        mock_api.muranoclient.assert_called_once_with(self.mock_request)
+        mock_categories_api.category_list.assert_called_once_with(
+            self.mock_request)
 
     @mock.patch.object(views, 'env_api')
     def test_create_quick_environment(self, mock_env_api):
@@ -67,43 +75,104 @@ class TestCatalogViews(unittest.TestCase):
     @mock.patch.object(views, 'pkg_api')
     def test_get_image(self, mock_pkg_api):
         app_id = 13
+        self.mock_request.configure_mock(method='GET', META={}, GET={})
+        mock_pkg_api.get_app_logo.return_value = b'foo'
         result = views.get_image(self.mock_request, app_id)
         self.assertIsInstance(result, http.HttpResponse)
+        self.assertEqual(b'foo', result.content)
+        self.assertIn('max-age', result['Cache-Control'])
+        self.assertTrue(result.has_header('ETag'))
         (mock_pkg_api.get_app_logo.
-         assert_called_once_with(self.mock_request, app_id))
+         assert_called_once_with(self.mock_request, app_id, size=None))
         mock_pkg_api.reset_mock()
 
         mock_pkg_api.get_app_logo.return_value = None
         result = views.get_image(self.mock_request, app_id)
         self.assertIsInstance(result, http.HttpResponseRedirect)
+        self.assertIn('max-age', result['Cache-Control'])
         (mock_pkg_api.get_app_logo.
-         assert_called_once_with(self.mock_request, app_id))
+         assert_called_once_with(self.mock_request, app_id, size=None))
+
+    @mock.patch.object(views, 'pkg_api')
+    def test_get_image_not_modified(self, mock_pkg_api):
+        self.mock_request.configure_mock(method='GET', META={}, GET={})
+        mock_pkg_api.get_app_logo.return_value = b'foo'
+        etag = views.get_image(self.mock_request, 13)['ETag']
+
+        self.mock_request.META['HTTP_IF_NONE_MATCH'] = etag
+        result = views.get_image(self.mock_request, 13)
+        self.assertEqual(304, result.status_code)
+        self.assertEqual(etag, result['ETag'])
+
+        mock_pkg_api.get_app_logo.return_value = b'bar'
+        result = views.get_image(self.mock_request, 13)
+        self.assertEqual(200, result.status_code)
+        self.assertNotEqual(etag, result['ETag'])
+
+    @mock.patch.object(views, 'pkg_api')
+    def test_get_images(self, mock_pkg_api):
+        logos = {'foo_app_id': b'foo', 'bar_app_id': None,
+                 'big_app_id': b'x' * (views.LOGO_BATCH_INLINE_MAX_SIZE + 1)}
+
+        def get_app_logo(request, app_id, size):
+            self.assertEqual('140', size)
+            if app_id == 'baz_app_id':
+                raise exc.HTTPForbidden()
+            return logos[app_id]
+
+        mock_pkg_api.get_app_logo.side_effect = get_app_logo
+        self.mock_request.configure_mock(method='GET', META={}, GET={
+            'ids': 'foo_app_id,bar_app_id,baz_app_id,big_app_id,foo_app_id',
+            'size': '140'})
+
+        result = views.get_images(self.mock_request)
+
+        self.assertEqual(200, result.status_code)
+        self.assertTrue(result.has_header('ETag'))
+        data = json.loads(result.content.decode('utf-8'))
+        self.assertEqual(['bar_app_id', 'foo_app_id'], sorted(data))
+        self.assertEqual('data:image/png;base64,Zm9v', data['foo_app_id'])
+        self.assertIn('muranodashboard/images/icon.png', data['bar_app_id'])
+        self.assertEqual(4, mock_pkg_api.get_app_logo.call_count)
+
+    def test_get_images_too_many(self):
+        ids = ','.join(str(i) for i in range(views.LOGO_BATCH_LIMIT + 1))
+        self.mock_request.configure_mock(method='GET', META={},
+                                         GET={'ids': ids})
+
+        result = views.get_images(self.mock_request)
+
+        self.assertEqual(400, result.status_code)
 
     @mock.patch.object(views, 'pkg_api')
     def test_get_supplier_image(self, mock_pkg_api):
         app_id = 13
+        self.mock_request.configure_mock(method='GET', META={}, GET={})
+        mock_pkg_api.get_app_supplier_logo.return_value = b'foo'
         result = views.get_supplier_image(self.mock_request, app_id)
         self.assertIsInstance(result, http.HttpResponse)
+        self.assertTrue(result.has_header('ETag'))
         (mock_pkg_api.get_app_supplier_logo.
-         assert_called_once_with(self.mock_request, app_id))
+         assert_called_once_with(self.mock_request, app_id, size=None))
         mock_pkg_api.reset_mock()
 
         mock_pkg_api.get_app_supplier_logo.return_value = None
         result = views.get_supplier_image(self.mock_request, app_id)
         self.assertIsInstance(result, http.HttpResponseRedirect)
         (mock_pkg_api.get_app_supplier_logo.
-         assert_called_once_with(self.mock_request, app_id))
+         assert_called_once_with(self.mock_request, app_id, size=None))
 
     @mock.patch.object(views, 'pkg_api')
-    @mock.patch('muranodashboard.dynamic_ui.services.version')
     @mock.patch('muranodashboard.dynamic_ui.services.pkg_api')
-    def test_quick_deploy_error(self, services_pkg_api,
-                                mock_version, views_pkg_api):
-        mock_version.check_version.return_value = '0.2'
+    def test_quick_deploy_error(self, services_pkg_api, views_pkg_api):
+        compiled_ui = services_pkg_api.get_compiled_app_ui.return_value
+        compiled_ui.version = '2.4'
+        compiled_ui.forms = ()
+        compiled_ui.get_sections.return_value = {}
         app_id = 'app_id'
         self.assertRaises(ValueError, views.quick_deploy,
                           self.mock_request, app_id=app_id)
-        (services_pkg_api.get_app_ui.
+        (services_pkg_api.get_compiled_app_ui.
          assert_called_once_with(self.mock_request, app_id))
         views_pkg_api.get_app_fqn.assert_called_with(self.mock_request, app_id)
 
@@ -156,8 +225,8 @@ class TestCatalogViews(unittest.TestCase):
 
     @mock.patch.object(views, 'api')
     def test_cleaned_latest_apps(self, mock_api):
-        foo_app = mock.Mock(id='foo_id')
-        bar_app = mock.Mock(id='bar_id')
+        foo_app = mock.Mock(id='foo_id', updated='2016-01-01T00:00:00')
+        bar_app = mock.Mock(id='bar_id', updated='2016-01-02T00:00:00')
         mock_api.muranoclient().packages.filter.return_value = [
             foo_app, bar_app
         ]
@@ -370,25 +439,24 @@ class TestWizard(unittest.TestCase):
             self.assertEqual(val, result[key])
 
     @mock.patch.object(
-        views, 'nova',
+        views, 'resources',
         mock.MagicMock(side_effect=views.nova_exceptions.ClientException))
     def test_get_flavors(self):
         result = self.wizard.get_flavors()
 
         self.assertEqual('[]', result)
-        views.nova.flavor_list.assert_called_once_with(self.wizard.request)
+        views.resources.flavor_list.assert_called_once_with(
+            self.wizard.request)
 
-    @mock.patch.object(views, 'nova')
-    @mock.patch.object(views, 'quotas')
+    @mock.patch.object(views, 'resources')
     @mock.patch.object(views, 'services')
     @mock.patch.object(views, 'api')
-    def test_get_context_data(self, mock_api, mock_services, mock_quotas,
-                              mock_nova):
+    def test_get_context_data(self, mock_api, mock_services, mock_resources):
         mock_api.muranoclient().environments.get().name = 'foo_env_name'
         mock_services.get_app_field_descriptions.return_value = [
             'foo_field_descr', 'foo_extended_descr'
         ]
-        mock_nova.flavor_list.return_value = [
+        mock_resources.flavor_list.return_value = [
             type('FakeFlavor%s' % k, (object, ),
                  {'id': 'fake_id_%s' % k, 'name': 'fake_name_%s' % k,
                   '_info': {'foo': 'bar'}})
@@ -429,17 +497,16 @@ class TestWizard(unittest.TestCase):
             'foo_env_id')
         mock_services.get_app_field_descriptions.assert_called_once_with(
             self.wizard.request, 'foo_app_id', 'foo_step_index')
-        mock_nova.flavor_list.assert_called_once_with(self.wizard.request)
+        mock_resources.flavor_list.assert_called_once_with(self.wizard.request)
 
-    @mock.patch.object(views, 'nova')
-    @mock.patch.object(views, 'quotas')
+    @mock.patch.object(views, 'resources')
     @mock.patch.object(views, 'env_api')
     @mock.patch.object(views, 'utils')
     @mock.patch.object(views, 'services')
     @mock.patch.object(views, 'api')
     def test_get_context_data_alternate_control_flow(
             self, mock_api, mock_services, mock_utils, mock_env_api,
-            mock_quatas, mock_nova):
+            mock_resources):
         form = mock.Mock()
         app = mock.Mock(fully_qualified_name='foo_app_fqn')
         app.configure_mock(name='foo_app')
@@ -451,7 +518,7 @@ class TestWizard(unittest.TestCase):
         ]
         mock_utils.ensure_python_obj.return_value = None
         mock_env_api.environments_list.return_value = []
-        mock_nova.flavor_list.return_value = [
+        mock_resources.flavor_list.return_value = [
             type('FakeFlavor%s' % k, (object, ),
                  {'id': 'fake_id_%s' % k, 'name': 'fake_name_%s' % k,
                   '_info': {'foo': 'bar'}})
@@ -489,7 +556,89 @@ class TestWizard(unittest.TestCase):
         mock_api.muranoclient().environments.get.assert_called_once_with()
         mock_services.get_app_field_descriptions.assert_called_once_with(
             self.wizard.request, 'foo_app_id', 'foo_step_index')
-        mock_nova.flavor_list.assert_called_once_with(self.wizard.request)
+        mock_resources.flavor_list.assert_called_once_with(self.wizard.request)
+
+    @mock.patch.object(views, 'resources')
+    @mock.patch.object(views, 'services')
+    @mock.patch.object(views, 'api')
+    def test_get_context_data_wizard_cache(self, mock_api, mock_services,
+                                           mock_resources):
+        mock_api.muranoclient().environments.get().name = 'foo_env_name'
+        mock_services.get_app_field_descriptions.return_value = [
+            'foo_field_descr', 'foo_extended_descr'
+        ]
+        mock_resources.flavor_list.return_value = []
+        mock_resources.quota_usages.return_value = {}
+        mock_api.muranoclient().environments.get.reset_mock()
+
+        form = mock.Mock(region=None)
+        self.wizard.request.GET = {}
+        self.wizard.request.POST = {'wizard_id': 'foo_wizard_id'}
+        self.wizard.storage.extra_data = {
+            'app': mock.Mock(),
+            'step_usages': [collections.defaultdict(dict) for step in range(3)]
+        }
+        self.wizard.steps = mock.Mock(index=0, step0=0, current='0',
+                                      last='1')
+        self.wizard.steps.all = ['0', '1']
+        self.wizard.prefix = 'foo_prefix'
+
+        self.wizard.get_context_data(form)
+        self.wizard.get_context_data(form)
+
+        mock_api.muranoclient().environments.get.assert_called_once_with(
+            'foo_env_id')
+        mock_services.get_app_field_descriptions.assert_called_once_with(
+            self.wizard.request, 'foo_app_id', 0)
+        mock_resources.flavor_list.assert_called_once_with(
+            self.wizard.request)
+        mock_resources.quota_usages.assert_called_once_with(
+            self.wizard.request)
+
+        # data which may change is requested again on the last step
+        self.wizard.steps.current = '1'
+        self.wizard.get_context_data(form)
+
+        self.assertEqual(
+            2, mock_api.muranoclient().environments.get.call_count)
+        self.assertEqual(2, mock_resources.flavor_list.call_count)
+        self.assertEqual(2, mock_resources.quota_usages.call_count)
+        mock_resources.invalidate.assert_called_once_with(
+            self.wizard.request, mock_resources.QUOTA_USAGES)
+        mock_services.get_app_field_descriptions.assert_called_once_with(
+            self.wizard.request, 'foo_app_id', 0)
+
+    def test_get_usage_totals(self):
+        step_usages = [collections.defaultdict(dict) for step in range(3)]
+        step_usages[0]['foo_region'] = {'ram': 1, 'vcpus': 1}
+        step_usages[1]['foo_region'] = {'ram': 2, 'instances': 1}
+        step_usages[2]['bar_region'] = {'ram': 4}
+        self.wizard.storage.extra_data = {'step_usages': step_usages}
+
+        totals = self.wizard.get_usage_totals(2)
+
+        self.assertEqual({'ram': 3, 'vcpus': 1, 'instances': 1},
+                         totals['foo_region'])
+        self.assertEqual({'ram': 4}, totals['bar_region'])
+        self.assertEqual(
+            3, len(self.wizard.storage.extra_data['usage_totals']))
+
+    @mock.patch.object(views.LazyWizard, 'process_step')
+    def test_process_step_drops_usage_totals(self, mock_process_step):
+        step_usages = [collections.defaultdict(dict) for step in range(3)]
+        step_usages[0]['foo_region'] = {'ram': 1}
+        self.wizard.storage.extra_data = {'step_usages': step_usages}
+        self.wizard.steps = mock.Mock(step0=0)
+        self.assertEqual({'ram': 1},
+                         self.wizard.get_usage_totals(2)['foo_region'])
+
+        form = mock.Mock(region='foo_region', cleaned_data={})
+        self.wizard.process_step(form)
+
+        self.assertEqual(
+            1, len(self.wizard.storage.extra_data['usage_totals']))
+        self.assertEqual({'ram': 1, 'vcpus': 0, 'instances': 0},
+                         self.wizard.get_usage_totals(2)['foo_region'])
 
 
 class TestIndexView(unittest.TestCase):
@@ -502,7 +651,7 @@ class TestIndexView(unittest.TestCase):
         self.assertEqual(_("Browse"), self.index_view.page_title)
         self.assertIsNone(self.index_view._more)
 
-        self.index_view.request = mock.Mock()
+        self.index_view.request = mock.Mock(session={})
         self.index_view.request.GET = {
             'category': 'foo_category',
             'search': 'foo_search',
@@ -555,6 +704,24 @@ class TestIndexView(unittest.TestCase):
             marker='foo_marker', page_size=123, sort_dir='desc',
             limit=123)
 
+    @mock.patch.object(views, 'catalog_index')
+    @mock.patch.object(views, 'pkg_api')
+    def test_get_queryset_from_catalog_index(self, mock_pkg_api,
+                                             mock_catalog_index):
+        mock_catalog_index.is_supported.return_value = True
+        mock_catalog_index.package_list.return_value = (
+            ['bar_pkg', 'foo_pkg'], True)
+
+        self.index_view.paginate_by = 123
+        packages = self.index_view.get_queryset()
+
+        self.assertEqual(['foo_pkg', 'bar_pkg'], packages)
+        self.assertTrue(self.index_view._more)
+        mock_catalog_index.package_list.assert_called_once_with(
+            self.index_view.request, mock.ANY, marker='foo_marker',
+            page_size=123)
+        self.assertFalse(mock_pkg_api.package_list.called)
+
     def test_get_template_names(self):
         self.assertEqual(['catalog/index.html'],
                          self.index_view.get_template_names())
@@ -565,16 +732,14 @@ class TestIndexView(unittest.TestCase):
         self.assertFalse(self.index_view.has_next_page())
 
     @mock.patch.object(views, 'pkg_api')
-    def test_has_next_page_with_api_query(self, mock_pkg_api):
-        mock_pkg_api.package_list.return_value = (['foo'], False)
+    def test_has_next_page_backward(self, mock_pkg_api):
+        self.index_view._more = False
 
-        self.index_view.get_marker = lambda: 'foo_marker'
-        result = self.index_view.has_next_page()
+        self.assertTrue(self.index_view.has_next_page())
+        self.assertFalse(mock_pkg_api.package_list.called)
 
-        self.assertTrue(result)
-        mock_pkg_api.package_list.assert_called_once_with(
-            self.index_view.request, filters=mock.ANY, paginate=True,
-            marker='foo_marker', page_size=1)
+        self.index_view.request.GET = {'sort_dir': 'desc'}
+        self.assertFalse(self.index_view.has_next_page())
 
     def test_has_prev_page(self):
         self.index_view._more = False
@@ -629,23 +794,26 @@ class TestIndexView(unittest.TestCase):
         self.assertEqual(sorted(expected), sorted(result_parts))
 
     @mock.patch.object(views, 'reverse')
-    @mock.patch.object(views, 'get_environments_context')
-    @mock.patch.object(views, 'cleaned_latest_apps')
-    @mock.patch.object(views, 'get_categories_list')
-    def test_get_context_data(self, mock_get_categories_list,
-                              mock_cleaned_latest_apps,
-                              mock_get_environments_context, mock_reverse):
-        mock_get_categories_list.return_value = [
+    @mock.patch.object(views, 'get_available_environments')
+    @mock.patch.object(views, 'list_latest_apps')
+    @mock.patch.object(views, 'list_categories')
+    def test_get_context_data(self, mock_list_categories,
+                              mock_list_latest_apps,
+                              mock_get_available_environments, mock_reverse):
+        mock_list_categories.return_value = [
             'foo_category', 'bar_category'
         ]
-        mock_cleaned_latest_apps.return_value = ['foo_app', 'bar_app']
-        mock_get_environments_context.return_value = {}
+        foo_app = mock.Mock(id='foo_app_id')
+        mock_list_latest_apps.return_value = [foo_app]
+        mock_get_available_environments.return_value = []
         mock_reverse.return_value = 'foo_url'
         mock_token = mock.Mock(tenant={'id': 'foo_tenant_id'})
 
         setattr(settings, 'MURANO_USE_GLARE', True)
 
-        self.index_view.request.session = {'token': mock_token}
+        self.index_view.request.session = {'token': mock_token,
+                                           'latest_apps': ['foo_app_id',
+                                                           'bar_app_id']}
         self.index_view.object_list = []
         context_data = self.index_view.get_context_data()
 
@@ -656,7 +824,7 @@ class TestIndexView(unittest.TestCase):
             'current_category': 'foo_category',
             'display_repo_url': 'http://apps.openstack.org/#tab=murano-apps',
             'is_paginated': None,
-            'latest_list': ['foo_app', 'bar_app'],
+            'latest_list': [foo_app],
             'no_apps': False,
             'object_list': [],
             'page_obj': None,
@@ -664,13 +832,153 @@ class TestIndexView(unittest.TestCase):
             'pkg_def_url': 'foo_url',
             'search': 'foo_search',
             'tenant_id': 'foo_tenant_id',
-            'view': self.index_view
+            'view': self.index_view,
+            'available_environments': []
         }
 
         for key, val in expected.items():
             self.assertEqual(val, context_data[key])
         mock_reverse.assert_called_once_with(
             'horizon:app-catalog:packages:index')
+        mock_list_latest_apps.assert_called_once_with(
+            self.index_view.request, ['foo_app_id', 'bar_app_id'])
+        self.assertEqual(collections.deque(['foo_app_id']),
+                         self.index_view.request.session['latest_apps'])
+
+    @mock.patch.object(views, 'get_available_environments')
+    @mock.patch.object(views, 'list_latest_apps')
+    @mock.patch.object(views, 'list_categories')
+    def test_fetch_parts(self, mock_list_categories, mock_list_latest_apps,
+                         mock_get_available_environments):
+        mock_list_categories.return_value = ['foo_category']
+        mock_list_latest_apps.side_effect = ValueError()
+        self.index_view.list_page = mock.Mock(
+            return_value=(['foo_pkg', 'bar_pkg'], True))
+
+        parts = self.index_view.fetch_parts()
+
+        self.assertEqual(['packages', 'categories', 'latest_apps',
+                          'environments'], list(parts))
+        self.assertEqual(['bar_pkg', 'foo_pkg'],
+                         self.index_view.get_queryset())
+        self.assertTrue(self.index_view._more)
+        self.assertEqual(['foo_category'],
+                         self.index_view.get_part('categories'))
+        self.assertRaises(ValueError, self.index_view.get_part,
+                          'latest_apps')
+        self.assertNotIn('latest_apps', self.index_view.request.session)
+        self.index_view.list_page.assert_called_once_with()
+        mock_list_categories.assert_called_once_with(
+            self.index_view.request)
+        mock_get_available_environments.assert_called_once_with(
+            self.index_view.request)
+
+    @mock.patch.object(views, 'list_categories')
+    def test_fetch_parts_handles_errors_in_request_thread(
+            self, mock_list_categories):
+        handled_in = []
+
+        @contextlib.contextmanager
+        def handled_exceptions(request):
+            handled_in.append(threading.current_thread())
+            try:
+                yield
+            except exc.HTTPForbidden:
+                pass
+
+        mock_list_categories.side_effect = exc.HTTPForbidden()
+        self.index_view.get_part_getters = mock.Mock(
+            return_value=collections.OrderedDict([
+                ('packages', lambda: ([], False)),
+                ('categories', functools.partial(mock_list_categories,
+                                                 self.index_view.request))]))
+
+        with mock.patch.object(views.api, 'handled_exceptions',
+                               handled_exceptions):
+            self.index_view.fetch_parts()
+            self.assertEqual([], handled_in)
+
+            self.assertEqual([], self.index_view.get_part('categories'))
+            self.assertEqual([], self.index_view.get_part('categories'))
+
+        self.assertEqual([threading.current_thread()], handled_in)
+
+    @mock.patch.object(views, 'list_categories')
+    def test_get_part_not_fetched(self, mock_list_categories):
+        mock_list_categories.return_value = ['foo_category']
+
+        self.assertEqual(['foo_category'],
+                         self.index_view.get_part('categories'))
+
+
+class TestBootstrapView(unittest.TestCase):
+
+    def setUp(self):
+        super(TestBootstrapView, self).setUp()
+        self.view = views.BootstrapView()
+        self.view.request = mock.Mock(GET={}, session={})
+        self.view.kwargs = {}
+
+        for name in ('list_categories', 'list_latest_apps',
+                     'get_available_environments', 'reverse'):
+            patcher = mock.patch.object(views, name)
+            setattr(self, 'mock_' + name, patcher.start())
+            self.addCleanup(patcher.stop)
+        self.mock_reverse.return_value = 'foo_url'
+
+        self.package = mock.Mock(id='foo_app_id', categories=['foo_category'],
+                                 tags=[], is_public=True, enabled=True,
+                                 owner_id='foo_tenant_id',
+                                 fully_qualified_name='io.foo',
+                                 description='foo', author='bar',
+                                 updated='2016-01-01T00:00:00')
+        self.package.configure_mock(name='foo')
+        category = mock.Mock(id='foo_category_id', package_count=1)
+        category.configure_mock(name='foo_category')
+        environment = views.DictToObj(id='foo_env_id', name='foo_env',
+                                      status='ready')
+
+        self.view.list_page = mock.Mock(return_value=([self.package], True))
+        self.mock_list_categories.return_value = [category]
+        self.mock_list_latest_apps.return_value = [self.package]
+        self.mock_get_available_environments.return_value = [environment]
+
+    def test_get(self):
+        response = self.view.get(self.view.request)
+
+        self.assertEqual('application/json', response['Content-Type'])
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual([], data['errors'])
+        self.assertEqual(
+            ['categories', 'environments', 'latest_apps', 'packages'],
+            sorted(data['timings']))
+        self.assertEqual('foo_app_id', data['packages'][0]['id'])
+        self.assertEqual('foo', data['packages'][0]['name'])
+        self.assertEqual('foo_url', data['packages'][0]['logo_url'])
+        self.assertFalse(data['has_prev_page'])
+        self.assertTrue(data['has_next_page'])
+        self.assertEqual([{'id': 'foo_category_id', 'name': 'foo_category',
+                           'package_count': 1}], data['categories'])
+        self.assertEqual(['foo_app_id'],
+                         [app['id'] for app in data['latest_apps']])
+        self.assertEqual([{'id': 'foo_env_id', 'name': 'foo_env',
+                           'status': 'ready'}], data['environments'])
+        self.assertEqual('foo_env_id', data['environment'])
+        self.assertEqual(collections.deque(['foo_app_id']),
+                         self.view.request.session['latest_apps'])
+
+    def test_get_with_errors(self):
+        self.mock_list_categories.side_effect = exc.HTTPForbidden()
+        self.mock_list_latest_apps.side_effect = ValueError()
+
+        response = self.view.get(self.view.request)
+
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(['categories', 'latest_apps'], data['errors'])
+        self.assertIsNone(data['categories'])
+        self.assertIsNone(data['latest_apps'])
+        self.assertEqual(1, len(data['packages']))
+        self.assertNotIn('latest_apps', self.view.request.session)
 
 
 class TestAppDetailsView(unittest.TestCase):
@@ -0,0 +1,59 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+from django.test import utils as test_utils
+import mock
+import unittest
+
+from muranodashboard.api import categories
+
+
+class TestCategoriesAPI(unittest.TestCase):
+
+    def setUp(self):
+        super(TestCategoriesAPI, self).setUp()
+        override = test_utils.override_settings(
+            MURANO_CATEGORIES_CACHE_TTL=60)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(categories.CATEGORIES_CACHE.invalidate)
+
+        patcher = mock.patch.object(categories, 'api')
+        self.mock_api = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_client = self.mock_api.muranoclient.return_value
+
+        self.categories = [mock.Mock(package_count=0),
+                           mock.Mock(package_count=2),
+                           mock.Mock(package_count=1)]
+        for category, name in zip(self.categories, ('foo', 'bar', 'baz')):
+            category.configure_mock(name=name)
+        self.mock_client.categories.list.return_value = self.categories
+        self.mock_request = mock.Mock()
+        self.mock_request.user.services_region = 'RegionOne'
+
+    def test_category_list(self):
+        foo, bar, baz = self.categories
+
+        self.assertEqual([bar, baz, foo],
+                         categories.category_list(self.mock_request))
+        self.assertEqual([bar, baz, foo],
+                         categories.category_list(self.mock_request))
+        self.mock_client.categories.list.assert_called_once_with()
+
+    def test_invalidate_cache(self):
+        categories.category_list(self.mock_request)
+        categories.invalidate_cache()
+        categories.category_list(self.mock_request)
+
+        self.assertEqual(2, self.mock_client.categories.list.call_count)
@@ -0,0 +1,353 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import contextlib
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from django.test import utils as test_utils
+import mock
+
+from muranodashboard.common import cache
+from muranodashboard.common import utils
+
+
+class TestFileSystemBackend(unittest.TestCase):
+
+    def setUp(self):
+        super(TestFileSystemBackend, self).setUp()
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.backend = cache.FileSystemBackend(location=self.location)
+
+    def test_get_set(self):
+        self.assertIsNone(self.backend.get('foo_app_id', ('ui', 'ui.yaml')))
+
+        self.backend.set('foo_app_id', ('ui', 'ui.yaml'), {'foo': 'bar'})
+
+        self.assertEqual({'foo': 'bar'},
+                         self.backend.get('foo_app_id', ('ui', 'ui.yaml')))
+        self.assertTrue(os.path.isfile(os.path.join(
+            self.location, 'fo', 'o_app_id', 'ui', 'ui-pickled')))
+
+    def test_get_set_bytes(self):
+        self.backend.set('foo_app_id', ('logo', 'logo.png'), b'foo')
+
+        path = os.path.join(self.location, 'fo', 'o_app_id', 'logo', 'logo')
+        with open(path + '-raw', 'rb') as f:
+            self.assertEqual(b'foo', f.read())
+        self.assertEqual(b'foo', self.backend.get('foo_app_id',
+                                                  ('logo', 'logo.png')))
+
+        self.backend.set('foo_app_id', ('logo', 'logo.png'), {'foo': 'bar'})
+        self.assertFalse(os.path.exists(path + '-raw'))
+        self.assertEqual({'foo': 'bar'},
+                         self.backend.get('foo_app_id', ('logo', 'logo.png')))
+
+    def test_get_migrates_legacy_entries(self):
+        entry_path = os.path.join(self.location, 'fo', 'o_app_id')
+        os.makedirs(entry_path)
+        for name, content in (('ui', {'foo': 'bar'}), ('logo', b'foo')):
+            with open(os.path.join(entry_path, name + '-pickled'), 'wb') as f:
+                utils.CustomPickler(f).dump(content)
+
+        self.assertEqual({'foo': 'bar'}, self.backend.get('foo_app_id',
+                                                          ('ui',)))
+        self.assertEqual(b'foo', self.backend.get('foo_app_id', ('logo',)))
+
+        self.assertEqual(['logo-raw', 'ui-pickled'],
+                         sorted(os.listdir(entry_path)))
+        with open(os.path.join(entry_path, 'ui-pickled'), 'rb') as f:
+            self.assertTrue(f.read().startswith(cache.FORMAT_HEADER))
+        self.assertEqual({'foo': 'bar'}, self.backend.get('foo_app_id',
+                                                          ('ui',)))
+
+    def test_lru_eviction(self):
+        content = 'x' * 1000
+        self.backend.set('foo_app_id', ('logo',), content)
+        entry_size = os.path.getsize(os.path.join(
+            self.location, 'fo', 'o_app_id', 'logo-pickled'))
+        self.backend.max_size = entry_size * 2 + entry_size // 2
+
+        self.backend.set('bar_app_id', ('logo',), content)
+        # make bar the least recently used entry
+        path = os.path.join(self.location, 'ba', 'r_app_id', 'logo-pickled')
+        os.utime(path, (0, 0))
+        self.assertEqual(content, self.backend.get('foo_app_id', ('logo',)))
+        self.backend.set('baz_app_id', ('logo',), content)
+
+        self.assertIsNone(self.backend.get('bar_app_id', ('logo',)))
+        self.assertEqual(content, self.backend.get('foo_app_id', ('logo',)))
+        self.assertEqual(content, self.backend.get('baz_app_id', ('logo',)))
+
+    def test_delete(self):
+        self.backend.set('foo_app_id', ('logo',), 'foo')
+        self.backend.set('bar_app_id', ('logo',), 'bar')
+
+        self.backend.delete('foo_app_id')
+
+        self.assertIsNone(self.backend.get('foo_app_id', ('logo',)))
+        self.assertEqual('bar', self.backend.get('bar_app_id', ('logo',)))
+
+    def test_gc(self):
+        self.backend.set('foo_app_id', ('logo',), 'foo')
+        self.backend.set('bar_app_id', ('logo',), 'bar')
+
+        self.assertEqual(1, self.backend.gc(['bar_app_id']))
+
+        self.assertFalse(os.path.exists(os.path.join(self.location, 'fo')))
+        self.assertEqual('bar', self.backend.get('bar_app_id', ('logo',)))
+
+    def test_set_replaces_entry_atomically(self):
+        self.backend.set('foo_app_id', ('logo',), 'foo')
+
+        with mock.patch.object(cache.utils, 'CustomPickler') as mock_pickler:
+            mock_pickler.return_value.dump.side_effect = ValueError()
+            self.assertRaises(ValueError, self.backend.set,
+                              'foo_app_id', ('logo',), 'bar')
+
+        self.assertEqual('foo', self.backend.get('foo_app_id', ('logo',)))
+        self.assertEqual(['logo-pickled'], os.listdir(
+            os.path.join(self.location, 'fo', 'o_app_id')))
+
+    @mock.patch.object(cache.os, 'fsync')
+    def test_set_fsync(self, mock_fsync):
+        self.backend.set('foo_app_id', ('logo',), 'foo')
+        self.assertFalse(mock_fsync.called)
+
+        self.backend.fsync = True
+        self.backend.set('foo_app_id', ('logo',), 'foo')
+        self.assertTrue(mock_fsync.called)
+
+    @mock.patch.object(cache, 'lockutils')
+    def test_lock(self, mock_lockutils):
+        self.backend.lock('foo_app_id', ('logo',))
+        self.backend.lock('foo_app_id', ('logo',))
+
+        self.assertEqual(2, mock_lockutils.lock.call_count)
+        args_list = mock_lockutils.lock.call_args_list
+        self.assertEqual(args_list[0], args_list[1])
+        self.assertTrue(args_list[0][1]['external'])
+        self.assertEqual(self.location + '-locks',
+                         args_list[0][1]['lock_path'])
+
+        self.backend.single_flight = False
+        self.backend.lock('foo_app_id', ('logo',))
+        self.assertEqual(2, mock_lockutils.lock.call_count)
+
+    def test_get_entry(self):
+        self.assertEqual((None, None),
+                         self.backend.get_entry('foo_app_id', ('ui',)))
+
+        size = self.backend.set('foo_app_id', ('ui',), {'foo': 'bar'})
+
+        self.assertEqual(({'foo': 'bar'}, size),
+                         self.backend.get_entry('foo_app_id', ('ui',)))
+        self.assertEqual(size, os.path.getsize(os.path.join(
+            self.location, 'fo', 'o_app_id', 'ui' + cache.PICKLED_SUFFIX)))
+
+    @mock.patch.object(cache, '_save_to_file')
+    def test_set_entry_gone(self, mock_save_to_file):
+        # e.g. evicted by another process right away
+        self.assertIsNone(self.backend.set('foo_app_id', ('ui',), 'foo'))
+        self.assertTrue(mock_save_to_file.called)
+
+
+class TestDjangoCacheBackend(unittest.TestCase):
+
+    def setUp(self):
+        super(TestDjangoCacheBackend, self).setUp()
+        override = test_utils.override_settings(CACHES={
+            'murano': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'murano-apps-test'}})
+        override.enable()
+        self.addCleanup(override.disable)
+        self.backend = cache.DjangoCacheBackend(alias='murano')
+
+    def test_get_set_delete(self):
+        self.assertIsNone(self.backend.get('foo_app_id', ('ui',)))
+
+        self.backend.set('foo_app_id', ('ui',), {'foo': 'bar'})
+        self.assertEqual({'foo': 'bar'},
+                         self.backend.get('foo_app_id', ('ui',)))
+
+        self.assertEqual(
+            ({'foo': 'bar'}, len(cache._dumps({'foo': 'bar'}))),
+            self.backend.get_entry('foo_app_id', ('ui',)))
+
+        self.backend.delete('foo_app_id')
+        self.assertIsNone(self.backend.get('foo_app_id', ('ui',)))
+
+
+class TestWithCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestWithCache, self).setUp()
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        override = test_utils.override_settings(MURANO_APP_CACHE={
+            'BACKEND': 'muranodashboard.common.cache.FileSystemBackend',
+            'OPTIONS': {'location': self.location, 'max_size': 1024}})
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_get_backend(self):
+        backend = cache.get_backend()
+
+        self.assertIsInstance(backend, cache.FileSystemBackend)
+        self.assertEqual(self.location, backend.location)
+        self.assertEqual(1024, backend.max_size)
+        self.assertIs(backend, cache.get_backend())
+
+    def _make_cached_func(self, values):
+        calls = []
+
+        @cache.with_cache('foo')
+        def cached_func(request, app_id):
+            calls.append((request, app_id))
+            return values.pop(0)
+
+        return cached_func, calls
+
+    def test_with_cache(self):
+        cached_func, calls = self._make_cached_func(['foo', 'bar'])
+
+        self.assertEqual('foo', cached_func('request', 'foo_app_id'))
+        self.assertEqual('foo', cached_func('request', 'foo_app_id'))
+        self.assertEqual([('request', 'foo_app_id')], calls)
+
+    def test_with_cache_empty_value(self):
+        cached_func, calls = self._make_cached_func([None, 'foo'])
+
+        self.assertIsNone(cached_func('request', 'foo_app_id'))
+        self.assertEqual('foo', cached_func('request', 'foo_app_id'))
+        self.assertEqual(2, len(calls))
+
+    def test_with_cache_single_flight(self):
+        backend = cache.get_backend()
+
+        @cache.with_cache('foo')
+        def cached_func(request, app_id):
+            self.fail('The value should have been obtained by another '
+                      'process')
+
+        def lock(app_id, parts):
+            # emulate another process caching the value meanwhile
+            backend.set(app_id, parts, 'foo')
+            return cache._no_lock()
+
+        with mock.patch.object(backend, 'lock', side_effect=lock):
+            self.assertEqual('foo', cached_func('request', 'foo_app_id'))
+
+    def test_with_cache_memory_tier(self):
+        cached_func, calls = self._make_cached_func(['foo'])
+
+        with mock.patch.object(cache, '_load_from_file',
+                               wraps=cache._load_from_file) as mock_load:
+            self.assertEqual('foo', cached_func('request', 'foo_app_id'))
+            loads = mock_load.call_count
+            self.assertEqual('foo', cached_func('request', 'foo_app_id'))
+        self.assertEqual(loads, mock_load.call_count)
+
+        stats = cache.stats()
+        self.assertEqual(1, stats['memory']['hits'])
+        self.assertEqual(1, stats['memory']['misses'])
+        self.assertEqual(0, stats['backend']['hits'])
+        self.assertEqual(1, stats['backend']['misses'])
+
+    def test_with_cache_memory_tier_sized_by_backend(self):
+        cache.get_backend().set('foo_app_id', ('foo',), {'foo': 'bar'})
+        cached_func, calls = self._make_cached_func([])
+
+        with mock.patch.object(cache, '_dumps') as mock_dumps:
+            value = cached_func('request', 'foo_app_id')
+        # the value read from the backend is not serialized again
+        self.assertFalse(mock_dumps.called)
+        self.assertEqual({'foo': 'bar'}, value)
+        self.assertEqual([], calls)
+
+        # callers share the value, so they must not modify it
+        self.assertIs(value, cached_func('request', 'foo_app_id'))
+
+    def test_invalidate(self):
+        cached_func, calls = self._make_cached_func(['foo', 'bar'])
+        cached_func('request', 'foo_app_id')
+
+        cache.invalidate('foo_app_id')
+
+        self.assertEqual('bar', cached_func('request', 'foo_app_id'))
+        self.assertEqual(2, len(calls))
+
+    def test_validate(self):
+        cached_func, calls = self._make_cached_func(['foo', 'bar'])
+        cache.validate('foo_app_id', '2016-01-01T00:00:00')
+        cached_func('request', 'foo_app_id')
+
+        cache.validate('foo_app_id', '2016-01-01T00:00:00')
+        self.assertEqual('foo', cached_func('request', 'foo_app_id'))
+
+        cache.validate('foo_app_id', '2016-01-02T00:00:00')
+        self.assertEqual('bar', cached_func('request', 'foo_app_id'))
+        self.assertEqual(2, len(calls))
+
+    def test_with_cache_nested_calls_lock_once(self):
+        backend = cache.get_backend()
+
+        @cache.with_cache('bar')
+        def inner_func(request, app_id):
+            return 'bar'
+
+        @cache.with_cache('foo')
+        def outer_func(request, app_id):
+            return inner_func(request, app_id) * 2
+
+        with mock.patch.object(backend, 'lock',
+                               return_value=cache._no_lock()) as mock_lock:
+            self.assertEqual('barbar', outer_func('request', 'foo_app_id'))
+        mock_lock.assert_called_once_with('foo_app_id', ('foo',))
+        self.assertEqual('bar', inner_func('request', 'foo_app_id'))
+
+    @mock.patch.object(cache, 'LOCK_STRIPES', 1)
+    @mock.patch.object(cache, 'lockutils')
+    def test_with_cache_nested_calls_same_stripe(self, mock_lockutils):
+        stripes = collections.defaultdict(threading.Lock)
+
+        @contextlib.contextmanager
+        def lock(name, **kwargs):
+            # lockutils locks are not reentrant, waiting for a stripe held
+            # by the same thread would never end
+            self.assertTrue(stripes[name].acquire(False),
+                            'Lock {0} is held already'.format(name))
+            try:
+                yield
+            finally:
+                stripes[name].release()
+
+        mock_lockutils.lock.side_effect = lock
+
+        @cache.with_cache('ui')
+        def get_ui(request, app_id):
+            return 'foo'
+
+        @cache.with_cache('compiled')
+        def get_compiled_ui(request, app_id):
+            return get_ui(request, app_id).upper()
+
+        self.assertEqual('FOO', get_compiled_ui('request', 'foo_app_id'))
+        self.assertEqual(1, mock_lockutils.lock.call_count)
+        self.assertFalse(stripes['murano-app-cache-0'].locked())
+        self.assertEqual('foo', get_ui('request', 'foo_app_id'))
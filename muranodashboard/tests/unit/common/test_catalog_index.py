@@ -0,0 +1,151 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.test import utils as test_utils
+import mock
+import unittest
+
+from muranodashboard.common import catalog_index
+
+
+class TestCatalogIndex(unittest.TestCase):
+
+    def setUp(self):
+        super(TestCatalogIndex, self).setUp()
+        override = test_utils.override_settings(
+            MURANO_CATALOG_INDEX_TTL=30,
+            MURANO_CATALOG_INDEX_FULL_REFRESH=300)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.request = mock.Mock()
+        self.request.user.tenant_id = 'foo_tenant'
+        self.request.user.services_region = 'RegionOne'
+        catalog_index.clear()
+        self.addCleanup(catalog_index.clear)
+
+        self.client = mock.Mock()
+        patcher = mock.patch.object(catalog_index, 'api')
+        mock_api = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_api.muranoclient.return_value = self.client
+
+        patcher = mock.patch.object(catalog_index.time, 'time',
+                                    return_value=1000)
+        self.mock_time = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.packages = [
+            self._package('foo', 'Foo', created='2018-01-03',
+                          categories=['Web'], tags=['apache']),
+            self._package('bar', 'Bar', created='2018-01-01',
+                          description='Serves foo'),
+            self._package('baz', 'Baz', created='2018-01-02',
+                          categories=['Databases'])]
+        self.client.packages.filter.return_value = self.packages
+
+    def _package(self, package_id, name, created, **kwargs):
+        package = mock.Mock(id=package_id, fully_qualified_name='io.' + name,
+                            created=created, description='',
+                            categories=kwargs.get('categories', []),
+                            tags=kwargs.get('tags', []),
+                            class_definitions=[], author='')
+        package.configure_mock(name=name)
+        if 'description' in kwargs:
+            package.description = kwargs['description']
+        return package
+
+    def _list(self, marker=None, page_size=20, **filters):
+        filters.update(catalog_index.INDEX_FILTERS)
+        packages, more = catalog_index.package_list(
+            self.request, filters, marker=marker, page_size=page_size)
+        return [package.id for package in packages], more
+
+    def test_is_supported(self):
+        filters = {'type': 'Application', 'catalog': True, 'search': 'foo',
+                   'order_by': 'name', 'sort_dir': 'asc'}
+        self.assertTrue(catalog_index.is_supported(filters))
+        self.assertFalse(catalog_index.is_supported(
+            dict(filters, order_by='foo')))
+        self.assertFalse(catalog_index.is_supported(dict(filters, owned=True)))
+        self.assertFalse(catalog_index.is_supported(
+            {'type': 'Library', 'catalog': True}))
+        with test_utils.override_settings(MURANO_CATALOG_INDEX_TTL=0):
+            self.assertFalse(catalog_index.is_supported(filters))
+
+    def test_package_list(self):
+        self.assertEqual((['bar', 'baz', 'foo'], False), self._list())
+        self.assertEqual((['foo', 'baz'], True),
+                         self._list(sort_dir='desc', page_size=2))
+        self.assertEqual((['bar', 'baz', 'foo'], False),
+                         self._list(order_by='created'))
+        self.assertEqual((['foo'], False), self._list(category='Web'))
+        self.client.packages.filter.assert_called_once_with(
+            limit=100, type='Application', catalog=True)
+
+    def test_package_list_search(self):
+        # matches of the name come before matches of the description
+        self.assertEqual((['foo', 'bar'], False), self._list(search='FOO'))
+        self.assertEqual((['baz', 'foo'], False),
+                         self._list(search='apache;databases'))
+
+    def test_package_list_search_pages(self):
+        self.client.packages.filter.return_value = self.packages + [
+            self._package('qux', 'Qux', created='2018-01-04',
+                          description='Foo too'),
+            self._package('quux', 'Foobar', created='2018-01-05')]
+        pages = [self._list(search='foo', page_size=2)[0]]
+        while len(pages[-1]) == 2:
+            pages.append(self._list(search='foo', page_size=2,
+                                    marker=pages[-1][-1])[0])
+        self.assertEqual([['foo', 'quux'], ['bar', 'qux'], []], pages)
+
+        # the previous page is the same as the one walked through before
+        prev_page = self._list(search='foo', page_size=2, sort_dir='desc',
+                               marker='bar')[0]
+        self.assertEqual(['foo', 'quux'], list(reversed(prev_page)))
+        prev_page = self._list(search='foo', page_size=2, sort_dir='desc',
+                               marker='qux')[0]
+        self.assertEqual(['quux', 'bar'], list(reversed(prev_page)))
+
+    def test_package_list_marker(self):
+        self.assertEqual((['baz'], True), self._list(page_size=1,
+                                                     marker='bar'))
+        self.assertEqual((['bar'], False), self._list(sort_dir='desc',
+                                                      marker='baz'))
+        # the marker does not have to match the filters
+        self.assertEqual((['foo'], False), self._list(category='Web',
+                                                      marker='bar'))
+
+    def test_incremental_refresh(self):
+        self._list()
+        new_package = self._package('qux', 'Qux', created='2018-01-04')
+        self.client.packages.filter.return_value = [
+            new_package] + self.packages
+
+        self.mock_time.return_value = 1010
+        self.assertEqual(['bar', 'baz', 'foo'], self._list()[0])
+
+        self.mock_time.return_value = 1040
+        self.assertEqual(['bar', 'baz', 'foo', 'qux'], self._list()[0])
+        self.client.packages.filter.assert_called_with(
+            limit=100, order_by='created', sort_dir='desc',
+            type='Application', catalog=True)
+
+    def test_invalidate(self):
+        self._list()
+        self.client.packages.filter.return_value = self.packages[:1]
+
+        catalog_index.invalidate()
+
+        self.assertEqual(['foo'], self._list()[0])
+        self.client.packages.filter.assert_called_with(
+            limit=100, type='Application', catalog=True)
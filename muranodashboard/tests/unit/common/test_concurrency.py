@@ -0,0 +1,61 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import unittest
+
+from muranodashboard.common import concurrency
+
+
+class TestConcurrency(unittest.TestCase):
+
+    def test_run_concurrently_keeps_order(self):
+        functions = [lambda i=i: i * 2 for i in range(10)]
+
+        results = concurrency.run_concurrently(functions, 4)
+
+        self.assertEqual([i * 2 for i in range(10)],
+                         [result.get() for result in results])
+
+    def test_run_concurrently_uses_threads(self):
+        threads = set()
+
+        def func():
+            threads.add(threading.current_thread().ident)
+
+        concurrency.run_concurrently([func] * 4, 4)
+        self.assertNotIn(threading.current_thread().ident, threads)
+
+        threads.clear()
+        concurrency.run_concurrently([func] * 4, 0)
+        self.assertEqual(set([threading.current_thread().ident]), threads)
+
+    def test_run_concurrently_keeps_errors(self):
+        def fail():
+            raise ValueError('foo')
+
+        results = concurrency.run_concurrently([fail, lambda: 'bar'], 2)
+
+        self.assertTrue(results[0].failed)
+        self.assertRaises(ValueError, results[0].get)
+        self.assertFalse(results[1].failed)
+        self.assertEqual('bar', results[1].get())
+
+    def test_iter_concurrently(self):
+        release = threading.Event()
+        functions = [lambda: 'foo', release.wait]
+        results = concurrency.iter_concurrently(functions, 2)
+
+        self.assertEqual('foo', next(results).get())
+        release.set()
+        self.assertTrue(next(results).get())
+        self.assertRaises(StopIteration, next, results)
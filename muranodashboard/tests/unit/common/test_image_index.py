@@ -0,0 +1,158 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.test import utils as test_utils
+import mock
+import unittest
+
+from muranodashboard.common import image_index
+
+
+class TestImageIndex(unittest.TestCase):
+
+    def setUp(self):
+        super(TestImageIndex, self).setUp()
+        override = test_utils.override_settings(
+            MURANO_IMAGE_INDEX_TTL=30, MURANO_IMAGE_INDEX_FULL_REFRESH=300)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.request = mock.Mock()
+        self.request.user.tenant_id = 'foo_tenant'
+        self.request.user.services_region = 'RegionOne'
+        self.request.user.is_superuser = False
+        image_index.clear()
+        self.addCleanup(image_index.clear)
+
+        self.client = mock.Mock()
+        patcher = mock.patch.object(image_index, 'glance')
+        mock_glance = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_glance.glanceclient.return_value = self.client
+
+        patcher = mock.patch.object(image_index.time, 'time',
+                                    return_value=1000)
+        self.mock_time = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _image(self, image_id, info=None, updated_at='2018-01-01T00:00:00Z',
+               created_at='2018-01-01T00:00:00Z', **kwargs):
+        return mock.Mock(id=image_id, murano_image_info=info,
+                         updated_at=updated_at, created_at=created_at,
+                         image_type=kwargs.get('image_type'))
+
+    def test_get_images(self):
+        self.client.images.list.return_value = [
+            self._image('foo', '{"title": "Foo"}',
+                        created_at='2018-01-01T00:00:00Z'),
+            self._image('bar', '{"title": "Bar"}',
+                        created_at='2018-01-02T00:00:00Z'),
+            self._image('baz'),
+            self._image('snap', '{}', image_type='snapshot'),
+            self._image('qux', 'invalid')]
+
+        images = image_index.get_images(self.request)
+
+        self.assertEqual(['bar', 'qux', 'foo'],
+                         [image.id for image in images])
+        self.assertEqual({'title': 'Bar'}, images[0].murano_property)
+        self.assertEqual('Bar', images[0].title)
+        self.assertEqual('No Type', images[0].type)
+        self.assertIsNone(images[1].murano_property)
+        self.client.images.list.assert_called_once_with(
+            filters={}, page_size=image_index.PAGE_SIZE)
+
+        # the index is served until the TTL expires
+        image_index.get_images(self.request)
+        self.assertEqual(1, self.client.images.list.call_count)
+
+    def test_get_images_incremental_refresh(self):
+        self.client.images.list.return_value = [
+            self._image('foo', '{}', updated_at='2018-01-01T00:00:00Z'),
+            self._image('bar', '{}', updated_at='2018-01-02T00:00:00Z')]
+        image_index.get_images(self.request)
+
+        self.mock_time.return_value = 1100
+        self.client.images.list.return_value = [
+            self._image('foo', None, updated_at='2018-01-03T00:00:00Z'),
+            self._image('baz', '{}', updated_at='2018-01-03T00:00:00Z')]
+        images = image_index.get_images(self.request)
+
+        self.assertEqual(set(['bar', 'baz']),
+                         set(image.id for image in images))
+        self.client.images.list.assert_called_with(
+            filters={'updated_at': 'gte:2018-01-02T00:00:00Z'},
+            page_size=image_index.PAGE_SIZE)
+
+    def test_get_images_full_refresh(self):
+        self.client.images.list.return_value = [self._image('foo', '{}')]
+        image_index.get_images(self.request)
+
+        self.mock_time.return_value = 1300
+        self.client.images.list.return_value = []
+        self.assertEqual([], image_index.get_images(self.request))
+        self.client.images.list.assert_called_with(
+            filters={}, page_size=image_index.PAGE_SIZE)
+
+    def test_invalidate(self):
+        self.client.images.list.return_value = [self._image('foo', '{}')]
+        image_index.get_images(self.request)
+
+        image_index.invalidate()
+        image_index.get_images(self.request)
+        self.assertEqual(2, self.client.images.list.call_count)
+
+    def test_get_images_admin(self):
+        self.client.images.list.side_effect = [
+            [self._image('foo', '{}')],
+            [self._image('foo', '{}'), self._image('bar', '{}')]]
+        admin_request = mock.Mock()
+        admin_request.user.tenant_id = 'foo_tenant'
+        admin_request.user.services_region = 'RegionOne'
+        admin_request.user.is_superuser = True
+
+        self.assertEqual(['foo'], [image.id for image in
+                                   image_index.get_images(self.request)])
+        # private images of other projects listed to the admin are not
+        # shown to the other members of the project
+        self.assertEqual(2, len(image_index.get_images(admin_request)))
+        self.assertEqual(['foo'], [image.id for image in
+                                   image_index.get_images(self.request)])
+        self.assertEqual(2, self.client.images.list.call_count)
+
+    def test_get_images_indexes_bounded(self):
+        patcher = mock.patch.object(
+            image_index, '_INDEXES',
+            image_index.memory_cache.LRUCache('image_indexes', max_size=2))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.images.list.return_value = [self._image('foo', '{}')]
+
+        for tenant_id in ('foo_tenant', 'bar_tenant', 'baz_tenant'):
+            self.request.user.tenant_id = tenant_id
+            image_index.get_images(self.request)
+        self.assertEqual(2, image_index._INDEXES.size)
+
+        # the least recently used index was dropped
+        self.request.user.tenant_id = 'foo_tenant'
+        image_index.get_images(self.request)
+        self.assertEqual(4, self.client.images.list.call_count)
+
+    def test_get_images_index_disabled(self):
+        override = test_utils.override_settings(MURANO_IMAGE_INDEX_TTL=0)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.client.images.list.return_value = [self._image('foo', '{}')]
+
+        image_index.get_images(self.request)
+        image_index.get_images(self.request)
+        self.assertEqual(2, self.client.images.list.call_count)
+        self.assertEqual(0, image_index._INDEXES.size)
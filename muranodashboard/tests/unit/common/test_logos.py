@@ -0,0 +1,62 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import os
+import unittest
+
+import mock
+
+from muranodashboard.common import logos
+
+
+def _make_png(width, height, mode='RGBA'):
+    # noise does not compress, so the scaled logo is smaller for sure
+    image = logos.Image.frombytes(
+        mode, (width, height),
+        os.urandom(width * height * len(mode)))
+    data = io.BytesIO()
+    image.save(data, format='PNG')
+    return data.getvalue()
+
+
+class TestLogos(unittest.TestCase):
+
+    def test_get_size(self):
+        self.assertIsNone(logos.get_size(None))
+        self.assertIsNone(logos.get_size('foo'))
+        self.assertIsNone(logos.get_size(1000))
+        self.assertEqual(60, logos.get_size('10'))
+        self.assertEqual(140, logos.get_size(130))
+
+    @unittest.skipUnless(logos.can_scale(), 'Pillow is not installed')
+    def test_scale(self):
+        content = _make_png(1000, 500, mode='P')
+
+        scaled = logos.Image.open(io.BytesIO(logos.scale(content, 140)))
+
+        self.assertEqual((140, 70), scaled.size)
+        self.assertEqual('PNG', scaled.format)
+
+    @unittest.skipUnless(logos.can_scale(), 'Pillow is not installed')
+    def test_scale_small_logo(self):
+        content = _make_png(50, 50)
+        self.assertEqual(content, logos.scale(content, 140))
+
+    def test_scale_broken_logo(self):
+        self.assertEqual(b'foo', logos.scale(b'foo', 140))
+        self.assertIsNone(logos.scale(None, 140))
+
+    @mock.patch.object(logos, 'Image', None)
+    def test_scale_without_pillow(self):
+        self.assertFalse(logos.can_scale())
+        self.assertEqual(b'foo', logos.scale(b'foo', 140))
@@ -0,0 +1,173 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import unittest
+
+from muranodashboard.common import memory_cache
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestTTLCache, self).setUp()
+        self.cache = memory_cache.TTLCache('test', max_entries=2)
+
+    def test_get_or_create(self):
+        creator = mock.Mock(return_value='foo')
+
+        self.assertEqual('foo', self.cache.get_or_create('key', creator, 10))
+        self.assertEqual('foo', self.cache.get_or_create('key', creator, 10))
+        creator.assert_called_once_with()
+
+        stats = self.cache.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+
+    def test_get_or_create_disabled(self):
+        creator = mock.Mock(return_value='foo')
+
+        self.cache.get_or_create('key', creator, 0)
+        self.cache.get_or_create('key', creator, 0)
+        self.assertEqual(2, creator.call_count)
+        self.assertIsNone(self.cache.get('key'))
+
+    @mock.patch.object(memory_cache, 'time')
+    def test_expiration(self, mock_time):
+        mock_time.time.return_value = 100
+        self.cache.set('key', 'foo', 10)
+        self.assertEqual('foo', self.cache.get('key'))
+
+        mock_time.time.return_value = 111
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_exceptions_are_not_cached(self):
+        creator = mock.Mock(side_effect=[ValueError(), 'foo'])
+
+        self.assertRaises(ValueError, self.cache.get_or_create,
+                          'key', creator, 10)
+        self.assertEqual('foo', self.cache.get_or_create('key', creator, 10))
+
+    def test_invalidate(self):
+        self.cache.set(('a', 1), 'foo', 10)
+        self.cache.set(('b', 1), 'bar', 10)
+
+        self.cache.invalidate(predicate=lambda k: k[0] == 'a')
+        self.assertIsNone(self.cache.get(('a', 1)))
+        self.assertEqual('bar', self.cache.get(('b', 1)))
+
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get(('b', 1)))
+
+    @mock.patch.object(memory_cache, 'threading')
+    @mock.patch.object(memory_cache, 'time')
+    def test_get_or_create_stale(self, mock_time, mock_threading):
+        creator = mock.Mock(side_effect=['foo', 'bar'])
+        mock_time.time.return_value = 100
+        self.cache.get_or_create('key', creator, 10, stale_ttl=20)
+
+        mock_time.time.return_value = 115
+        self.assertEqual('foo',
+                         self.cache.get_or_create('key', creator, 10, 20))
+        self.assertEqual('foo',
+                         self.cache.get_or_create('key', creator, 10, 20))
+        # only one refresh is started
+        mock_threading.Thread.assert_called_once_with(
+            target=mock.ANY, args=('key', creator, 10, 20, 0))
+        self.assertEqual(1, creator.call_count)
+        self.assertEqual(2, self.cache.stats()['stale_hits'])
+
+        refresh = mock_threading.Thread.call_args[1]['target']
+        refresh(*mock_threading.Thread.call_args[1]['args'])
+        self.assertEqual('bar',
+                         self.cache.get_or_create('key', creator, 10, 20))
+
+        mock_time.time.return_value = 150
+        self.assertIsNone(self.cache.get('key'))
+
+    @mock.patch.object(memory_cache, 'threading')
+    @mock.patch.object(memory_cache, 'time')
+    def test_stale_refresh(self, mock_time, mock_threading):
+        creator = mock.Mock(side_effect=['foo', ValueError(), 'bar'])
+        mock_time.time.return_value = 100
+        self.cache.get_or_create('key', creator, 10, stale_ttl=20)
+
+        mock_time.time.return_value = 115
+        self.cache.get_or_create('key', creator, 10, stale_ttl=20)
+        refresh = mock_threading.Thread.call_args[1]['target']
+        args = mock_threading.Thread.call_args[1]['args']
+        # a failed refresh keeps the stale value
+        refresh(*args)
+        self.assertEqual('foo',
+                         self.cache.get_or_create('key', creator, 10, 20))
+
+        # a refresh started before the invalidation is not stored
+        self.cache.invalidate()
+        self.cache.set('key', 'baz', 10, stale_ttl=20)
+        refresh(*args)
+        self.assertEqual('baz', self.cache.get('key'))
+
+    def test_max_entries(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, key, 10)
+
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual('c', self.cache.get('c'))
+        self.assertEqual(2, self.cache.stats()['entries'])
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestLRUCache, self).setUp()
+        self.cache = memory_cache.LRUCache('test', max_size=10)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.set('key', 'foo', 3)
+
+        self.assertEqual('foo', self.cache.get('key'))
+        stats = self.cache.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+        self.assertEqual(3, stats['size'])
+
+    def test_eviction(self):
+        self.cache.set('foo', 'foo', 4)
+        self.cache.set('bar', 'bar', 4)
+        # foo becomes the most recently used entry
+        self.cache.get('foo')
+        self.cache.set('baz', 'baz', 4)
+
+        self.assertIsNone(self.cache.get('bar'))
+        self.assertEqual('foo', self.cache.get('foo'))
+        self.assertEqual('baz', self.cache.get('baz'))
+        self.assertEqual(8, self.cache.size)
+        self.assertEqual(1, self.cache.stats()['evictions'])
+
+    def test_value_bigger_than_max_size(self):
+        self.cache.set('key', 'foo', 3)
+        self.cache.set('key', 'bar', 11)
+
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(0, self.cache.size)
+
+    def test_invalidate(self):
+        self.cache.set(('foo', 1), 'foo', 1)
+        self.cache.set(('bar', 1), 'bar', 1)
+
+        self.cache.invalidate(predicate=lambda key: key[0] == 'foo')
+        self.assertIsNone(self.cache.get(('foo', 1)))
+        self.assertEqual('bar', self.cache.get(('bar', 1)))
+
+        self.cache.invalidate()
+        self.assertEqual(0, self.cache.size)
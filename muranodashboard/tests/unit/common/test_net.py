@@ -18,6 +18,7 @@ import unittest
 from horizon import exceptions
 
 from muranodashboard.common import net
+from muranodashboard.common import resources
 
 
 class TestNet(unittest.TestCase):
@@ -37,7 +38,7 @@ class TestNet(unittest.TestCase):
 
         self.addCleanup(mock.patch.stopall)
 
-    @mock.patch.object(net, 'neutron', autospec=True)
+    @mock.patch.object(resources, 'neutron', autospec=True)
     def test_get_available_networks_with_filter_one(self, mock_neutron):
         foo_mock_network = mock.Mock(router__external=False,
                                      id='foo-network-id',
@@ -65,7 +66,7 @@ class TestNet(unittest.TestCase):
         self.mock_env_api.environments_list.assert_called_once_with(
             self.mock_request)
 
-    @mock.patch.object(net, 'neutron', autospec=True)
+    @mock.patch.object(resources, 'neutron', autospec=True)
     def test_get_available_networks_with_filter_none(self, mock_neutron):
         foo_mock_network = mock.Mock(router__external=False,
                                      id='foo-network-id',
@@ -101,7 +102,7 @@ class TestNet(unittest.TestCase):
         self.mock_env_api.environments_list.assert_called_once_with(
             self.mock_request)
 
-    @mock.patch.object(net, 'neutron', autospec=True)
+    @mock.patch.object(resources, 'neutron', autospec=True)
     def test_get_available_networks(self, mock_neutron):
         foo_subnets = [
             type('%s-subnet' % k, (object, ),
@@ -162,7 +163,7 @@ class TestNet(unittest.TestCase):
             self.mock_request)
 
     @mock.patch.object(net, 'LOG', autospec=True)
-    @mock.patch.object(net, 'neutron', autospec=True)
+    @mock.patch.object(resources, 'neutron', autospec=True)
     def test_get_available_networks_except_service_catalog_exception(
             self, mock_neutron, mock_log):
         mock_neutron.network_list_for_tenant.side_effect = \
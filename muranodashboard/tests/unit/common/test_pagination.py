@@ -0,0 +1,54 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import unittest
+
+from muranodashboard.common import pagination
+
+
+class TestPagination(unittest.TestCase):
+
+    def test_get_boundaries(self):
+        self.assertEqual((False, True),
+                         pagination.get_boundaries(True, None))
+        self.assertEqual((True, False),
+                         pagination.get_boundaries(False, 'foo'))
+        self.assertEqual((True, True),
+                         pagination.get_boundaries(True, 'foo'))
+
+    def test_get_boundaries_backward(self):
+        self.assertEqual((True, True),
+                         pagination.get_boundaries(True, 'foo', True))
+        self.assertEqual((False, True),
+                         pagination.get_boundaries(False, 'foo', True))
+        self.assertEqual((False, False),
+                         pagination.get_boundaries(False, None, True))
+
+    def test_paginate(self):
+        items = iter(range(10))
+
+        self.assertEqual(([0, 1, 2], False, True),
+                         pagination.paginate(items, 3))
+        # only one item after the page is consumed
+        self.assertEqual(4, next(items))
+
+    def test_paginate_last_page(self):
+        self.assertEqual(([1, 2], True, False),
+                         pagination.paginate([1, 2], 3, 'foo'))
+
+    def test_paginate_backward(self):
+        self.assertEqual(([3, 4], True, True),
+                         pagination.paginate([4, 3, 2], 2, 'foo',
+                                             backward=True))
+        self.assertEqual(([1], False, True),
+                         pagination.paginate([1], 2, 'foo', backward=True))
@@ -0,0 +1,132 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.test import utils as test_utils
+import mock
+import unittest
+
+from muranodashboard.common import resources
+
+
+class TestResources(unittest.TestCase):
+
+    def setUp(self):
+        super(TestResources, self).setUp()
+        override = test_utils.override_settings(
+            MURANO_RESOURCES_CACHE_TTL=30, MURANO_QUOTA_USAGES_CACHE_TTL=10,
+            MURANO_PROJECT_NAMES_CACHE_TTL=300)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.request = mock.Mock()
+        self.request.user.tenant_id = 'foo_tenant'
+        self.request.user.services_region = 'RegionOne'
+        resources.RESOURCES_CACHE.invalidate()
+        self.addCleanup(resources.RESOURCES_CACHE.invalidate)
+        resources.PROJECT_NAMES_CACHE.invalidate()
+        self.addCleanup(resources.PROJECT_NAMES_CACHE.invalidate)
+        self.addCleanup(mock.patch.stopall)
+
+    @mock.patch.object(resources, 'nova')
+    def test_flavor_list_cached(self, mock_nova):
+        mock_nova.novaclient().flavors.list.return_value = ['foo', 'bar']
+
+        self.assertEqual(['foo', 'bar'], resources.flavor_list(self.request))
+        self.assertEqual(['foo', 'bar'], resources.flavor_list(self.request))
+        mock_nova.novaclient().flavors.list.assert_called_once_with()
+
+    @mock.patch.object(resources, 'nova')
+    def test_cache_is_per_region(self, mock_nova):
+        resources.keypair_list(self.request)
+        self.request.user.services_region = 'RegionTwo'
+        resources.keypair_list(self.request)
+
+        self.assertEqual(2, mock_nova.novaclient().keypairs.list.call_count)
+
+    @mock.patch.object(resources, 'nova')
+    def test_keypairs_cache_is_per_user(self, mock_nova):
+        mock_nova.novaclient().keypairs.list.side_effect = [['foo'], ['bar']]
+        other_request = mock.Mock()
+        other_request.user.tenant_id = 'foo_tenant'
+        other_request.user.services_region = 'RegionOne'
+        other_request.user.id = 'bar_user'
+        self.request.user.id = 'foo_user'
+
+        self.assertEqual(['foo'], resources.keypair_list(self.request))
+        self.assertEqual(['bar'], resources.keypair_list(other_request))
+        self.assertEqual(['foo'], resources.keypair_list(self.request))
+        self.assertEqual(2, mock_nova.novaclient().keypairs.list.call_count)
+
+    @mock.patch.object(resources, 'neutron')
+    @mock.patch.object(resources, 'nova')
+    def test_invalidate_kind(self, mock_nova, mock_neutron):
+        resources.keypair_list(self.request)
+        resources.security_group_list(self.request)
+
+        resources.invalidate(self.request, resources.KEYPAIRS)
+        resources.keypair_list(self.request)
+        resources.security_group_list(self.request)
+
+        self.assertEqual(2, mock_nova.novaclient().keypairs.list.call_count)
+        mock_neutron.security_group_list.assert_called_once_with(
+            self.request)
+
+    @mock.patch.object(resources, 'cinder')
+    def test_volume_list(self, mock_cinder):
+        resources.volume_list(self.request, status='available')
+
+        mock_cinder.volume_list.assert_called_once_with(
+            self.request, search_opts={'status': 'available'})
+
+    @mock.patch.object(resources, 'quotas')
+    def test_quota_usages_cached(self, mock_quotas):
+        mock_quotas.tenant_quota_usages().usages = {'ram': {'used': 1}}
+        mock_quotas.tenant_quota_usages.reset_mock()
+
+        self.assertEqual({'ram': {'used': 1}},
+                         resources.quota_usages(self.request))
+        resources.quota_usages(self.request)
+        mock_quotas.tenant_quota_usages.assert_called_once_with(self.request)
+
+        resources.invalidate(self.request, resources.QUOTA_USAGES)
+        resources.quota_usages(self.request)
+        self.assertEqual(2, mock_quotas.tenant_quota_usages.call_count)
+
+    @mock.patch.object(resources.dashboard_exceptions, 'NOT_FOUND',
+                       (LookupError,))
+    @mock.patch.object(resources, 'keystone')
+    def test_project_names(self, mock_keystone):
+        def tenant_get(request, project_id, admin):
+            if project_id == 'deleted_id':
+                raise LookupError()
+            if project_id == 'broken_id':
+                raise ValueError()
+            project = mock.Mock()
+            project.configure_mock(name=project_id.replace('_id', '_name'))
+            return project
+
+        mock_keystone.tenant_get.side_effect = tenant_get
+
+        names = resources.project_names(
+            self.request, ['foo_id', 'foo_id', 'deleted_id', 'broken_id',
+                           None])
+        self.assertEqual({'foo_id': 'foo_name', 'deleted_id': None}, names)
+        self.assertEqual(3, mock_keystone.tenant_get.call_count)
+        mock_keystone.tenant_get.assert_any_call(self.request, 'foo_id',
+                                                 admin=True)
+
+        mock_keystone.tenant_get.reset_mock()
+        names = resources.project_names(self.request,
+                                        ['foo_id', 'deleted_id', 'broken_id'])
+        self.assertEqual({'foo_id': 'foo_name', 'deleted_id': None}, names)
+        # only the failed lookup is repeated
+        mock_keystone.tenant_get.assert_called_once_with(
+            self.request, 'broken_id', admin=True)
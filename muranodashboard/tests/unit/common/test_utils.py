@@ -18,6 +18,9 @@ except ImportError:
     import pickle
 
 import mock
+import os
+import shutil
+import tempfile
 import unittest
 import yaql
 
@@ -35,6 +38,19 @@ class TestUtils(unittest.TestCase):
         test_html = '<html></html>'
         self.assertIsNone(utils.parse_api_error(test_html))
 
+    def test_ensure_dir(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        path = os.path.join(location, 'foo', 'bar')
+
+        self.assertTrue(utils.ensure_dir(path))
+        self.assertTrue(os.path.isdir(path))
+        self.assertFalse(utils.ensure_dir(path))
+
+        file_path = os.path.join(location, 'baz')
+        open(file_path, 'w').close()
+        self.assertRaises(OSError, utils.ensure_dir, file_path)
+
 
 class TestCustomPickler(unittest.TestCase):
 
@@ -0,0 +1,113 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import unittest
+
+from django.core import validators
+from django import forms
+
+from muranodashboard.common import utils
+from muranodashboard.dynamic_ui import compiler
+from muranodashboard.dynamic_ui import fields
+from muranodashboard.dynamic_ui import yaql_expression
+
+
+class TestCompiler(unittest.TestCase):
+
+    def setUp(self):
+        super(TestCompiler, self).setUp()
+        self.expr = yaql_expression.YaqlExpression('$.foo')
+        self.ui_desc = {
+            'Version': 2.4,
+            'Application': {'?': {'type': 'test.App'}},
+            'Parameters': {'foo': 'bar'},
+            'Forms': [
+                {'group0': {
+                    'fields': [
+                        {'name': 'foo', 'type': 'string',
+                         'helpText': 'Foo field', 'hidden': True,
+                         'regexpValidator': '^foo$',
+                         'initial': self.expr},
+                        {'name': 'bar', 'type': ['test.Foo', 'test.Bar']}],
+                    'validators': [{'expr': self.expr}],
+                    'region': 'RegionOne'}}
+            ]
+        }
+
+    def test_compile_ui(self):
+        compiled = compiler.compile_ui(self.ui_desc)
+
+        self.assertEqual(2.4, compiled.version)
+        self.assertEqual({'application': {'?': {'type': 'test.App'}},
+                          'parameters': {'foo': 'bar'}},
+                         compiled.get_sections())
+        self.assertEqual(1, len(compiled.forms))
+        form = compiled.forms[0]
+        self.assertEqual('group0', form.name)
+        self.assertEqual([{'expr': self.expr}], form.validators)
+        self.assertEqual('RegionOne', form.region)
+
+        foo, bar = form.fields
+        self.assertEqual(('foo', 'string'), (foo.name, foo.type))
+        self.assertEqual(('bar', ('test.Foo', 'test.Bar')),
+                         (bar.name, bar.type))
+        kwargs = foo.bind(fields.RawProperty)
+        self.assertEqual('Foo field', kwargs['help_text'])
+        self.assertEqual(forms.HiddenInput, kwargs['widget'])
+        self.assertIsInstance(kwargs['validators'][0],
+                              validators.RegexValidator)
+        self.assertIsInstance(kwargs['initial'], fields.RawProperty)
+        self.assertEqual('initial', kwargs['initial'].key)
+        self.assertEqual(self.expr, kwargs['initial'].spec)
+
+    def test_compile_ui_does_not_modify_definition(self):
+        compiler.compile_ui(self.ui_desc)
+
+        self.assertIn('Version', self.ui_desc)
+        self.assertIn('type', self.ui_desc['Forms'][0]['group0']['fields'][0])
+
+    def test_compile_ui_unsupported_version(self):
+        self.ui_desc['Version'] = 3
+        self.assertRaises(ValueError, compiler.compile_ui, self.ui_desc)
+
+    def test_compile_ui_malformed_form(self):
+        self.ui_desc['Forms'] = [{'group0': {'fields': 'foo'}}]
+        self.assertRaises(ValueError, compiler.compile_ui, self.ui_desc)
+
+        self.ui_desc['Forms'] = [{'group0': {'fields': [{'name': 'foo'}]}}]
+        self.assertRaises(ValueError, compiler.compile_ui, self.ui_desc)
+
+    def test_bind_returns_fresh_objects(self):
+        field = compiler.compile_field({
+            'name': 'foo', 'type': 'string',
+            'widgetAttrs': {'foo': 'bar'}, 'initial': self.expr})
+
+        kwargs = field.bind(fields.RawProperty)
+        kwargs['widget_attrs']['foo'] = 'baz'
+        other_kwargs = field.bind(fields.RawProperty)
+
+        self.assertEqual({'foo': 'bar'}, other_kwargs['widget_attrs'])
+        self.assertIsNot(kwargs['initial'], other_kwargs['initial'])
+
+    def test_compiled_ui_is_picklable(self):
+        compiled = compiler.compile_ui(self.ui_desc)
+
+        data = io.BytesIO()
+        utils.CustomPickler(data).dump(compiled)
+        data.seek(0)
+        loaded = utils.CustomUnpickler(data).load()
+
+        self.assertEqual(compiled.get_sections(), loaded.get_sections())
+        field = loaded.forms[0].fields[0]
+        self.assertEqual('$.foo',
+                         str(field.bind(fields.RawProperty)['initial'].spec))
@@ -15,11 +15,14 @@
 from django.core import exceptions
 from django.core import validators as django_validator
 from django import forms
+from django.test import utils as test_utils
 from django.utils.translation import ugettext_lazy as _
 
 import mock
+import threading
 import unittest
 
+from muranodashboard.common import resources
 from muranodashboard.dynamic_ui import fields
 
 
@@ -133,34 +136,23 @@ class TestFields(unittest.TestCase):
         e = cm.exception
         self.assertEqual('foo', e.message)
 
-    @mock.patch.object(fields, 'glance')
-    def test_get_murano_images(self, mock_glance):
-        foo_image = mock.Mock(murano_property=None)
-        foo_image.murano_image_info = '{"foo": "foo_val"}'
-        bar_image = mock.Mock(murano_property=None)
-        bar_image.murano_image_info = '{"bar": "bar_val"}'
-        mock_glance.image_list_detailed.return_value = [
-            [foo_image, bar_image], None
-        ]
+    @mock.patch.object(fields, 'image_index')
+    def test_get_murano_images(self, mock_image_index):
+        foo_image = mock.Mock(murano_property={"foo": "foo_val"})
+        bar_image = mock.Mock(murano_property={"bar": "bar_val"})
+        mock_image_index.get_images.return_value = [foo_image, bar_image]
 
         murano_images = fields.get_murano_images(self.request)
-        mock_glance.image_list_detailed.assert_called_once_with(self.request)
-        self.assertEqual({"foo": "foo_val"}, foo_image.murano_property)
-        self.assertEqual({"bar": "bar_val"}, bar_image.murano_property)
+        mock_image_index.get_images.assert_called_once_with(self.request)
 
-        expected_images = []
-        foo_image.murano_property = {"foo": "foo_val"}
-        bar_image.murano_property = {"bar": "bar_val"}
-        expected_images.extend([foo_image, bar_image])
-
-        self.assertEqual(expected_images, murano_images)
+        self.assertEqual([foo_image, bar_image], murano_images)
 
     @mock.patch.object(fields, 'exceptions')
     @mock.patch.object(fields, 'LOG')
-    @mock.patch.object(fields, 'glance')
-    def test_murano_images_except_exception(self, mock_glance, mock_log,
+    @mock.patch.object(fields, 'image_index')
+    def test_murano_images_except_exception(self, mock_image_index, mock_log,
                                             mock_exceptions):
-        mock_glance.image_list_detailed.side_effect = Exception
+        mock_image_index.get_images.side_effect = Exception
 
         murano_images = fields.get_murano_images(self.request)
 
@@ -171,14 +163,11 @@ class TestFields(unittest.TestCase):
 
     @mock.patch.object(fields, 'messages')
     @mock.patch.object(fields, 'LOG')
-    @mock.patch.object(fields, 'glance')
-    def test_murano_images_except_value_error(self, mock_glance, mock_log,
-                                              mock_messages):
+    @mock.patch.object(fields, 'image_index')
+    def test_murano_images_except_value_error(self, mock_image_index,
+                                              mock_log, mock_messages):
         foo_image = mock.Mock(murano_property=None)
-        foo_image.murano_image_info = "{'foo': 'foo_val'}"
-        mock_glance.image_list_detailed.return_value = [
-            [foo_image], None
-        ]
+        mock_image_index.get_images.return_value = [foo_image]
 
         murano_images = fields.get_murano_images(self.request)
 
@@ -220,7 +209,7 @@ class TestFields(unittest.TestCase):
         bar_app = mock.MagicMock()
         bar_app.__getitem__.return_value = {'id': 'bar_app_id'}
         bar_app.configure_mock(name='bar_app_name')
-        mock_env_api.service_list_by_fqns.return_value = [foo_app, bar_app]
+        mock_env_api.filter_services_by_fqns.return_value = [foo_app, bar_app]
 
         dynamic_select_cls = fields.make_select_cls('foo_class_fqn')
         self.assertIsNotNone(dynamic_select_cls)
@@ -236,10 +225,11 @@ class TestFields(unittest.TestCase):
 
         mock_pkg_api.app_by_fqn.assert_called_once_with(
             self.request, 'foo_class_fqn')
-        mock_env_api.service_list_by_fqns.assert_called_once_with(
-            self.request, 'foo_env_id',
-            ['foo_class_fqn', 'bar_class_fqn']
-        )
+        mock_env_api.services_list.assert_called_once_with(
+            self.request, 'foo_env_id')
+        mock_env_api.filter_services_by_fqns.assert_called_once_with(
+            self.request, mock_env_api.services_list.return_value,
+            ['foo_class_fqn', 'bar_class_fqn'])
 
     @mock.patch.object(fields, 'env_api')
     @mock.patch.object(fields, 'pkg_api')
@@ -255,7 +245,7 @@ class TestFields(unittest.TestCase):
         foo_app = mock.MagicMock()
         foo_app.__getitem__.return_value = {'id': 'foo_app_id'}
         foo_app.configure_mock(name='foo_app_name')
-        mock_env_api.service_list_by_fqns.return_value = [foo_app]
+        mock_env_api.filter_services_by_fqns.return_value = [foo_app]
 
         dynamic_select_cls = fields.make_select_cls('foo_class_fqn')
         dynamic_select = dynamic_select_cls(empty_value_message='Foo')
@@ -266,9 +256,11 @@ class TestFields(unittest.TestCase):
 
         mock_pkg_api.app_by_fqn.assert_called_once_with(
             self.request, 'foo_class_fqn')
-        mock_env_api.service_list_by_fqns.assert_called_once_with(
-            self.request, 'foo_env_id', ['foo_class_fqn']
-        )
+        mock_env_api.services_list.assert_called_once_with(
+            self.request, 'foo_env_id')
+        mock_env_api.filter_services_by_fqns.assert_called_once_with(
+            self.request, mock_env_api.services_list.return_value,
+            ['foo_class_fqn'])
 
     @mock.patch.object(fields, 'env_api')
     @mock.patch.object(fields, 'pkg_api')
@@ -276,7 +268,7 @@ class TestFields(unittest.TestCase):
                                                         mock_env_api):
         mock_pkg_api.app_by_fqn.return_value = None
         mock_pkg_api.apps_that_inherit.return_value = []
-        mock_env_api.service_list_by_fqns.return_value = []
+        mock_env_api.filter_services_by_fqns.return_value = []
         expected_choices = [('', 'Foo')]
 
         dynamic_select_cls = fields.make_select_cls('foo_class_fqn')
@@ -288,8 +280,11 @@ class TestFields(unittest.TestCase):
 
         mock_pkg_api.app_by_fqn.assert_called_once_with(
             self.request, 'foo_class_fqn')
-        mock_env_api.service_list_by_fqns.assert_called_once_with(
-            self.request, 'foo_env_id', [])
+        mock_env_api.services_list.assert_called_once_with(
+            self.request, 'foo_env_id')
+        mock_env_api.filter_services_by_fqns.assert_called_once_with(
+            self.request, mock_env_api.services_list.return_value,
+            [])
 
     @mock.patch.object(fields, 'reverse')
     @mock.patch.object(fields, 'env_api')
@@ -298,7 +293,7 @@ class TestFields(unittest.TestCase):
                                               mock_reverse):
         mock_pkg_api.app_by_fqn.return_value = None
         mock_pkg_api.apps_that_inherit.return_value = []
-        mock_env_api.service_list_by_fqns.return_value = []
+        mock_env_api.filter_services_by_fqns.return_value = []
         mock_reverse.return_value = 'foo_url'
 
         dynamic_select_cls = fields.make_select_cls('foo_class_fqn')
@@ -322,7 +317,7 @@ class TestFields(unittest.TestCase):
     def test_update_clean(self, mock_pkg_api, mock_env_api):
         mock_pkg_api.app_by_fqn.return_value = None
         mock_pkg_api.apps_that_inherit.return_value = []
-        mock_env_api.service_list_by_fqns.return_value = []
+        mock_env_api.filter_services_by_fqns.return_value = []
 
         dynamic_select_cls = fields.make_select_cls('foo_class_fqn')
         dynamic_select = dynamic_select_cls(empty_value_message='Foo')
@@ -332,6 +327,103 @@ class TestFields(unittest.TestCase):
 
         self.assertEqual('value', dynamic_select.clean('value'))
 
+    @mock.patch.object(fields, 'env_api')
+    @mock.patch.object(fields, 'pkg_api')
+    def test_update_shares_app_references(self, mock_pkg_api, mock_env_api):
+        mock_pkg_api.app_by_fqn.side_effect = lambda request, fqn: mock.Mock(
+            fully_qualified_name=fqn)
+        mock_pkg_api.apps_that_inherit.return_value = []
+        mock_env_api.filter_services_by_fqns.return_value = []
+
+        foo_select = fields.make_select_cls('foo_class_fqn')()
+        bar_select = fields.make_select_cls(['foo_class_fqn',
+                                             'bar_class_fqn'])()
+        form = mock.Mock(app_references=fields.AppReferenceResolver(
+            type(foo_select).app_fqns + type(bar_select).app_fqns))
+
+        foo_select.update({}, self.request, environment_id='foo_env_id',
+                          form=form)
+        bar_select.update({}, self.request, environment_id='foo_env_id',
+                          form=form)
+
+        self.assertEqual(2, mock_pkg_api.app_by_fqn.call_count)
+        mock_pkg_api.app_by_fqn.assert_has_calls([
+            mock.call(self.request, 'foo_class_fqn'),
+            mock.call(self.request, 'bar_class_fqn')], any_order=True)
+        mock_env_api.services_list.assert_called_once_with(
+            self.request, 'foo_env_id')
+        mock_env_api.filter_services_by_fqns.assert_called_with(
+            self.request, mock_env_api.services_list.return_value,
+            ['foo_class_fqn', 'bar_class_fqn'])
+
+
+class TestAppReferenceResolver(unittest.TestCase):
+
+    def setUp(self):
+        super(TestAppReferenceResolver, self).setUp()
+        self.request = mock.Mock()
+        self.resolver = fields.AppReferenceResolver()
+        patcher = mock.patch.object(fields, 'pkg_api')
+        self.mock_pkg_api = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_pkg_api.apps_that_inherit.return_value = []
+
+    def test_find_apps_concurrently(self):
+        foo_started = threading.Event()
+        foo_release = threading.Event()
+
+        def app_by_fqn(request, fqn):
+            if fqn == 'foo_fqn':
+                foo_started.set()
+                foo_release.wait(5)
+            return mock.Mock(fully_qualified_name=fqn)
+
+        self.mock_pkg_api.app_by_fqn.side_effect = app_by_fqn
+        found = []
+
+        def find_foo():
+            found.append(self.resolver.find_apps(self.request, ['foo_fqn']))
+
+        threads = [threading.Thread(target=find_foo) for _i in range(2)]
+        threads[0].start()
+        self.assertTrue(foo_started.wait(5))
+        threads[1].start()
+
+        # other lookups are not blocked by the one in progress
+        bar_apps = self.resolver.find_apps(self.request, ['bar_fqn'])
+        self.assertEqual(['bar_fqn'],
+                         [app.fully_qualified_name for app in bar_apps])
+
+        foo_release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(2, len(found))
+        self.assertIs(found[0][0], found[1][0])
+        self.assertEqual(2, self.mock_pkg_api.app_by_fqn.call_count)
+
+    @mock.patch.object(fields.concurrency, 'run_concurrently')
+    def test_find_apps_workers(self, mock_run_concurrently):
+        mock_run_concurrently.side_effect = lambda funcs, max_workers: [
+            fields.concurrency.call(func) for func in funcs]
+
+        self.resolver.find_apps(self.request, ['foo_fqn', 'bar_fqn'])
+        # fields are updated one by one, so are the lookups
+        self.assertEqual(1, mock_run_concurrently.call_args[0][1])
+
+        with test_utils.override_settings(MURANO_CONCURRENT_FIELD_UPDATES=2):
+            self.resolver.find_apps(self.request, ['baz_fqn'])
+        self.assertEqual(fields.APP_LOOKUP_WORKERS,
+                         mock_run_concurrently.call_args[0][1])
+
+    def test_find_apps_failure(self):
+        self.mock_pkg_api.app_by_fqn.side_effect = ValueError()
+
+        self.assertRaises(ValueError, self.resolver.find_apps,
+                          self.request, ['foo_fqn'])
+        self.assertRaises(ValueError, self.resolver.find_apps,
+                          self.request, ['foo_fqn'])
+        self.assertEqual(1, self.mock_pkg_api.app_by_fqn.call_count)
+
 
 class TestRawProperty(unittest.TestCase):
 
@@ -507,7 +599,7 @@ class TestFlavorChoiceField(unittest.TestCase):
 
         self.addCleanup(mock.patch.stopall)
 
-    @mock.patch.object(fields, 'nova')
+    @mock.patch.object(resources, 'nova')
     def test_update(self, mock_nova):
         """"Test if flavor with any invalid requirement is excluded."""
         mock_nova.novaclient().flavors.list.return_value = [
@@ -538,7 +630,7 @@ class TestFlavorChoiceField(unittest.TestCase):
                              self.flavor_choice_field.choices)
             self.assertEqual('id3', self.flavor_choice_field.initial)
 
-    @mock.patch.object(fields, 'nova')
+    @mock.patch.object(resources, 'nova')
     def test_update_without_requirements(self, mock_nova):
         mock_nova.novaclient().flavors.list.return_value = [
             self.tiny_flavor, self.small_flavor, self.medium_flavor
@@ -563,7 +655,7 @@ class TestKeyPairChoiceField(unittest.TestCase):
         self.request = {'request': mock.Mock()}
         self.addCleanup(mock.patch.stopall)
 
-    @mock.patch.object(fields, 'nova')
+    @mock.patch.object(resources, 'nova')
     def test_update(self, mock_nova):
         foo_keypair = mock.Mock()
         bar_keypair = mock.Mock()
@@ -582,6 +674,25 @@ class TestKeyPairChoiceField(unittest.TestCase):
         self.assertEqual(sorted(expected_choices),
                          sorted(key_pair_choice_field.choices))
 
+    @mock.patch.object(resources, 'invalidate')
+    @mock.patch.object(resources, 'nova')
+    def test_valid_value_refreshes_keypairs(self, mock_nova,
+                                            mock_invalidate):
+        foo_keypair = mock.Mock()
+        bar_keypair = mock.Mock()
+        foo_keypair.configure_mock(name='foo')
+        bar_keypair.configure_mock(name='bar')
+        mock_nova.novaclient().keypairs.list.side_effect = [
+            [foo_keypair], [foo_keypair, bar_keypair]
+        ]
+        key_pair_choice_field = fields.KeyPairChoiceField()
+        key_pair_choice_field.update(self.request)
+
+        self.assertTrue(key_pair_choice_field.valid_value('foo'))
+        self.assertTrue(key_pair_choice_field.valid_value('bar'))
+        mock_invalidate.assert_called_once_with(
+            self.request['request'], resources.KEYPAIRS, None)
+
 
 class TestSecurityGroupChoiceField(unittest.TestCase):
 
@@ -590,7 +701,7 @@ class TestSecurityGroupChoiceField(unittest.TestCase):
         self.request = {'request': mock.Mock()}
         self.addCleanup(mock.patch.stopall)
 
-    @mock.patch.object(fields, 'neutron')
+    @mock.patch.object(resources, 'neutron')
     def test_update(self, mock_neutron):
         mock_neutron.security_group_list.return_value = [
             mock.Mock(name_or_id='foo'),
@@ -689,7 +800,7 @@ class TestVolumeChoiceField(unittest.TestCase):
         self.request = {'request': mock.Mock()}
         self.addCleanup(mock.patch.stopall)
 
-    @mock.patch.object(fields, 'cinder')
+    @mock.patch.object(resources, 'cinder')
     def test_update(self, mock_cinder):
         foo_vol = mock.Mock()
         bar_snap = mock.Mock()
@@ -712,7 +823,7 @@ class TestVolumeChoiceField(unittest.TestCase):
         self.assertEqual(sorted(expected_choices),
                          sorted(volume_choice_field.choices))
 
-    @mock.patch.object(fields, 'cinder')
+    @mock.patch.object(resources, 'cinder')
     def test_update_withoutsnapshot(self, mock_cinder):
         foo_vol = mock.Mock()
         bar_vol = mock.Mock()
@@ -734,7 +845,7 @@ class TestVolumeChoiceField(unittest.TestCase):
         self.assertEqual(sorted(expected_choices),
                          sorted(volume_choice_field.choices))
 
-    @mock.patch.object(fields, 'cinder')
+    @mock.patch.object(resources, 'cinder')
     def test_update_withoutvolume(self, mock_cinder):
         foo_vol = mock.Mock()
         baz_snap = mock.Mock()
@@ -755,7 +866,7 @@ class TestVolumeChoiceField(unittest.TestCase):
                          sorted(volume_choice_field.choices))
 
     @mock.patch.object(fields, 'exceptions')
-    @mock.patch.object(fields, 'cinder')
+    @mock.patch.object(resources, 'cinder')
     def test_update_except_snapshot_list_exception(self, mock_cinder,
                                                    mock_exceptions):
         foo_vol = mock.Mock()
@@ -779,7 +890,7 @@ class TestVolumeChoiceField(unittest.TestCase):
             self.request['request'], _('Unable to retrieve snapshot list.'))
 
     @mock.patch.object(fields, 'exceptions')
-    @mock.patch.object(fields, 'cinder')
+    @mock.patch.object(resources, 'cinder')
     def test_update_except_volume_list_exception(self, mock_cinder,
                                                  mock_exceptions):
         bar_snap = mock.Mock()
@@ -801,7 +912,7 @@ class TestVolumeChoiceField(unittest.TestCase):
             self.request['request'], _('Unable to retrieve volume list.'))
 
     @mock.patch.object(fields, 'exceptions')
-    @mock.patch.object(fields, 'cinder')
+    @mock.patch.object(resources, 'cinder')
     def test_update_except_exception(self, mock_cinder, mock_exceptions):
         mock_cinder.volume_list.side_effect = Exception
         mock_cinder.volume_snapshot_list.side_effect = Exception
@@ -825,7 +936,7 @@ class TestVolumeChoiceField(unittest.TestCase):
 
 class TestAZoneChoiceField(unittest.TestCase):
 
-    @mock.patch.object(fields, 'nova')
+    @mock.patch.object(resources, 'nova')
     def test_update(self, mock_nova):
         mock_nova.novaclient().availability_zones.list.return_value = [
             mock.Mock(zoneName='foo_zone', zoneState='foo_state'),
@@ -842,7 +953,7 @@ class TestAZoneChoiceField(unittest.TestCase):
         self.assertEqual(expected_choices, a_zone_choice_field.choices)
 
     @mock.patch.object(fields, 'exceptions')
-    @mock.patch.object(fields, 'nova')
+    @mock.patch.object(resources, 'nova')
     def test_update_except_exception(self, mock_nova, mock_exc):
         mock_nova.novaclient().availability_zones.list.side_effect = Exception
         request = {'request': mock.Mock()}
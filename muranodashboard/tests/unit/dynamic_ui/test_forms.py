@@ -18,6 +18,7 @@ import unittest
 from yaql.language import contexts as yaql_contexts
 
 from django import forms as django_forms
+from django.test import utils as test_utils
 
 from muranodashboard.dynamic_ui import fields
 from muranodashboard.dynamic_ui import forms
@@ -140,6 +141,63 @@ class TestUpdatableFieldsForm(unittest.TestCase):
         self.assertTrue(mock_password_field.get_clone_name.called)
         self.assertTrue(mock_password_field.update.called)
 
+    def _make_updatable_field(self, name, calls):
+        field = mock.Mock(required=True)
+
+        def update(initial, form=None, request=None):
+            calls.append((name, request))
+        field.update.side_effect = update
+        return field
+
+    def _enable_concurrent_updates(self):
+        override = test_utils.override_settings(
+            MURANO_CONCURRENT_FIELD_UPDATES=4)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_update_fields_concurrently(self):
+        self._enable_concurrent_updates()
+        calls = []
+        request = mock.Mock()
+        self.form.fields = collections.OrderedDict(
+            (name, self._make_updatable_field(name, calls))
+            for name in ('foo', 'bar', 'baz'))
+
+        self.form.update_fields(request=request)
+
+        self.assertEqual(['foo', 'bar', 'baz'],
+                         list(self.form.field_update_timings))
+        self.assertEqual(set(['foo', 'bar', 'baz']),
+                         set(name for name, _ in calls))
+        requests = [field_request for _, field_request in calls]
+        self.assertNotIn(request, requests)
+        self.assertEqual(3, len(set(id(r) for r in requests)))
+
+    def test_update_fields_concurrently_raises_first_error(self):
+        self._enable_concurrent_updates()
+        calls = []
+        self.form.fields = collections.OrderedDict(
+            (name, self._make_updatable_field(name, calls))
+            for name in ('foo', 'bar', 'baz'))
+        self.form.fields['bar'].update.side_effect = ValueError('bar')
+        self.form.fields['baz'].update.side_effect = KeyError('baz')
+
+        with self.assertRaises(ValueError):
+            self.form.update_fields(request=mock.Mock())
+
+    def test_update_fields_sequentially_stops_on_error(self):
+        calls = []
+        request = mock.Mock()
+        self.form.fields = collections.OrderedDict(
+            (name, self._make_updatable_field(name, calls))
+            for name in ('foo', 'bar', 'baz'))
+        self.form.fields['bar'].update.side_effect = ValueError('bar')
+
+        with self.assertRaises(ValueError):
+            self.form.update_fields(request=request)
+        self.assertEqual([('foo', request)], calls)
+        self.assertFalse(self.form.fields['baz'].update.called)
+
 
 class TestServiceConfigurationForm(unittest.TestCase):
 
@@ -12,8 +12,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 import unittest
 
+import mock
+
 from muranodashboard.dynamic_ui import helpers
 
 
@@ -55,3 +58,67 @@ class TestHelper(unittest.TestCase):
         list_result = helpers.insert_hidden_ids(app_list)
         self.assertEqual('test.App', dict_result['?']['type'])
         self.assertEqual(app_list, list_result)
+
+
+class TestCurrentRegion(unittest.TestCase):
+
+    def setUp(self):
+        super(TestCurrentRegion, self).setUp()
+        self.request = mock.Mock(spec=['user'])
+        self.request.user = mock.Mock(services_region='RegionOne')
+
+    def test_current_region(self):
+        with helpers.current_region(self.request, 'RegionTwo'):
+            self.assertEqual('RegionTwo', self.request.user.services_region)
+            with helpers.current_region(self.request, 'RegionThree'):
+                self.assertEqual('RegionThree',
+                                 self.request.user.services_region)
+            self.assertEqual('RegionTwo', self.request.user.services_region)
+        self.assertEqual('RegionOne', self.request.user.services_region)
+
+    def test_current_region_mock_request(self):
+        # mocks make up any attribute, the state is not taken from them
+        request = mock.Mock()
+        request.user.services_region = 'RegionOne'
+        with helpers.current_region(request, 'RegionTwo'):
+            self.assertEqual('RegionTwo', request.user.services_region)
+        self.assertEqual('RegionOne', request.user.services_region)
+
+    def test_current_region_none(self):
+        with helpers.current_region(self.request, None):
+            self.assertEqual('RegionOne', self.request.user.services_region)
+        self.assertEqual('RegionOne', self.request.user.services_region)
+
+    def test_current_region_waits_for_other_threads(self):
+        entered = threading.Event()
+        release = threading.Event()
+        seen = []
+
+        def hold_region():
+            with helpers.current_region(self.request, 'RegionTwo'):
+                entered.set()
+                release.wait(5)
+                seen.append(self.request.user.services_region)
+
+        def switch_region():
+            with helpers.current_region(self.request, 'RegionThree'):
+                seen.append(self.request.user.services_region)
+
+        holder = threading.Thread(target=hold_region)
+        holder.start()
+        entered.wait(5)
+        switcher = threading.Thread(target=switch_region)
+        switcher.start()
+        release.set()
+        holder.join(5)
+        switcher.join(5)
+
+        self.assertEqual(['RegionTwo', 'RegionThree'], seen)
+        self.assertEqual('RegionOne', self.request.user.services_region)
+
+    def test_isolated_request(self):
+        clone = helpers.isolated_request(self.request)
+
+        with helpers.current_region(clone, 'RegionTwo'):
+            self.assertEqual('RegionTwo', clone.user.services_region)
+            self.assertEqual('RegionOne', self.request.user.services_region)
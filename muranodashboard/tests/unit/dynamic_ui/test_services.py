@@ -21,8 +21,10 @@ from yaql.language import factory
 
 from muranodashboard.catalog import forms as catalog_forms
 from muranodashboard.catalog import views as catalog_views
+from muranodashboard.dynamic_ui import compiler
 from muranodashboard.dynamic_ui import forms as service_forms
 from muranodashboard.dynamic_ui import services
+from muranodashboard.dynamic_ui import yaql_expression
 
 from openstack_dashboard.test import helpers
 
@@ -36,6 +38,11 @@ class TestService(helpers.APITestCase):
         self.request = factory.get('/path/for/testing')
         self.request.session = {}
 
+    def _mock_compiled_app_ui(self, mock_pkg_api):
+        mock_pkg_api.get_compiled_app_ui.side_effect = (
+            lambda request, app_id: compiler.compile_ui(
+                mock_pkg_api.get_app_ui(request, app_id)))
+
     def test_service_field_hidden_false(self):
         """Test that service field is hidden
 
@@ -162,6 +169,7 @@ class TestService(helpers.APITestCase):
 
     @mock.patch.object(services, 'pkg_api')
     def test_import_app(self, mock_pkg_api):
+        self._mock_compiled_app_ui(mock_pkg_api)
         mock_pkg_api.get_app_ui.return_value = {
             'foo': 'bar',
             'application': self.application
@@ -173,8 +181,84 @@ class TestService(helpers.APITestCase):
         self.assertEqual('bar', service.foo)
         self.assertEqual(self.application, service.application)
 
+    @mock.patch.object(services, 'api')
+    @mock.patch.object(services, 'pkg_api')
+    def test_import_app_parameters_source_cached(self, mock_pkg_api,
+                                                 mock_api):
+        self._mock_compiled_app_ui(mock_pkg_api)
+        mock_pkg_api.get_app_ui.side_effect = lambda *args: {
+            'Application': self.application,
+            'ParametersSource': 'test.App.getParameters'
+        }
+        mock_pkg_api.get_app_fqn.return_value = 'test.App'
+        mock_pkg_api.get_package_details.return_value = mock.Mock(
+            version='1.0.0')
+        mock_client = mock_api.muranoclient.return_value
+        mock_client.static_actions.call.return_value.get_result.\
+            return_value = {'foo': 'bar'}
+        self.request.user = mock.Mock(tenant_id='foo_tenant')
+        services.PARAMETERS_SOURCE_CACHE.invalidate()
+        self.addCleanup(services.PARAMETERS_SOURCE_CACHE.invalidate)
+
+        for _i in range(2):
+            service = services.import_app(self.request, '123')
+            self.assertEqual('bar', service.parameters['foo'])
+        mock_client.static_actions.call.assert_called_once_with({
+            'className': 'test.App',
+            'methodName': 'getParameters',
+            'packageName': 'test.App',
+            'classVersion': '1.0.0',
+            'parameters': {}
+        })
+
+    @mock.patch.object(services, 'api')
+    @mock.patch.object(services, 'pkg_api')
+    def test_import_app_keeps_cached_ui_intact(self, mock_pkg_api, mock_api):
+        # the app cache hands out the same compiled UI to every caller
+        compiled_ui = compiler.compile_ui({
+            'Application': self.application,
+            'Parameters': {'bar': 'baz'},
+            'ParametersSource': 'getParameters',
+            'ParametersSourceCache': False
+        })
+        mock_pkg_api.get_compiled_app_ui.return_value = compiled_ui
+        mock_pkg_api.get_app_fqn.return_value = 'test.App'
+        mock_client = mock_api.muranoclient.return_value
+        mock_client.static_actions.call.return_value.get_result.\
+            side_effect = [{'foo': 'bar'}, {'foo': 'qux'}]
+        self.request.user = mock.Mock(tenant_id='foo_tenant')
+
+        service = services.import_app(self.request, '123')
+        self.assertEqual({'foo': 'bar', 'bar': 'baz'}, service.parameters)
+        service = services.import_app(self.request, '123')
+        self.assertEqual({'foo': 'qux', 'bar': 'baz'}, service.parameters)
+        self.assertEqual({'bar': 'baz'},
+                         compiled_ui.get_sections()['parameters'])
+
+    @mock.patch.object(services, 'api')
+    @mock.patch.object(services, 'pkg_api')
+    def test_import_app_parameters_source_cache_opt_out(self, mock_pkg_api,
+                                                        mock_api):
+        self._mock_compiled_app_ui(mock_pkg_api)
+        mock_pkg_api.get_app_ui.side_effect = lambda *args: {
+            'Application': self.application,
+            'ParametersSource': 'getParameters',
+            'ParametersSourceCache': False
+        }
+        mock_pkg_api.get_app_fqn.return_value = 'test.App'
+        mock_client = mock_api.muranoclient.return_value
+        mock_client.static_actions.call.return_value.get_result.\
+            return_value = {'foo': 'bar'}
+        self.request.user = mock.Mock(tenant_id='foo_tenant')
+
+        for _i in range(2):
+            service = services.import_app(self.request, '123')
+            self.assertEqual('bar', service.parameters['foo'])
+        self.assertEqual(2, mock_client.static_actions.call.call_count)
+
     @mock.patch.object(services, 'pkg_api')
     def test_condition_getter_with_stay_at_the_catalog(self, mock_pkg_api):
+        self._mock_compiled_app_ui(mock_pkg_api)
         mock_pkg_api.get_app_ui.return_value = {
             'foo': 'bar',
             'application': self.application
@@ -205,6 +289,7 @@ class TestService(helpers.APITestCase):
 
     @mock.patch.object(services, 'pkg_api')
     def test_condition_getter_with_application_name(self, mock_pkg_api):
+        self._mock_compiled_app_ui(mock_pkg_api)
         mock_pkg_api.get_app_ui.return_value = {
             'foo': 'bar',
             'application': self.application
@@ -235,6 +320,7 @@ class TestService(helpers.APITestCase):
 
     @mock.patch.object(services, 'pkg_api')
     def test_condition_getter_with_form_hidden(self, mock_pkg_api):
+        self._mock_compiled_app_ui(mock_pkg_api)
         mock_pkg_api.get_app_ui.return_value = {
             'foo': 'bar',
             'application': self.application
@@ -263,6 +349,7 @@ class TestService(helpers.APITestCase):
 
     @mock.patch.object(services, 'pkg_api')
     def test_get_app_forms(self, mock_pkg_api):
+        self._mock_compiled_app_ui(mock_pkg_api)
         mock_pkg_api.get_app_ui.return_value = {'Application': {}}
 
         kwargs = {'app_id': '123'}
@@ -318,3 +405,46 @@ class TestService(helpers.APITestCase):
         self.assertEqual(['test_description', 'test_title'],
                          sorted(no_field_descriptions))
         self.assertEqual([], descriptions)
+
+    @mock.patch('muranodashboard.common.cache._save_to_file')
+    @mock.patch('muranodashboard.common.cache._load_from_file',
+                return_value=None)
+    @mock.patch.object(services, 'pkg_api')
+    def test_get_app_metadata(self, mock_pkg_api, *args):
+        mock_pkg_api.get_app_ui.return_value = {
+            'Version': 2.4,
+            'Forms': [
+                {'group0': {'fields': [
+                    {'name': 'flavor', 'type': 'flavor',
+                     'requirements': {'minDisk': 10, 'max_vcpus': 2}}]}},
+                {'group1': {'fields': [
+                    {'name': 'license', 'type': 'string',
+                     'description': 'foo license'}]}}
+            ]
+        }
+
+        metadata = services.get_app_metadata(self.request, '123')
+
+        self.assertEqual({'flavor_requirements': [{'min_disk': 10,
+                                                   'max_vcpus': 2}],
+                          'license': 'foo license',
+                          'static': True}, metadata)
+        mock_pkg_api.get_app_ui.assert_called_once_with(self.request, '123')
+
+    @mock.patch('muranodashboard.common.cache._save_to_file')
+    @mock.patch('muranodashboard.common.cache._load_from_file',
+                return_value=None)
+    @mock.patch.object(services, 'pkg_api')
+    def test_get_app_metadata_with_expression(self, mock_pkg_api, *args):
+        expr = yaql_expression.YaqlExpression('$.foo')
+        mock_pkg_api.get_app_ui.return_value = {
+            'Forms': [
+                {'group0': {'fields': [
+                    {'name': 'license', 'type': 'string',
+                     'description': expr}]}}
+            ]
+        }
+
+        metadata = services.get_app_metadata(self.request, '123')
+
+        self.assertFalse(metadata['static'])
@@ -15,6 +15,7 @@
 import mock
 import unittest
 
+from django.test import utils as test_utils
 from django.utils.translation import ugettext_lazy as _
 
 from muranodashboard.images import forms
@@ -48,6 +49,26 @@ class TestImagesForms(unittest.TestCase):
         self.assertEqual([],
                          forms.filter_murano_images(images, self.mock_request))
 
+    @mock.patch.object(forms, 'exceptions')
+    @mock.patch.object(forms, 'image_index')
+    def test_get_marked_images(self, mock_image_index, mock_exceptions):
+        foo_image = mock.Mock(id='foo', murano_property={'title': 'foo'},
+                              owner='foo_tenant')
+        bar_image = mock.Mock(id='bar', murano_property=None,
+                              owner='bar_tenant')
+        mock_image_index.get_images.return_value = [foo_image, bar_image]
+
+        self.assertEqual([foo_image, bar_image],
+                         forms.get_marked_images(self.mock_request))
+        mock_exceptions.handle.assert_called_once_with(
+            self.mock_request, _('Invalid metadata for image: bar'))
+
+        self.mock_request.user.tenant_id = 'foo_tenant'
+        with test_utils.override_settings(
+                MURANO_IMAGE_FILTER_PROJECT_ID='baz_tenant'):
+            self.assertEqual([foo_image],
+                             forms.get_marked_images(self.mock_request))
+
 
 class TestMarkImageForm(unittest.TestCase):
     def setUp(self):
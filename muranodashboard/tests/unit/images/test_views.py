@@ -12,7 +12,6 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import json
 import mock
 import unittest
 
@@ -41,132 +40,88 @@ class TestMarkedImagesView(unittest.TestCase):
         mock_horizon_utils.get_page_size.return_value = 2
         self.addCleanup(mock.patch.stopall)
 
-    def _get_mock_image(self, prefix):
-        image_info = {}
-        if prefix:
-            image_info = {
-                "title": "{0}_title".format(prefix),
-                "type": "{0}_type".format(prefix)
-            }
-        mock_image = mock.Mock(**{'murano_image_info': json.dumps(image_info)})
-        return mock_image
-
     def test_has_prev_data(self):
         self.assertFalse(self.images_view.has_prev_data(None))
 
     def test_has_more_data(self):
         self.assertFalse(self.images_view.has_more_data(None))
 
-    @mock.patch.object(views, 'glance', autospec=True)
-    def test_get_data(self, mock_glance):
-        """Test that get_data works."""
-        foo_mock_image = self._get_mock_image('foo')
-        bar_mock_image = self._get_mock_image('bar')
-        # Filtered out by forms.filter_murano_images.
-        mock_image_to_filter = self._get_mock_image(None)
+    def _get_marked_images(self, *ids):
+        return [mock.Mock(id=image_id) for image_id in ids]
 
-        mock_glance_client = mock.Mock()
-        mock_glance_client.images.list.return_value = [
-            foo_mock_image, bar_mock_image, mock_image_to_filter]
-        mock_glance.glanceclient.return_value = mock_glance_client
+    @mock.patch.object(views.forms, 'get_marked_images')
+    def test_get_data(self, mock_get_marked_images):
+        """Test that get_data works."""
+        foo, bar, baz, qux = mock_get_marked_images.return_value = \
+            self._get_marked_images('foo', 'bar', 'baz', 'qux')
 
-        self.images_view.request.GET.get.return_value = 'foo_marker'
+        self.images_view.request.GET.get.return_value = 'qux'
         result = self.images_view.get_data()
 
-        expected_images = [bar_mock_image, foo_mock_image]
-        expected_kwargs = {
-            'filters': {},
-            'marker': 'foo_marker',
-            'sort_dir': 'asc'
-        }
-
-        self.assertEqual(expected_images, result)
+        self.assertEqual([bar, baz], result)
         self.assertTrue(self.images_view.has_more_data(None))
         self.assertTrue(self.images_view.has_prev_data(None))
-        mock_glance_client.images.list.assert_called_once_with(
-            **expected_kwargs)
+        mock_get_marked_images.assert_called_once_with(
+            self.images_view.request)
         self.images_view.request.GET.get.assert_called_once_with(
             tables.MarkedImagesTable._meta.prev_pagination_param, None)
-        mock_glance.glanceclient.assert_called_once_with(
-            self.images_view.request, "2")
 
-    @mock.patch.object(views, 'glance', autospec=True)
-    def test_get_data_with_desc_sort_dir(self, mock_glance):
+    @mock.patch.object(views.forms, 'get_marked_images')
+    def test_get_data_with_desc_sort_dir(self, mock_get_marked_images):
         """Test that sorting in descending order works."""
-        foo_mock_image = self._get_mock_image('foo')
-        bar_mock_image = self._get_mock_image('bar')
-
-        mock_glance_client = mock.Mock()
-        mock_glance_client.images.list.return_value = [
-            foo_mock_image, bar_mock_image]
-        mock_glance.glanceclient.return_value = mock_glance_client
+        foo, bar = mock_get_marked_images.return_value = \
+            self._get_marked_images('foo', 'bar')
 
         self.images_view.request.GET.get.return_value = None
         result = self.images_view.get_data()
 
-        expected_images = [foo_mock_image, bar_mock_image]
-        expected_kwargs = {
-            'filters': {},
-            'sort_dir': 'desc'
-        }
-
-        self.assertEqual(expected_images, result)
+        self.assertEqual([foo, bar], result)
         self.assertFalse(self.images_view.has_more_data(None))
         self.assertFalse(self.images_view.has_prev_data(None))
-        mock_glance_client.images.list.assert_called_once_with(
-            **expected_kwargs)
         self.images_view.request.GET.get.assert_has_calls([
             mock.call(tables.MarkedImagesTable._meta.prev_pagination_param,
                       None),
             mock.call(tables.MarkedImagesTable._meta.pagination_param, None)
         ])
-        mock_glance.glanceclient.assert_called_once_with(
-            self.images_view.request, "2")
 
-    @mock.patch.object(views, 'glance', autospec=True)
-    def test_get_data_with_more_results(self, mock_glance):
+    @mock.patch.object(views.forms, 'get_marked_images')
+    def test_get_data_with_more_results(self, mock_get_marked_images):
         """Test that extra results are not included in return value."""
-        foo_mock_image = self._get_mock_image('foo')
-        bar_mock_image = self._get_mock_image('bar')
-        extra_mock_image = self._get_mock_image('baz')  # Extra result.
-        # Filtered out by forms.filter_murano_images.
-        mock_image_to_filter = self._get_mock_image(None)
-
-        mock_glance_client = mock.Mock()
-        mock_glance_client.images.list.return_value = [
-            foo_mock_image, bar_mock_image, extra_mock_image,
-            mock_image_to_filter]
-        mock_glance.glanceclient.return_value = mock_glance_client
-
-        self.images_view.request.GET.get.return_value = 'foo_marker'
-        result = self.images_view.get_data()
+        foo, bar, baz, qux = mock_get_marked_images.return_value = \
+            self._get_marked_images('foo', 'bar', 'baz', 'qux')
 
-        # Extra result not included, and result should be reversed.
-        expected_images = [bar_mock_image, foo_mock_image]
-        expected_kwargs = {
-            'filters': {},
-            'marker': 'foo_marker',
-            'sort_dir': 'asc'
-        }
+        self.images_view.request.GET.get.side_effect = \
+            lambda param, default: (
+                'foo' if param ==
+                tables.MarkedImagesTable._meta.pagination_param else None)
+        result = self.images_view.get_data()
 
-        self.assertEqual(expected_images, result)
+        # Extra result not included
+        self.assertEqual([bar, baz], result)
         self.assertTrue(self.images_view.has_more_data(None))
         self.assertTrue(self.images_view.has_prev_data(None))
-        mock_glance_client.images.list.assert_called_once_with(
-            **expected_kwargs)
-        self.images_view.request.GET.get.assert_called_once_with(
-            tables.MarkedImagesTable._meta.prev_pagination_param, None)
-        mock_glance.glanceclient.assert_called_once_with(
-            self.images_view.request, "2")
+
+    @mock.patch.object(views.forms, 'get_marked_images')
+    def test_get_data_last_page(self, mock_get_marked_images):
+        foo, bar, baz = mock_get_marked_images.return_value = \
+            self._get_marked_images('foo', 'bar', 'baz')
+
+        self.images_view.request.GET.get.side_effect = \
+            lambda param, default: (
+                'bar' if param ==
+                tables.MarkedImagesTable._meta.pagination_param else None)
+        result = self.images_view.get_data()
+
+        self.assertEqual([baz], result)
+        self.assertFalse(self.images_view.has_more_data(None))
+        self.assertTrue(self.images_view.has_prev_data(None))
 
     @mock.patch.object(views, 'reverse', autospec=True)
-    @mock.patch.object(views, 'glance', autospec=True)
-    def test_get_data_except_glance_image_list_exception(self, mock_glance,
-                                                         mock_reverse):
-        """Test that glance_v1_client.images.list exception is handled."""
-        mock_glance_client = mock.Mock()
-        mock_glance_client.images.list.side_effect = Exception()
-        mock_glance.glanceclient.return_value = mock_glance_client
+    @mock.patch.object(views.forms, 'get_marked_images')
+    def test_get_data_except_glance_image_list_exception(
+            self, mock_get_marked_images, mock_reverse):
+        """Test that image listing exception is handled."""
+        mock_get_marked_images.side_effect = Exception()
         mock_reverse.return_value = 'foo_reverse_url'
         self.images_view.request.GET.get.return_value = None
 
@@ -175,7 +130,5 @@ class TestMarkedImagesView(unittest.TestCase):
         e = cm.exception
         self.assertEqual('foo_reverse_url', e.location)
 
-        mock_glance.glanceclient.assert_called_once_with(
-            self.images_view.request, "2")
         mock_reverse.assert_called_once_with(
             'horizon:app-catalog:catalog:index')
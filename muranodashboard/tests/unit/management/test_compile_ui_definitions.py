@@ -0,0 +1,59 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import six
+import unittest
+
+from django.core.management import base
+
+from muranodashboard.management.commands import compile_ui_definitions
+
+
+class TestCompileUIDefinitions(unittest.TestCase):
+
+    def setUp(self):
+        super(TestCompileUIDefinitions, self).setUp()
+        self.stderr = six.StringIO()
+        self.command = compile_ui_definitions.Command(
+            stdout=six.StringIO(), stderr=self.stderr)
+        self.command.get_request = mock.Mock(return_value='foo_request')
+
+    @mock.patch.object(compile_ui_definitions, 'pkg_api')
+    @mock.patch.object(compile_ui_definitions, 'api')
+    def test_handle_all_applications(self, mock_api, mock_pkg_api):
+        mock_api.muranoclient.return_value.packages.filter.return_value = [
+            mock.Mock(id='foo_app_id'), mock.Mock(id='bar_app_id')]
+
+        self.command.handle(app_ids=[])
+
+        mock_api.muranoclient.return_value.packages.filter.\
+            assert_called_once_with(type='Application', include_disabled=True)
+        mock_pkg_api.get_compiled_app_ui.assert_has_calls([
+            mock.call('foo_request', 'foo_app_id'),
+            mock.call('foo_request', 'bar_app_id')])
+        mock_pkg_api.validate_cache.assert_called_once_with(
+            mock_api.muranoclient.return_value.packages.filter.return_value)
+
+    @mock.patch.object(compile_ui_definitions, 'pkg_api')
+    @mock.patch.object(compile_ui_definitions, 'api')
+    def test_handle_failure(self, mock_api, mock_pkg_api):
+        mock_pkg_api.get_compiled_app_ui.side_effect = [
+            ValueError('Unsupported Dynamic UI format version'), None]
+
+        self.assertRaises(base.CommandError, self.command.handle,
+                          app_ids=['foo_app_id', 'bar_app_id'])
+        self.assertEqual(2, mock_pkg_api.get_compiled_app_ui.call_count)
+        self.assertFalse(mock_api.muranoclient.called)
+        mock_pkg_api.revalidate_cache.assert_called_once_with(
+            'foo_request', ['foo_app_id', 'bar_app_id'])
+        self.assertIn('foo_app_id', self.stderr.getvalue())
@@ -0,0 +1,87 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import six
+import unittest
+
+from django.core.management import base
+from muranoclient.common import exceptions as exc
+
+from muranodashboard.management.commands import warm_app_cache
+
+
+class TestWarmAppCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestWarmAppCache, self).setUp()
+        self.stdout = six.StringIO()
+        self.stderr = six.StringIO()
+        self.command = warm_app_cache.Command(stdout=self.stdout,
+                                              stderr=self.stderr)
+        self.command.get_request = mock.Mock(return_value='foo_request')
+
+        self.packages = [mock.Mock(id='foo_app_id'),
+                         mock.Mock(id='bar_app_id')]
+        for package, name in zip(self.packages, ('foo', 'bar')):
+            package.configure_mock(name=name)
+        patcher = mock.patch.object(warm_app_cache, 'pkg_api')
+        self.mock_pkg_api = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_pkg_api.package_list.return_value = (self.packages, False)
+
+    def _handle(self, **options):
+        defaults = {'concurrency': 2, 'compile': False, 'dry_run': False}
+        defaults.update(options)
+        self.command.handle(**defaults)
+
+    def test_handle(self):
+        self.mock_pkg_api.get_app_supplier_logo.side_effect = [
+            exc.HTTPNotFound(), b'foo']
+
+        self._handle()
+
+        self.mock_pkg_api.package_list.assert_called_once_with(
+            'foo_request', filters={'type': 'Application', 'catalog': True})
+        self.mock_pkg_api.validate_cache.assert_called_once_with(
+            self.packages)
+        for getter in (self.mock_pkg_api.get_app_ui,
+                       self.mock_pkg_api.get_app_logo,
+                       self.mock_pkg_api.get_package_details):
+            getter.assert_has_calls([mock.call('foo_request', 'foo_app_id'),
+                                     mock.call('foo_request', 'bar_app_id')],
+                                    any_order=True)
+        self.assertFalse(self.mock_pkg_api.get_compiled_app_ui.called)
+        output = self.stdout.getvalue()
+        self.assertIn('[1/2]', output)
+        self.assertIn('[2/2]', output)
+        self.assertIn('no supplier_logo', output)
+
+    def test_handle_compile(self):
+        self._handle(compile=True)
+
+        self.assertEqual(2, self.mock_pkg_api.get_compiled_app_ui.call_count)
+
+    def test_handle_dry_run(self):
+        self._handle(dry_run=True)
+
+        self.assertFalse(self.mock_pkg_api.get_app_ui.called)
+        # a dry run does not drop cached entries
+        self.assertFalse(self.mock_pkg_api.validate_cache.called)
+        self.assertIn('foo (foo_app_id): would fetch', self.stdout.getvalue())
+
+    def test_handle_failure(self):
+        self.mock_pkg_api.get_app_ui.side_effect = [exc.HTTPNotFound(), None]
+
+        self.assertRaises(base.CommandError, self._handle, concurrency=1)
+        self.assertIn('foo_app_id', self.stderr.getvalue())
+        self.assertEqual(1, self.mock_pkg_api.get_package_details.call_count)
@@ -151,6 +151,20 @@ class TestPackagesAPI(helpers.APITestCase):
         mock_get_ui.assert_called_once_with('foo_app_id', mock.ANY)
         self.assertEqual('Loader', mock_args[0][1].__name__)
 
+    @mock.patch('muranodashboard.common.cache._load_from_file',
+                return_value=None)
+    @mock.patch('muranodashboard.common.cache._save_to_file')
+    def test_get_compiled_app_ui(self, mock_save_to_file, *args):
+        mock_get_ui = packages.api.muranoclient().packages.get_ui
+        mock_get_ui.return_value = {'Application': {'foo': 'bar'}}
+
+        compiled_ui = packages.get_compiled_app_ui(None, 'foo_app_id')
+
+        self.assertEqual({'application': {'foo': 'bar'}},
+                         compiled_ui.get_sections())
+        saved_paths = [call[0][0] for call in mock_save_to_file.call_args_list]
+        self.assertTrue(any('ui_compiled' in path for path in saved_paths))
+
     @mock.patch('muranodashboard.common.cache._load_from_file',
                 return_value=None)
     @mock.patch('muranodashboard.common.cache._save_to_file')
@@ -163,6 +177,28 @@ class TestPackagesAPI(helpers.APITestCase):
         self.assertEqual(app_logo, 'foo_app_logo')
         mock_get_app_logo.assert_called_once_with('foo_app_id')
 
+    @mock.patch('muranodashboard.common.cache._load_from_file',
+                return_value=None)
+    @mock.patch('muranodashboard.common.cache._save_to_file')
+    @mock.patch.object(packages, 'logos')
+    def test_get_app_logo_scaled(self, mock_logos, mock_save_to_file, *args):
+        mock_logos.get_size.return_value = 140
+        mock_logos.scale.return_value = 'foo_scaled_logo'
+        mock_get_app_logo = packages.api.muranoclient().packages.get_logo
+        mock_get_app_logo.return_value = 'foo_app_logo'
+
+        app_logo = packages.get_app_logo(None, 'foo_app_id', size='130')
+
+        self.assertEqual('foo_scaled_logo', app_logo)
+        mock_logos.get_size.assert_called_once_with('130')
+        mock_logos.scale.assert_called_once_with('foo_app_logo', 140)
+        saved_paths = [call[0][0] for call in mock_save_to_file.call_args_list]
+        self.assertTrue(any('logo-140' in path for path in saved_paths))
+
+        mock_logos.can_scale.return_value = False
+        self.assertEqual('foo_app_logo',
+                         packages.get_app_logo(None, 'foo_app_id', size='130'))
+
     @mock.patch('muranodashboard.common.cache._load_from_file',
                 return_value=None)
     @mock.patch('muranodashboard.common.cache._save_to_file')
@@ -215,3 +251,51 @@ class TestPackagesAPI(helpers.APITestCase):
 
         self.assertEqual(app_details, mock_app)
         mock_get_app.assert_called_once_with('foo_app_id')
+
+    @mock.patch.object(packages, 'cache')
+    def test_validate_cache(self, mock_cache):
+        packages.validate_cache([
+            mock.Mock(id='foo_app_id', updated='2016-01-01T00:00:00'),
+            mock.Mock(id='bar_app_id', updated=None)])
+
+        mock_cache.validate.assert_called_once_with('foo_app_id',
+                                                    '2016-01-01T00:00:00')
+
+    @mock.patch.object(packages, 'cache')
+    def test_validate_cache_failure(self, mock_cache):
+        mock_cache.validate.side_effect = [OSError(), None]
+
+        packages.validate_cache([
+            mock.Mock(id='foo_app_id', updated='2016-01-01T00:00:00'),
+            mock.Mock(id='bar_app_id', updated='2016-01-02T00:00:00')])
+
+        mock_cache.validate.assert_called_with('bar_app_id',
+                                               '2016-01-02T00:00:00')
+
+    @mock.patch.object(packages, 'categories_api')
+    @mock.patch.object(packages, 'catalog_index')
+    @mock.patch.object(packages, 'cache')
+    def test_invalidate_cache_failure(self, mock_cache, mock_catalog_index,
+                                      mock_categories_api):
+        # the package is changed already, so a failing cache is not fatal
+        mock_cache.invalidate.side_effect = OSError()
+
+        packages.invalidate_cache('foo_app_id')
+
+        mock_cache.invalidate.assert_called_once_with('foo_app_id')
+        mock_catalog_index.invalidate.assert_called_once_with()
+        mock_categories_api.invalidate_cache.assert_called_once_with()
+
+    @mock.patch.object(packages, 'cache')
+    def test_revalidate_cache(self, mock_cache):
+        self.mock_client.packages.filter.return_value = [
+            mock.Mock(id='foo_app_id', updated='2016-01-01T00:00:00')]
+
+        packages.revalidate_cache(self.mock_request,
+                                  ['foo_app_id', 'bar_app_id'])
+
+        self.mock_client.packages.filter.assert_called_once_with(
+            id='in:bar_app_id,foo_app_id', include_disabled=True)
+        mock_cache.validate.assert_called_once_with('foo_app_id',
+                                                    '2016-01-01T00:00:00')
+        mock_cache.invalidate.assert_called_once_with('bar_app_id')
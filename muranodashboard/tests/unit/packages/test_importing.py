@@ -0,0 +1,85 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import mock
+import unittest
+
+from muranodashboard.packages import importing
+
+
+def _make_package(name, requires=None):
+    package = mock.Mock(name=name)
+    package.manifest = {'FullName': name, 'Require': requires}
+    return package
+
+
+class TestImporting(unittest.TestCase):
+
+    def setUp(self):
+        super(TestImporting, self).setUp()
+        self.packages = dict(
+            (name, _make_package(name, requires)) for name, requires in (
+                ('foo', {'lib': None, 'bar': '1.0'}),
+                ('bar', {'lib': '2.0'}),
+                ('lib', {'core': None, 'missing': None}),
+                ('core', None)))
+
+        def from_location(name, **kwargs):
+            if name not in self.packages:
+                raise ValueError(name)
+            return self.packages[name]
+
+        patcher = mock.patch.object(importing, 'muranoclient_utils')
+        self.mock_utils = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_utils.Package.from_location.side_effect = from_location
+
+    def test_download(self):
+        results = importing.download(
+            [{'Name': 'foo', 'Version': '1.0', 'Url': 'foo_url'},
+             {'Name': 'baz'}], 'base_url', 2)
+
+        self.assertEqual(self.packages['foo'], results[0].get())
+        self.assertRaises(ValueError, results[1].get)
+        self.mock_utils.Package.from_location.assert_any_call(
+            'foo', version='1.0', url='foo_url', base_url='base_url',
+            path=None)
+
+    def test_resolve(self):
+        resolved, graph = importing.resolve(
+            [self.packages['foo'], self.packages['bar']], 'base_url', 2)
+
+        self.assertEqual(['foo', 'bar', 'lib', 'core'], list(resolved))
+        self.assertEqual({'foo': ['lib', 'bar'], 'bar': ['lib'],
+                          'lib': ['core'], 'core': []},
+                         dict((name, sorted(deps, reverse=True))
+                              for name, deps in graph.items()))
+        # every required package is downloaded once
+        self.assertEqual(
+            ['core', 'lib', 'missing'],
+            sorted(args[0][0] for args in
+                   self.mock_utils.Package.from_location.call_args_list))
+
+    def test_get_levels(self):
+        graph = {'foo': ['lib', 'bar'], 'bar': ['lib'], 'lib': ['core'],
+                 'core': [], 'baz': ['core']}
+
+        self.assertEqual([['core'], ['lib', 'baz'], ['bar'], ['foo']],
+                         importing.get_levels(
+                             ['foo', 'bar', 'lib', 'baz', 'core'], graph))
+
+    def test_get_levels_cycle(self):
+        graph = {'foo': ['bar'], 'bar': ['foo', 'baz'], 'baz': []}
+
+        self.assertEqual([['baz'], ['foo'], ['bar']],
+                         importing.get_levels(['foo', 'bar', 'baz'], graph))
@@ -0,0 +1,183 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import unittest
+
+from django.core import cache as django_cache
+from django.test import utils as test_utils
+
+from muranodashboard.packages import jobs
+
+
+def _make_request(user_id='foo_user', tenant_id='foo_tenant'):
+    return mock.Mock(user=mock.Mock(id=user_id, tenant_id=tenant_id))
+
+
+class _CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(_CacheTestCase, self).setUp()
+        override = test_utils.override_settings(
+            MURANO_IMPORT_JOB_TTL=60,
+            CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'murano-import-jobs'}})
+        override.enable()
+        self.addCleanup(override.disable)
+        django_cache.caches['default'].clear()
+
+
+class TestJob(_CacheTestCase):
+
+    def setUp(self):
+        super(TestJob, self).setUp()
+        self.job = jobs.Job(('foo_user', 'foo_tenant'))
+
+    def _get(self):
+        return jobs.get(_make_request(), self.job.id)
+
+    def test_to_dict(self):
+        self.job.set_package('foo', jobs.PENDING)
+        self.job.set_package('bar', jobs.UPLOADING)
+        self.job.set_package('foo', jobs.FAILED, 'baz')
+        self.job.add_images('bar', [{'id': 'foo_image', 'name': 'foo.qcow2'},
+                                    {'id': 'bar_image', 'name': 'bar.qcow2',
+                                     'status': 'active'}])
+
+        job = self._get().to_dict()
+
+        self.assertEqual(self.job.id, job['id'])
+        self.assertEqual(jobs.RUNNING, job['state'])
+        self.assertEqual(
+            [{'name': 'foo', 'state': jobs.FAILED, 'details': 'baz'},
+             {'name': 'bar', 'state': jobs.UPLOADING, 'details': None}],
+            job['packages'])
+        self.assertEqual(
+            [{'id': 'foo_image', 'name': 'foo.qcow2', 'package': 'bar',
+              'state': 'queued'},
+             {'id': 'bar_image', 'name': 'bar.qcow2', 'package': 'bar',
+              'state': 'active'}],
+            job['images'])
+
+    def test_get_pending_images(self):
+        self.job.add_images('foo', [{'id': 'foo_image', 'name': 'foo'},
+                                    {'id': 'bar_image', 'name': 'bar'}])
+        job = self._get()
+        self.assertEqual(['foo_image', 'bar_image'],
+                         job.get_pending_images())
+
+        job.set_image_state('foo_image', 'active')
+        self.assertEqual(['bar_image'], job.get_pending_images())
+        # image states looked up by a poll are seen by the next ones
+        self.assertEqual(['foo_image', 'bar_image'],
+                         self._get().get_pending_images())
+        job.save()
+        self.assertEqual(['bar_image'], self._get().get_pending_images())
+        self.assertEqual('active', self._get().to_dict()['images'][0]['state'])
+
+    def test_pop_messages_and_apps(self):
+        self.job.add_message('warning', 'foo')
+        self.job.add_message('error', 'bar')
+        self.job.add_app('foo_app_id')
+
+        job = self._get()
+        self.assertEqual([('warning', 'foo'), ('error', 'bar')],
+                         job.pop_messages())
+        self.assertEqual([], job.pop_messages())
+        self.assertEqual(['foo_app_id'], job.pop_apps())
+        self.assertEqual([], job.pop_apps())
+        job.save()
+
+        self.job.add_message('success', 'baz')
+        job = self._get()
+        self.assertEqual([('success', 'baz')], job.pop_messages())
+        self.assertEqual([], job.pop_apps())
+
+    def test_finish(self):
+        self.job.finish(False)
+
+        self.assertEqual(jobs.FAILED, self.job.state)
+        self.assertEqual(jobs.FAILED, self._get().state)
+
+    @mock.patch.object(jobs, '_get_cache')
+    def test_save(self, mock_get_cache):
+        self.job.add_app('foo_app_id')
+
+        mock_get_cache().set.assert_called_once_with(
+            'murano-import-job:' + self.job.id, self.job.to_record(), 60)
+
+
+class TestJobs(_CacheTestCase):
+
+    def setUp(self):
+        super(TestJobs, self).setUp()
+        # jobs are run right away instead of being queued to the pool
+        patcher = mock.patch.object(jobs, '_POOL')
+        mock_pool = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_pool.apply_async.side_effect = lambda func, args: func(*args)
+
+    def test_start(self):
+        func = mock.Mock()
+        request = _make_request()
+
+        job = jobs.start(request, func)
+
+        func.assert_called_once_with(job)
+        self.assertEqual(jobs.FINISHED, job.state)
+        self.assertEqual(jobs.FINISHED, jobs.get(request, job.id).state)
+
+    def test_start_failure(self):
+        request = _make_request()
+        job = jobs.start(request, mock.Mock(side_effect=ValueError('foo')))
+
+        self.assertEqual(jobs.FAILED, job.state)
+        self.assertEqual([('error', 'foo')],
+                         jobs.get(request, job.id).pop_messages())
+
+    def test_get_other_owner(self):
+        job = jobs.start(_make_request(), mock.Mock())
+
+        self.assertIsNone(jobs.get(_make_request(user_id='bar_user'),
+                                   job.id))
+        self.assertIsNone(jobs.get(_make_request(tenant_id='bar_tenant'),
+                                   job.id))
+        self.assertIsNone(jobs.get(_make_request(), 'bar_job'))
+        self.assertIsNone(jobs.get(_make_request(), 'f' * 32))
+
+    def test_detach_request(self):
+        request = _make_request()
+        request.session = {'token': 'foo_token'}
+
+        clone = jobs.detach_request(request)
+        clone.user.services_region = 'RegionTwo'
+        clone.session['latest_apps'] = ['foo_app_id']
+
+        self.assertEqual('foo_user', clone.user.id)
+        self.assertEqual('foo_token', clone.session['token'])
+        self.assertNotEqual('RegionTwo', request.user.services_region)
+        self.assertEqual({'token': 'foo_token'}, request.session)
+
+    def test_is_enabled(self):
+        self.assertFalse(jobs.is_enabled())
+
+        with test_utils.override_settings(MURANO_ASYNC_PACKAGE_IMPORT=True):
+            # the cache of the test is local to the process
+            self.assertFalse(jobs.is_enabled())
+
+        with test_utils.override_settings(
+                MURANO_ASYNC_PACKAGE_IMPORT=True,
+                CACHES={'default': {
+                    'BACKEND': 'django.core.cache.backends.memcached.'
+                               'MemcachedCache'}}):
+            self.assertTrue(jobs.is_enabled())
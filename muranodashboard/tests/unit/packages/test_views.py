@@ -12,6 +12,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+
 from django.core.files import storage
 from django import http
 from django.utils.translation import ugettext_lazy as _
@@ -23,6 +25,7 @@ from muranoclient.common import exceptions as exc
 
 from muranodashboard.packages import consts as packages_consts
 from muranodashboard.packages import forms
+from muranodashboard.packages import importing
 from muranodashboard.packages import tables
 from muranodashboard.packages import views
 
@@ -542,6 +545,32 @@ class TestImportPackageWizard(helpers.APITestCase):
         mock_messages.success.assert_any_call(
             self.mock_request, 'Package foo uploaded')
 
+    @mock.patch.object(views, 'jobs')
+    @mock.patch.object(views, 'glance')
+    @mock.patch.object(views, 'messages')
+    @mock.patch.object(views, 'api')
+    @mock.patch.object(views, 'muranoclient_utils')
+    def test_process_step_async_enabled(self, mock_murano_utils, mock_api,
+                                        mock_messages, mock_glance,
+                                        mock_jobs):
+        # the following steps need the package, so it is uploaded right away
+        mock_jobs.is_enabled.return_value = True
+        mock_package = mock.Mock(manifest={'FullName': 'foo'})
+        mock_package.requirements.return_value = {'foo': mock.Mock()}
+        mock_murano_utils.Package.from_file.return_value = mock_package
+        mock_murano_utils.ensure_images.return_value = []
+        mock_result_package = mock.Mock(id='result_package_id')
+        mock_api.muranoclient().packages.create.return_value = \
+            mock_result_package
+        mock_form = mock.Mock(data={}, cleaned_data={
+            'import_type': 'upload',
+            'package': mock.Mock(file='test_package_file')})
+
+        step_data = self.import_pkg_wizard.process_step(mock_form)
+
+        self.assertEqual(mock_result_package, step_data['package'])
+        self.assertFalse(mock_jobs.start.called)
+
     @mock.patch.object(views, 'reverse')
     @mock.patch.object(views, 'LOG')
     @mock.patch.object(views, 'muranoclient_utils')
@@ -850,22 +879,39 @@ class TestImportBundleWizard(helpers.APITestCase):
             self.assertIn(key, initial_dict)
             self.assertEqual(val, initial_dict[key])
 
+    def _make_package(self, name, requires=None):
+        package = mock.Mock(name=name)
+        package.manifest = {'FullName': name, 'Require': requires or {}}
+        return package
+
+    def _mock_packages(self, *packages):
+        by_name = dict((package.manifest['FullName'], package)
+                       for package in packages)
+        specs = [{'Name': name, 'Version': '1.0.0', 'Url': None}
+                 for name in sorted(by_name)
+                 if name.endswith('_spec')]
+
+        def from_location(name, **kwargs):
+            return by_name[name]
+
+        mock_utils = mock.patch.object(importing,
+                                       'muranoclient_utils').start()
+        mock_utils.Package.from_location.side_effect = from_location
+        mock_bundle = mock.Mock()
+        mock_bundle.package_specs.return_value = specs
+        return mock_utils, mock_bundle
+
     @mock.patch.object(views, 'api')
     @mock.patch.object(views, 'muranoclient_utils')
     @mock.patch.object(views, 'glance')
     def test_process_step(self, mock_glance, mock_murano_utils, mock_api):
-        mock_bundle = mock.Mock()
-        mock_bundle.package_specs.return_value = [
-            {'Name': 'foo_spec', 'Version': '1.0.0', 'Url': 'www.foo.com'},
-            {'Name': 'bar_spec', 'Version': '2.0.0', 'Url': 'www.bar.com'}
-        ]
-        mock_package = mock.Mock()
-        mock_foo_dependency = mock.Mock(name='foo_package')
-        mock_bar_dependency = mock.Mock(name='bar_package')
-        mock_package.requirements.return_value = {
-            'foo_package': mock_foo_dependency,
-            'bar_package': mock_bar_dependency
-        }
+        mock_common_package = self._make_package('common_package')
+        mock_foo_package = self._make_package(
+            'foo_spec', {'common_package': '>=1.0'})
+        mock_bar_package = self._make_package(
+            'bar_spec', {'common_package': '>=1.0', 'foo_spec': None})
+        mock_importing_utils, mock_bundle = self._mock_packages(
+            mock_common_package, mock_foo_package, mock_bar_package)
         mock_murano_utils.to_url.return_value = 'test_url'
         mock_form = mock.Mock()
 
@@ -877,27 +923,35 @@ class TestImportBundleWizard(helpers.APITestCase):
             }
 
             mock_murano_utils.Bundle.from_file.return_value = mock_bundle
-            mock_murano_utils.Package.from_location.return_value = mock_package
 
             step_data = self.import_bundle_wizard.process_step(mock_form)
             self.assertEqual('test_step_form_data', step_data)
 
             mock_murano_utils.Bundle.from_file.assert_called_once_with(
                 'test_url')
-            mock_murano_utils.Package.from_location.assert_any_call(
-                'foo_spec', version='1.0.0', url='www.foo.com',
-                base_url=packages_consts.MURANO_REPO_URL, path=None
-            )
-            mock_murano_utils.Package.from_location.assert_any_call(
-                'bar_spec', version='2.0.0', url='www.bar.com',
-                base_url=packages_consts.MURANO_REPO_URL, path=None
-            )
-            mock_api.muranoclient().packages.create.assert_any_call(
-                {}, {'foo_package': mock_foo_dependency.file()})
-            mock_api.muranoclient().packages.create.assert_any_call(
-                {}, {'bar_package': mock_bar_dependency.file()})
+            # every package is downloaded once
+            mock_importing_utils.Package.from_location.assert_has_calls([
+                mock.call('bar_spec', version='1.0.0', url=None,
+                          base_url=packages_consts.MURANO_REPO_URL,
+                          path=None),
+                mock.call('foo_spec', version='1.0.0', url=None,
+                          base_url=packages_consts.MURANO_REPO_URL,
+                          path=None),
+                mock.call('common_package', version='>=1.0', url=None,
+                          base_url=packages_consts.MURANO_REPO_URL,
+                          path=None)], any_order=True)
+            self.assertEqual(
+                3, mock_importing_utils.Package.from_location.call_count)
+            # and uploaded once, after the packages it requires
+            self.assertEqual(
+                [mock.call({}, {'common_package':
+                                mock_common_package.file()}),
+                 mock.call({}, {'foo_spec': mock_foo_package.file()}),
+                 mock.call({}, {'bar_spec': mock_bar_package.file()})],
+                mock_api.muranoclient().packages.create.call_args_list)
 
             mock_murano_utils.reset_mock()
+            mock_importing_utils.reset_mock()
             mock_api.reset_mock()
 
     @mock.patch.object(views, 'reverse')
@@ -939,14 +993,12 @@ class TestImportBundleWizard(helpers.APITestCase):
             self, mock_murano_utils, mock_log, mock_messages):
         mock_form = mock.Mock(
             cleaned_data={'import_type': 'by_url', 'url': 'foo_url'})
-        mock_bundle = mock.Mock()
-        mock_bundle.package_specs.return_value = [
-            {'Name': 'foo_spec', 'Version': '1.0.0', 'Url': 'www.foo.com'},
-            {'Name': 'bar_spec', 'Version': '2.0.0', 'Url': 'www.bar.com'}
-        ]
+        mock_importing_utils, mock_bundle = self._mock_packages(
+            self._make_package('foo_spec'), self._make_package('bar_spec'))
 
         mock_murano_utils.Bundle.from_file.return_value = mock_bundle
-        mock_murano_utils.Package.from_location.side_effect = Exception('foo')
+        mock_importing_utils.Package.from_location.side_effect =\
+            Exception('foo')
 
         self.import_bundle_wizard.process_step(mock_form)
 
@@ -957,6 +1009,18 @@ class TestImportBundleWizard(helpers.APITestCase):
             mock_messages.error.assert_any_call(
                 self.mock_request, expected_error_message)
 
+    def _test_process_step_upload_failure(self, mock_murano_utils,
+                                          mock_create):
+        mock_form = mock.Mock(
+            cleaned_data={'import_type': 'by_url', 'url': 'foo_url'})
+        mock_importing_utils, mock_bundle = self._mock_packages(
+            self._make_package('foo_spec'), self._make_package('bar_spec'))
+        mock_murano_utils.Bundle.from_file.return_value = mock_bundle
+
+        self.import_bundle_wizard.process_step(mock_form)
+
+        self.assertEqual(2, mock_create.call_count)
+
     @mock.patch.object(views, 'messages')
     @mock.patch.object(views, 'LOG')
     @mock.patch.object(views, 'api')
@@ -965,28 +1029,12 @@ class TestImportBundleWizard(helpers.APITestCase):
     def test_process_step_except_http_conflict(
             self, mock_glance, mock_murano_utils, mock_api, mock_log,
             mock_messages):
-        mock_form = mock.Mock(
-            cleaned_data={'import_type': 'by_url', 'url': 'foo_url'})
-        mock_bundle = mock.Mock()
-        mock_bundle.package_specs.return_value = [
-            {'Name': 'foo_spec', 'Version': '1.0.0', 'Url': 'www.foo.com'},
-            {'Name': 'bar_spec', 'Version': '2.0.0', 'Url': 'www.bar.com'}
-        ]
-        mock_foo_dependency = mock.Mock(name='foo_package')
-        mock_bar_dependency = mock.Mock(name='bar_package')
-        mock_package = mock.Mock()
-        mock_package.requirements.return_value = {
-            'foo_package': mock_foo_dependency,
-            'bar_package': mock_bar_dependency
-        }
-
-        mock_murano_utils.Bundle.from_file.return_value = mock_bundle
-        mock_murano_utils.Package.from_location.return_value = mock_package
         mock_api.muranoclient().packages.create.side_effect = exc.HTTPConflict
 
-        self.import_bundle_wizard.process_step(mock_form)
+        self._test_process_step_upload_failure(
+            mock_murano_utils, mock_api.muranoclient().packages.create)
 
-        for dep in ('foo_package', 'bar_package'):
+        for dep in ('foo_spec', 'bar_spec'):
             expected_error_message = 'Package {0} already registered.'\
                                      .format(dep)
             mock_log.exception.assert_any_call(expected_error_message)
@@ -1002,30 +1050,14 @@ class TestImportBundleWizard(helpers.APITestCase):
     def test_process_step_except_http_exception(
             self, mock_glance, mock_murano_utils, mock_dashboard_utils,
             mock_api, mock_log, mock_messages):
-        mock_form = mock.Mock(
-            cleaned_data={'import_type': 'by_url', 'url': 'foo_url'})
-        mock_bundle = mock.Mock()
-        mock_bundle.package_specs.return_value = [
-            {'Name': 'foo_spec', 'Version': '1.0.0', 'Url': 'www.foo.com'},
-            {'Name': 'bar_spec', 'Version': '2.0.0', 'Url': 'www.bar.com'}
-        ]
-        mock_foo_dependency = mock.Mock(name='foo_package')
-        mock_bar_dependency = mock.Mock(name='bar_package')
-        mock_package = mock.Mock()
-        mock_package.requirements.return_value = {
-            'foo_package': mock_foo_dependency,
-            'bar_package': mock_bar_dependency
-        }
-
-        mock_murano_utils.Bundle.from_file.return_value = mock_bundle
-        mock_murano_utils.Package.from_location.return_value = mock_package
         mock_api.muranoclient().packages.create.side_effect =\
             exc.HTTPException('foo')
         mock_dashboard_utils.parse_api_error.return_value = 'foo'
 
-        self.import_bundle_wizard.process_step(mock_form)
+        self._test_process_step_upload_failure(
+            mock_murano_utils, mock_api.muranoclient().packages.create)
 
-        for dep in ('foo_package', 'bar_package'):
+        for dep in ('foo_spec', 'bar_spec'):
             expected_error_message = 'Package {0} upload failed. foo'\
                                      .format(dep)
             mock_log.exception.assert_any_call(expected_error_message)
@@ -1040,29 +1072,13 @@ class TestImportBundleWizard(helpers.APITestCase):
     def test_process_step_except_package_create_exception(
             self, mock_glance, mock_murano_utils, mock_api, mock_log,
             mock_messages):
-        mock_form = mock.Mock(
-            cleaned_data={'import_type': 'by_url', 'url': 'foo_url'})
-        mock_bundle = mock.Mock()
-        mock_bundle.package_specs.return_value = [
-            {'Name': 'foo_spec', 'Version': '1.0.0', 'Url': 'www.foo.com'},
-            {'Name': 'bar_spec', 'Version': '2.0.0', 'Url': 'www.bar.com'}
-        ]
-        mock_foo_dependency = mock.Mock(name='foo_package')
-        mock_bar_dependency = mock.Mock(name='bar_package')
-        mock_package = mock.Mock()
-        mock_package.requirements.return_value = {
-            'foo_package': mock_foo_dependency,
-            'bar_package': mock_bar_dependency
-        }
-
-        mock_murano_utils.Bundle.from_file.return_value = mock_bundle
-        mock_murano_utils.Package.from_location.return_value = mock_package
         mock_api.muranoclient().packages.create.side_effect =\
             Exception('foo')
 
-        self.import_bundle_wizard.process_step(mock_form)
+        self._test_process_step_upload_failure(
+            mock_murano_utils, mock_api.muranoclient().packages.create)
 
-        for dep in ('foo_package', 'bar_package'):
+        for dep in ('foo_spec', 'bar_spec'):
             expected_error_message = 'Importing package {0} failed. '\
                                      'Reason: foo'.format(dep)
             mock_log.exception.assert_any_call(expected_error_message)
@@ -1085,6 +1101,110 @@ class TestImportBundleWizard(helpers.APITestCase):
         mock_reverse.assert_called_once_with(
             'horizon:app-catalog:packages:index')
 
+    @mock.patch.object(views, 'jobs')
+    @mock.patch.object(views, '_import_bundle')
+    @mock.patch.object(views, 'muranoclient_utils')
+    def test_process_step_async(self, mock_murano_utils, mock_import_bundle,
+                                mock_jobs):
+        mock_jobs.is_enabled.return_value = True
+        mock_jobs.start.return_value = mock.Mock(id='foo_job_id')
+        mock_form = mock.Mock(cleaned_data={'import_type': 'by_url',
+                                            'url': 'test_url'})
+
+        step_data = self.import_bundle_wizard.process_step(mock_form)
+
+        self.assertEqual('test_step_form_data', step_data)
+        self.assertFalse(mock_import_bundle.called)
+        mock_jobs.start.assert_called_once_with(self.mock_request, mock.ANY)
+        self.assertEqual('foo_job_id', self.import_bundle_wizard.storage.
+                         extra_data['import_job_id'])
+
+        # the job imports the bundle with a copy of the request, reporting
+        # to itself
+        func = mock_jobs.start.call_args[0][1]
+        func('foo_job')
+        mock_jobs.detach_request.assert_called_once_with(self.mock_request)
+        mock_import_bundle.assert_called_once_with(
+            mock_jobs.detach_request.return_value,
+            mock_murano_utils.Bundle.from_file(),
+            packages_consts.MURANO_REPO_URL, 'foo_job')
+
+    @mock.patch.object(views, 'messages')
+    @mock.patch.object(views, 'reverse')
+    def test_done_async(self, mock_reverse, mock_messages):
+        mock_reverse.return_value = 'test_redirect'
+        self.import_bundle_wizard.storage.extra_data = {
+            'import_job_id': 'foo_job_id'}
+
+        result = self.import_bundle_wizard.done([])
+
+        self.assertIsInstance(result, http.response.HttpResponseRedirect)
+        self.assertEqual('test_redirect', result.url)
+        mock_messages.info.assert_called_once_with(
+            self.mock_request, 'Bundle import started.')
+        mock_reverse.assert_called_once_with(
+            'horizon:app-catalog:packages:import_progress',
+            args=('foo_job_id',))
+
+
+class TestImportJobViews(helpers.APITestCase):
+
+    def setUp(self):
+        super(TestImportJobViews, self).setUp()
+        self.mock_request = mock.Mock()
+        self.job = mock.Mock()
+        self.job.get_pending_images.return_value = ['foo_image', 'bar_image']
+        self.job.pop_messages.return_value = [('warning', 'foo')]
+        self.job.pop_apps.return_value = ['foo_app_id']
+        self.job.to_dict.return_value = {'id': 'foo_job_id',
+                                         'state': 'running'}
+        self.mock_jobs = mock.patch.object(views, 'jobs').start()
+        self.mock_jobs.get.return_value = self.job
+        self.addCleanup(mock.patch.stopall)
+
+    @mock.patch.object(views, '_update_latest_apps')
+    @mock.patch.object(views, 'messages')
+    @mock.patch.object(views, 'glance')
+    def test_get_import_job(self, mock_glance, mock_messages,
+                            mock_update_latest_apps):
+        mock_glance.image_get.side_effect = [mock.Mock(status='active'),
+                                             Exception('bar')]
+
+        response = views.get_import_job(self.mock_request, 'foo_job_id')
+
+        self.assertEqual('application/json', response['Content-Type'])
+        self.assertEqual({'id': 'foo_job_id', 'state': 'running'},
+                         json.loads(response.content.decode('utf-8')))
+        self.mock_jobs.get.assert_called_once_with(self.mock_request,
+                                                   'foo_job_id')
+        # images failed to be looked up are left pending
+        self.job.set_image_state.assert_called_once_with('foo_image',
+                                                         'active')
+        mock_messages.warning.assert_called_once_with(self.mock_request,
+                                                      'foo')
+        mock_update_latest_apps.assert_called_once_with(
+            request=self.mock_request, app_id='foo_app_id')
+        self.job.save.assert_called_once_with()
+
+    def test_get_import_job_not_found(self):
+        self.mock_jobs.get.return_value = None
+
+        self.assertRaises(http.Http404, views.get_import_job,
+                          self.mock_request, 'foo_job_id')
+
+    def test_import_progress_view(self):
+        view = views.ImportProgressView()
+        view.request = self.mock_request
+        view.kwargs = {'job_id': 'foo_job_id'}
+
+        context = view.get_context_data()
+
+        self.assertEqual({'id': 'foo_job_id', 'state': 'running'},
+                         context['job'])
+
+        self.mock_jobs.get.return_value = None
+        self.assertRaises(http.Http404, view.get_context_data)
+
 
 class TestPackageDefinitionsView(helpers.APITestCase):
 
@@ -1133,15 +1253,12 @@ class TestPackageDefinitionsView(helpers.APITestCase):
 
         self.assertEqual([mock_package], packages)
         self.assertEqual('foo_tenant_name', mock_package.tenant_name)
-        self.assertTrue(self.pkg_definitions_view.has_prev_data)
-        mock_pkg_api.package_list.assert_any_call(
+        self.assertFalse(self.pkg_definitions_view.has_prev_data(None))
+        self.assertTrue(self.pkg_definitions_view.has_more_data(None))
+        mock_pkg_api.package_list.assert_called_once_with(
             self.mock_request, marker=None,
-            filters={'include_disabled': True, 'sort_dir': 'desc'},
+            filters={'include_disabled': True, 'sort_dir': 'asc'},
             paginate=True, page_size=123)
-        mock_pkg_api.package_list.assert_any_call(
-            self.mock_request, marker='foo_package',
-            filters={'include_disabled': True, 'sort_dir': 'desc'},
-            paginate=True, page_size=0)
 
     @mock.patch.object(views, 'pkg_api')
     def test_get_data_with_different_tenants(self, mock_pkg_api):
@@ -1157,71 +1274,35 @@ class TestPackageDefinitionsView(helpers.APITestCase):
 
         self.assertEqual([mock_package], packages)
         self.assertEqual('UNKNOWN', mock_package.tenant_name)
-        self.assertTrue(self.pkg_definitions_view.has_prev_data)
-        mock_pkg_api.package_list.assert_any_call(
+        self.assertFalse(self.pkg_definitions_view.has_prev_data(None))
+        self.assertTrue(self.pkg_definitions_view.has_more_data(None))
+        mock_pkg_api.package_list.assert_called_once_with(
             self.mock_request, marker=None,
-            filters={'include_disabled': True, 'sort_dir': 'desc'},
+            filters={'include_disabled': True, 'sort_dir': 'asc'},
             paginate=True, page_size=123)
-        mock_pkg_api.package_list.assert_any_call(
-            self.mock_request, marker='foo_package',
-            filters={'include_disabled': True, 'sort_dir': 'desc'},
-            paginate=True, page_size=0)
 
-    @mock.patch.object(views, 'keystone')
+    @mock.patch.object(views, 'resources')
     @mock.patch.object(views, 'pkg_api')
-    def test_get_data_as_superuser(self, mock_pkg_api, mock_keystone):
-        mock_keystone.tenant_list.side_effect = None
-        super_user_tenant = mock.Mock(id='super_tenant_id')
-        super_user_tenant.configure_mock(name='super_tenant_name')
-        mock_keystone.tenant_list.return_value = ([super_user_tenant], False)
+    def test_get_data_as_superuser(self, mock_pkg_api, mock_resources):
+        mock_resources.project_names.return_value = {
+            'super_tenant_id': 'super_tenant_name'}
         mock_package = mock.Mock(
             id='foo_package', owner_id='super_tenant_id', tenant_name=None)
+        mock_unknown_package = mock.Mock(
+            id='bar_package', owner_id='bar_tenant_id', tenant_name=None)
         mock_pkg_api.package_list.return_value =\
-            ([mock_package], True)
-        mock_tenant = mock.MagicMock()
-        mock_tenant.__getitem__.side_effect = [
-            'test_tenant', 'foo_tenant_name'
-        ]
+            ([mock_package, mock_unknown_package], True)
 
         self.pkg_definitions_view.request.user.is_superuser = True
-        self.pkg_definitions_view.request.session['token'] =\
-            mock.Mock(tenant=mock_tenant)
 
         packages = self.pkg_definitions_view.get_data()
 
-        self.assertEqual([mock_package], packages)
+        self.assertEqual([mock_package, mock_unknown_package], packages)
         self.assertEqual('super_tenant_name', mock_package.tenant_name)
-        self.assertTrue(self.pkg_definitions_view.has_more_data)
-
-    @mock.patch.object(views, 'exceptions')
-    @mock.patch.object(views, 'keystone')
-    @mock.patch.object(views, 'pkg_api')
-    def test_get_data_except_keystone_exception(self, mock_pkg_api,
-                                                mock_keystone, mock_exc):
-        mock_keystone.tenant_list.side_effect = Exception
-        super_user_tenant = mock.Mock(id='super_tenant_id')
-        super_user_tenant.configure_mock(name='super_tenant_name')
-        mock_keystone.tenant_list.return_value = ([super_user_tenant], False)
-        mock_package = mock.Mock(
-            id='foo_package', owner_id='super_tenant_id', tenant_name=None)
-        mock_pkg_api.package_list.return_value =\
-            ([mock_package], True)
-        mock_tenant = mock.MagicMock()
-        mock_tenant.__getitem__.side_effect = [
-            'test_tenant', 'foo_tenant_name'
-        ]
-
-        self.pkg_definitions_view.request.user.is_superuser = True
-        self.pkg_definitions_view.request.session['token'] =\
-            mock.Mock(tenant=mock_tenant)
-
-        packages = self.pkg_definitions_view.get_data()
-
-        self.assertEqual([mock_package], packages)
-        self.assertIsNone(mock_package.tenant_name)
-        self.assertTrue(self.pkg_definitions_view.has_more_data)
-        mock_exc.handle.assert_called_once_with(
-            self.mock_request, "Unable to retrieve project list.")
+        self.assertIsNone(mock_unknown_package.tenant_name)
+        self.assertTrue(self.pkg_definitions_view.has_more_data(None))
+        mock_resources.project_names.assert_called_once_with(
+            self.mock_request, ['super_tenant_id', 'bar_tenant_id'])
 
     @mock.patch.object(views, 'pkg_api')
     def test_get_data_desc_order(self, mock_pkg_api):
@@ -1243,16 +1324,13 @@ class TestPackageDefinitionsView(helpers.APITestCase):
 
         self.assertEqual([mock_package], packages)
         self.assertEqual('foo_tenant_name', mock_package.tenant_name)
-        self.assertTrue(self.pkg_definitions_view.has_more_data)
+        self.assertTrue(self.pkg_definitions_view.has_prev_data(None))
+        self.assertFalse(self.pkg_definitions_view.has_more_data(None))
 
-        mock_pkg_api.package_list.assert_any_call(
+        mock_pkg_api.package_list.assert_called_once_with(
             self.mock_request, marker=None,
-            filters={'include_disabled': True, 'sort_dir': 'asc'},
+            filters={'include_disabled': True, 'sort_dir': 'desc'},
             paginate=True, page_size=123)
-        mock_pkg_api.package_list.assert_any_call(
-            self.mock_request, marker='foo_package',
-            filters={'include_disabled': True, 'sort_dir': 'asc'},
-            paginate=True, page_size=0)
 
     def test_get_context_data(self):
         mock_form = mock.Mock(initial={'package': mock.Mock(type='test_type')})
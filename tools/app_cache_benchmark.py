@@ -0,0 +1,130 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compares formats of the application cache.
+
+Dumps and loads typical cached values (a UI definition, package details and
+a logo) with pickle protocol 0, used by the cache before, with the highest
+pickle protocol and, for bytes, as raw data. Entries of an existing cache
+directory (``METADATA_CACHE_DIR/apps``) could be measured as well:
+
+    python tools/app_cache_benchmark.py [--cache-dir DIR] [--number N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import io
+import os
+import pickle
+import timeit
+
+
+class _Placeholder(object):
+    pass
+
+
+def _load(data):
+    unpickler = pickle.Unpickler(io.BytesIO(data))
+    # parsed YAQL expressions reference the YAQL engine by persistent id
+    unpickler.persistent_load = lambda obj_id: _Placeholder()
+    return unpickler.load()
+
+
+def _make_ui_definition(forms=10, fields=10):
+    return {
+        'Version': 2.4,
+        'Application': {'?': {'type': 'io.murano.apps.Example'},
+                        'name': 'example', 'instance': {'flavor': 'm1.small'}},
+        'Forms': [
+            {'group{0}'.format(i): {'fields': [
+                {'name': 'field{0}'.format(j), 'type': 'string',
+                 'label': 'Field {0}'.format(j), 'required': j % 2 == 0,
+                 'description': 'Description of the field {0}'.format(j) * 4,
+                 'initial': 'value {0}'.format(j)}
+                for j in range(fields)]}}
+            for i in range(forms)]
+    }
+
+
+def _make_package_details():
+    return dict(('attribute_{0}'.format(i), 'value {0}'.format(i) * 8)
+                for i in range(30))
+
+
+def _read_cache_dir(cache_dir):
+    for dir_path, _dirs, file_names in os.walk(cache_dir):
+        for file_name in file_names:
+            if file_name.endswith('-pickled'):
+                with open(os.path.join(dir_path, file_name), 'rb') as f:
+                    data = f.read()
+                try:
+                    yield file_name, _load(data)
+                except Exception:
+                    # already in the new format, or broken
+                    continue
+
+
+def _measure(name, value, number):
+    rows = []
+    for protocol in (0, pickle.HIGHEST_PROTOCOL):
+        data = pickle.dumps(value, protocol)
+        dump = timeit.timeit(lambda: pickle.dumps(value, protocol),
+                             number=number) / number
+        load = timeit.timeit(lambda: _load(data), number=number) / number
+        rows.append((name, 'protocol {0}'.format(protocol), dump, load,
+                     len(data)))
+    if isinstance(value, bytes):
+        dump = timeit.timeit(lambda: io.BytesIO().write(value),
+                             number=number) / number
+        load = timeit.timeit(lambda: io.BytesIO(value).read(),
+                             number=number) / number
+        rows.append((name, 'raw', dump, load, len(value)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cache-dir',
+                        help='Directory of the application cache to measure')
+    parser.add_argument('--number', type=int, default=200,
+                        help='Number of dumps and loads of each value')
+    args = parser.parse_args()
+
+    values = [('ui definition', _make_ui_definition()),
+              ('package details', _make_package_details()),
+              ('logo', os.urandom(64 * 1024))]
+    if args.cache_dir:
+        values.extend(_read_cache_dir(args.cache_dir))
+
+    row_format = '{0:<24} {1:<12} {2:>12} {3:>12} {4:>10}'
+    print(row_format.format('value', 'format', 'dump, ms', 'load, ms',
+                            'size, B'))
+    totals = {}
+    for name, value in values:
+        for row in _measure(name, value, args.number):
+            print(row_format.format(row[0][:24], row[1],
+                                    '{0:.4f}'.format(row[2] * 1000),
+                                    '{0:.4f}'.format(row[3] * 1000), row[4]))
+            if row[1] == 'raw':
+                continue
+            total = totals.setdefault(row[1], [0.0, 0.0, 0])
+            for i in range(3):
+                total[i] += row[i + 2]
+    print()
+    for fmt, (dump, load, size) in sorted(totals.items()):
+        print(row_format.format('total', fmt, '{0:.4f}'.format(dump * 1000),
+                                '{0:.4f}'.format(load * 1000), size))
+
+
+if __name__ == '__main__':
+    main()